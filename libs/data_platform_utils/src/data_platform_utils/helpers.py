@@ -116,6 +116,76 @@ def get_partitions_def_from_meta(
     return None
 
 
+SEARCH_OPTIMIZATION_METHODS = ("equality", "substring", "geo")
+
+
+def get_layout_hints_from_meta(meta: dict[str, Any]) -> dict[str, Any] | None:
+    """Return validated physical layout hints if any are provided in the meta.
+    - cluster_by accepts a column or expression, or a list of them.
+    - automatic_clustering accepts a boolean to resume or suspend reclustering.
+    - search_optimization accepts a list of columns optimized for equality lookups,
+      or a mapping of method (equality, substring, geo) to columns.
+    - max_clustering_depth accepts a number, the clustering depth above which the
+      layout check warns.
+
+    Meta should be of format dict in the following structure:
+    .. code-block:: python
+       "meta":{
+           "dagster":{
+               "cluster_by": ["to_date(hit_at)"],
+               "automatic_clustering": True,
+               "search_optimization": {"equality": ["hit_id"]},
+               "max_clustering_depth": 4
+           }
+       }
+
+    Raises:
+        ValueError: If a hint has an invalid value.
+    """
+    hints: dict[str, Any] = {}
+
+    if cluster_by := meta.get("cluster_by"):
+        if isinstance(cluster_by, str):
+            cluster_by = [cluster_by]
+        if not isinstance(cluster_by, list) or not all(
+            isinstance(column, str) and column for column in cluster_by
+        ):
+            raise ValueError(f"Invalid cluster_by: '{cluster_by}'")
+        hints["cluster_by"] = cluster_by
+
+    automatic_clustering = meta.get("automatic_clustering")
+    if automatic_clustering is not None:
+        if not isinstance(automatic_clustering, bool):
+            raise ValueError(f"Invalid automatic_clustering: '{automatic_clustering}'")
+        if not hints.get("cluster_by"):
+            raise ValueError("automatic_clustering requires cluster_by")
+        hints["automatic_clustering"] = automatic_clustering
+
+    if search_optimization := meta.get("search_optimization"):
+        if isinstance(search_optimization, list):
+            search_optimization = {"equality": search_optimization}
+        if not isinstance(search_optimization, dict) or not all(
+            method in SEARCH_OPTIMIZATION_METHODS
+            and isinstance(columns, list)
+            and all(isinstance(column, str) for column in columns)
+            for method, columns in search_optimization.items()
+        ):
+            raise ValueError(f"Invalid search_optimization: '{search_optimization}'")
+        hints["search_optimization"] = search_optimization
+
+    max_clustering_depth = meta.get("max_clustering_depth")
+    if max_clustering_depth is not None:
+        if isinstance(max_clustering_depth, bool) or not isinstance(
+            max_clustering_depth, int | float
+        ):
+            raise ValueError(f"Invalid max_clustering_depth: '{max_clustering_depth}'")
+        if not hints.get("cluster_by"):
+            raise ValueError("max_clustering_depth requires cluster_by")
+        hints["max_clustering_depth"] = max_clustering_depth
+
+    return hints or None
+
+
 def sanitize_input_signature(func: Callable, kwargs: dict) -> dict:
     """Remove any arguments that are not expected by the receiving function.
 
@@ -0,0 +1,163 @@
+"""Attribute Snowflake query cost to the dbt nodes that issued the queries.
+
+dagster-dbt tags every query dbt sends to Snowflake with a comment of the form
+``snowflake_dagster_dbt_v1_opaque_id[[[<unique_id>:<invocation_id>]]]``. These helpers
+extract that opaque id from the query history and aggregate the credits, elapsed time,
+and bytes scanned of the queries per dbt node, so the most expensive models can be
+ranked without joining the query history by hand.
+"""
+
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+OPAQUE_ID_PATTERN = re.compile(
+    r"snowflake_dagster_dbt_v1_opaque_id\[\[\[(?P<unique_id>[^:\]]+):"
+    r"(?P<invocation_id>[^\]]*)\]\]\]"
+)
+
+# measures summed per node, mapped from the query history columns they are read from
+COST_COLUMNS = {
+    "credits": ("credits_attributed_compute", "credits_used_cloud_services"),
+    "elapsed_seconds": ("total_elapsed_time",),
+    "bytes_scanned": ("bytes_scanned",),
+}
+
+
+def get_query_history_sql(lookback_hours: int = 24) -> str:
+    """Build the query that reads the dbt queries of a time window from the account
+    usage views.
+
+    Compute credits come from ``query_attribution_history``, which only covers queries
+    on warehouses that were billed, so they are left joined onto the query history.
+
+    Args:
+        lookback_hours: How many hours of query history to read.
+
+    Returns:
+        str: SQL returning the columns read by :func:`aggregate_query_costs`.
+    """
+    return f"""
+        select
+            history.query_id,
+            history.query_text,
+            history.warehouse_name,
+            history.total_elapsed_time,
+            history.bytes_scanned,
+            history.credits_used_cloud_services,
+            attribution.credits_attributed_compute
+        from snowflake.account_usage.query_history as history
+        left join snowflake.account_usage.query_attribution_history as attribution
+            on history.query_id = attribution.query_id
+        where history.start_time >= dateadd(hour, -{int(lookback_hours)},
+            current_timestamp())
+            and history.query_text like '%snowflake_dagster_dbt_v1_opaque_id%'
+    """
+
+
+def parse_opaque_id(query_text: str | None) -> tuple[str, str] | None:
+    """Extract the dbt node and invocation from the comment of a query.
+
+    Args:
+        query_text: Text of a query as recorded in the query history.
+
+    Returns:
+        tuple[str, str] | None: The unique id of the dbt node and the dbt invocation
+            id, or ``None`` when the query was not issued by dbt through Dagster.
+    """
+    match = OPAQUE_ID_PATTERN.search(query_text or "")
+    if not match:
+        return None
+    return match["unique_id"], match["invocation_id"]
+
+
+def aggregate_query_costs(
+    rows: Iterable[Mapping[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Sum the cost of queries per dbt node.
+
+    Column names are matched case insensitively, so rows can be passed directly from
+    a Snowflake cursor. Elapsed time is converted from milliseconds to seconds.
+
+    Args:
+        rows: Query history rows with a ``query_text`` column and the cost columns
+            returned by :func:`get_query_history_sql`.
+
+    Returns:
+        dict[str, dict[str, Any]]: The ``credits``, ``elapsed_seconds``,
+            ``bytes_scanned``, ``query_count``, and the distinct ``invocations`` of each
+            dbt node keyed by unique id. Queries without an opaque id are ignored.
+    """
+    costs: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        row = {key.lower(): value for key, value in row.items()}
+        opaque_id = parse_opaque_id(row.get("query_text"))
+        if not opaque_id:
+            continue
+
+        unique_id, invocation_id = opaque_id
+        cost = costs.setdefault(unique_id, {
+            **dict.fromkeys(COST_COLUMNS, 0),
+            "query_count": 0,
+            "invocations": set(),
+        })
+        for measure, columns in COST_COLUMNS.items():
+            cost[measure] += sum(float(row.get(column) or 0) for column in columns)
+        cost["query_count"] += 1
+        cost["invocations"].add(invocation_id)
+
+    for cost in costs.values():
+        cost["elapsed_seconds"] /= 1000
+        cost["bytes_scanned"] = int(cost["bytes_scanned"])
+        cost["invocations"] = len(cost["invocations"])
+    return costs
+
+
+def group_costs(
+    costs: Mapping[str, Mapping[str, Any]], keys: Mapping[str, str]
+) -> dict[str, dict[str, Any]]:
+    """Re-key node costs onto another grouping, summing nodes that share a key.
+
+    Args:
+        costs: Costs keyed by dbt unique id from :func:`aggregate_query_costs`.
+        keys: The group of each unique id, such as the asset key of the node. Nodes
+            without a group keep their unique id.
+
+    Returns:
+        dict[str, dict[str, Any]]: Summed costs keyed by group.
+    """
+    grouped: dict[str, dict[str, Any]] = {}
+    for unique_id, cost in costs.items():
+        group = grouped.setdefault(keys.get(unique_id, unique_id), {})
+        for measure, value in cost.items():
+            group[measure] = group.get(measure, 0) + value
+    return grouped
+
+
+def rank_costs(
+    costs: Mapping[str, Mapping[str, Any]],
+    by: str = "credits",
+    top_n: int | None = None,
+) -> list[tuple[str, dict[str, Any]]]:
+    """Order costs from most to least expensive.
+
+    Args:
+        costs: Costs keyed by node or group.
+        by: The measure to rank by, one of ``credits``, ``elapsed_seconds``, or
+            ``bytes_scanned``.
+        top_n: Optionally keep only this many of the most expensive entries.
+
+    Returns:
+        list[tuple[str, dict[str, Any]]]: Key and cost pairs in descending order.
+
+    Raises:
+        ValueError: If ``by`` is not a supported measure.
+    """
+    if by not in COST_COLUMNS:
+        raise ValueError(f"Unsupported cost measure '{by}', expected one of "
+            f"{tuple(COST_COLUMNS)}.")
+
+    ranked = sorted(
+        costs.items(), key=lambda item: (item[1][by], item[0]), reverse=True
+    )
+    return [(key, dict(cost)) for key, cost in ranked[:top_n]]
@@ -126,6 +126,37 @@ class TestGetPartitionsDefFromMeta(TestHelpers):
     def test_get_partitions_def_from_meta_missing_keys(self):
         self.assertIsNone(helpers.get_partitions_def_from_meta({}))
 
+class TestGetLayoutHintsFromMeta(TestHelpers):
+    def test_get_layout_hints_from_meta(self):
+        result = helpers.get_layout_hints_from_meta({
+            "cluster_by": "to_date(hit_at)",
+            "automatic_clustering": True,
+            "search_optimization": ["hit_id"],
+            "max_clustering_depth": 4,
+        })
+        self.assertEqual(result, {
+            "cluster_by": ["to_date(hit_at)"],
+            "automatic_clustering": True,
+            "search_optimization": {"equality": ["hit_id"]},
+            "max_clustering_depth": 4,
+        })
+
+    def test_get_layout_hints_from_meta_missing(self):
+        self.assertIsNone(helpers.get_layout_hints_from_meta({"partition": "daily"}))
+
+    def test_get_layout_hints_from_meta_invalid(self):
+        invalid_metas = [
+            {"cluster_by": [1]},
+            {"cluster_by": ["a"], "automatic_clustering": "yes"},
+            {"automatic_clustering": True},
+            {"search_optimization": {"fulltext": ["a"]}},
+            {"cluster_by": ["a"], "max_clustering_depth": "deep"},
+        ]
+        for meta in invalid_metas:
+            with self.subTest(meta=meta), self.assertRaises(ValueError):
+                helpers.get_layout_hints_from_meta(meta)
+
+
 class TestSanitizeInputSignature(TestHelpers):
     def test_sanitize_input_signature_filters_unexpected_keys(self):
         def sample_func(foo, bar): pass
@@ -0,0 +1,81 @@
+import json
+import unittest
+from pathlib import Path
+
+from data_platform_utils import query_attribution
+
+FIXTURE_PATH = Path(__file__).parent.joinpath("fixtures", "query_history.json")
+
+
+class TestQueryAttribution(unittest.TestCase):
+    def setUp(self):
+        with open(FIXTURE_PATH) as file:
+            self.rows = json.load(file)
+        self.costs = query_attribution.aggregate_query_costs(self.rows)
+
+
+class TestParseOpaqueId(TestQueryAttribution):
+    def test_parse_opaque_id(self):
+        result = query_attribution.parse_opaque_id(self.rows[0]["QUERY_TEXT"])
+        self.assertEqual(result, ("model.dbt_foundation.fct_transactions", "inv-1"))
+
+    def test_parse_opaque_id_without_comment(self):
+        self.assertIsNone(query_attribution.parse_opaque_id(self.rows[-1]["QUERY_TEXT"]))
+        self.assertIsNone(query_attribution.parse_opaque_id(None))
+
+
+class TestAggregateQueryCosts(TestQueryAttribution):
+    def test_aggregates_per_node(self):
+        cost = self.costs["model.dbt_foundation.fct_transactions"]
+        self.assertAlmostEqual(cost["credits"], 2.01)
+        self.assertEqual(cost["elapsed_seconds"], 180)
+        self.assertEqual(cost["bytes_scanned"], 6_000_000_000)
+        self.assertEqual(cost["query_count"], 2)
+        self.assertEqual(cost["invocations"], 2)
+
+    def test_ignores_queries_without_opaque_id(self):
+        self.assertEqual(len(self.costs), 3)
+
+    def test_handles_missing_compute_credits(self):
+        cost = self.costs["model.dbt_foundation.dim_customers"]
+        self.assertAlmostEqual(cost["credits"], 0.001)
+
+
+class TestGroupCosts(TestQueryAttribution):
+    def test_group_costs(self):
+        keys = {
+            "model.dbt_foundation.fct_transactions": "common/fct/fct_transactions",
+            "test.dbt_foundation.not_null_fct_transactions_id.1a2b3c":
+                "common/fct/fct_transactions",
+        }
+        grouped = query_attribution.group_costs(self.costs, keys)
+
+        self.assertEqual(set(grouped), {
+            "common/fct/fct_transactions", "model.dbt_foundation.dim_customers"})
+        self.assertEqual(grouped["common/fct/fct_transactions"]["query_count"], 3)
+        self.assertAlmostEqual(
+            grouped["common/fct/fct_transactions"]["credits"], 2.06)
+
+
+class TestRankCosts(TestQueryAttribution):
+    def test_rank_costs(self):
+        ranked = query_attribution.rank_costs(self.costs, top_n=2)
+        self.assertEqual([key for key, _ in ranked], [
+            "model.dbt_foundation.fct_transactions",
+            "test.dbt_foundation.not_null_fct_transactions_id.1a2b3c",
+        ])
+
+    def test_rank_costs_by_elapsed_time(self):
+        ranked = query_attribution.rank_costs(self.costs, by="elapsed_seconds")
+        self.assertEqual(ranked[-1][0], "model.dbt_foundation.dim_customers")
+
+    def test_rank_costs_invalid_measure(self):
+        with self.assertRaises(ValueError):
+            query_attribution.rank_costs(self.costs, by="rows")
+
+
+class TestGetQueryHistorySql(unittest.TestCase):
+    def test_get_query_history_sql(self):
+        sql = query_attribution.get_query_history_sql(48)
+        self.assertIn("dateadd(hour, -48,", sql)
+        self.assertIn("query_attribution_history", sql)
@@ -0,0 +1,229 @@
+"""Benchmark the evaluation cost of the custom automation conditions on large graphs.
+
+Each case builds a layered graph of assets, where every asset below the first layer
+depends on ``fan_in`` random assets of the layer above, and gives every asset the same
+condition from ``CustomAutomationCondition``. All assets are materialized once, then
+the conditions are evaluated for a number of ticks against an in-memory instance, an
+hour apart, with a share of the root assets updated before every tick but the first.
+It records the latency of the first and later ticks, the condition nodes and asset
+partitions evaluated and requested per tick, and the peak memory of the case, which
+runs in its own process. The results are printed as a table, and can be written to a
+JSON file to compare runs.
+
+Usage:
+    uv run python benchmarks/automation_condition_ticks.py \\
+        --assets 1000 10000 50000 --depth 5 20 --fan-in 1 4
+"""
+
+import argparse
+import json
+import random
+import resource
+import statistics
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import dagster as dg
+from data_platform_utils.automation_conditions import CustomAutomationCondition
+
+CRON_SCHEDULE = "0 * * * *"
+CONDITIONS = {
+    "eager": CustomAutomationCondition.eager,
+    "eager_with_deps_checks": CustomAutomationCondition.eager_with_deps_checks,
+    "lazy": CustomAutomationCondition.lazy,
+    "lazy_on_cron": lambda: CustomAutomationCondition.lazy_on_cron(CRON_SCHEDULE),
+    "on_schedule": lambda: CustomAutomationCondition.on_schedule(CRON_SCHEDULE),
+    "missing_or_changed": CustomAutomationCondition.missing_or_changed,
+}
+EVALUATION_START = datetime(2025, 1, 1, 0, 30)
+
+warnings.filterwarnings("ignore", category=dg.BetaWarning)
+
+
+def build_graph(assets: int, depth: int, fan_in: int, condition: str,
+                partitioned: bool, seed: int = 42) -> tuple[dg.Definitions,
+                                                            list[dg.AssetKey]]:
+    """Build a layered graph of assets with one automation condition.
+
+    Args:
+        assets: Number of assets, split evenly across the layers.
+        depth: Number of layers.
+        fan_in: Number of dependencies of every asset below the first layer.
+        condition: Name of the condition in ``CONDITIONS``.
+        partitioned: Whether the assets are daily partitioned over the last year.
+        seed: Seed of the random generator so cases are reproducible.
+
+    Returns:
+        tuple[dagster.Definitions, list[dagster.AssetKey]]: Definitions with a single
+            subsettable multi asset holding the graph, and the keys of its first layer.
+    """
+    rng = random.Random(seed)
+    partitions_def = dg.DailyPartitionsDefinition(
+        start_date=EVALUATION_START - timedelta(days=365)
+    ) if partitioned else None
+
+    layers: list[list[dg.AssetKey]] = [[] for _ in range(depth)]
+    specs = []
+    for index in range(assets):
+        layer = index * depth // assets
+        key = dg.AssetKey(f"asset_{index}")
+        upstream = layers[layer - 1] if layer else []
+        layers[layer].append(key)
+        specs.append(dg.AssetSpec(
+            key,
+            deps=rng.sample(upstream, min(fan_in, len(upstream))),
+            skippable=True,
+            partitions_def=partitions_def,
+            automation_condition=CONDITIONS[condition](),
+        ))
+
+    @dg.multi_asset(name="graph", specs=specs, can_subset=True)
+    def graph(): ...
+
+    return dg.Definitions(assets=[graph]), layers[0]
+
+
+def count_evaluations(results: list[Any]) -> tuple[int, int]:
+    """Count the condition nodes and asset partitions a tick evaluated.
+
+    Args:
+        results: The ``AutomationResult`` of the condition of each asset.
+
+    Returns:
+        tuple[int, int]: Number of condition nodes evaluated, and the total size of
+            the candidate subsets they were evaluated over.
+    """
+    nodes, partitions = 0, 0
+    pending = list(results)
+    while pending:
+        result = pending.pop()
+        nodes += 1
+        partitions += result._context.candidate_subset.size
+        pending.extend(result.child_results)
+    return nodes, partitions
+
+
+def run_case(assets: int, depth: int, fan_in: int, condition: str,
+             partitioned: bool, ticks: int, update_ratio: float) -> dict[str, Any]:
+    """Evaluate the conditions of a synthetic graph for a number of ticks.
+
+    Args:
+        assets: Number of assets in the graph.
+        depth: Number of layers of the graph.
+        fan_in: Number of dependencies of every asset below the first layer.
+        condition: Name of the condition in ``CONDITIONS``.
+        partitioned: Whether the assets are daily partitioned.
+        ticks: Number of evaluation ticks.
+        update_ratio: Share of the root assets materialized before each tick but
+            the first.
+
+    Returns:
+        dict[str, Any]: Seconds of the first tick and median seconds of the later
+            ones, condition nodes and asset partitions evaluated per tick, asset
+            partitions requested per tick, and the peak memory of the process.
+    """
+    defs, roots = build_graph(assets, depth, fan_in, condition, partitioned)
+    instance = dg.DagsterInstance.ephemeral()
+    partition = (EVALUATION_START - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    def materialize(asset_keys: list[dg.AssetKey]) -> None:
+        for asset_key in asset_keys:
+            instance.report_runless_asset_event(dg.AssetMaterialization(
+                asset_key, partition=partition if partitioned else None
+            ))
+
+    graph = defs.resolve_asset_graph()
+    materialize(list(graph.get_all_asset_keys()))
+    rng = random.Random(0)
+
+    cursor = None
+    durations, nodes, partitions, requested = [], [], [], []
+    for tick in range(ticks):
+        if tick:
+            materialize(rng.sample(roots, max(int(len(roots) * update_ratio), 1)))
+
+        started = time.perf_counter()
+        result = dg.evaluate_automation_conditions(
+            defs,
+            instance,
+            cursor=cursor,
+            evaluation_time=EVALUATION_START + timedelta(hours=tick),
+        )
+        durations.append(time.perf_counter() - started)
+        cursor = result.cursor
+
+        tick_nodes, tick_partitions = count_evaluations(result.results)
+        nodes.append(tick_nodes)
+        partitions.append(tick_partitions)
+        requested.append(result.total_requested)
+
+    return {
+        "first_tick_seconds": durations[0],
+        "tick_seconds": statistics.median(durations[1:] or durations),
+        "evaluated_nodes": statistics.mean(nodes),
+        "evaluated_partitions": statistics.mean(partitions),
+        "requested": statistics.mean(requested),
+        # kilobytes on linux
+        "peak_megabytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    """Run every combination of graph shape, partitioning, and condition."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", nargs="+", type=int, default=[1000])
+    parser.add_argument("--depth", nargs="+", type=int, default=[10])
+    parser.add_argument("--fan-in", nargs="+", type=int, default=[3])
+    parser.add_argument("--conditions", nargs="+", choices=list(CONDITIONS),
+                        default=list(CONDITIONS))
+    parser.add_argument("--partitioned", nargs="+", choices=["true", "false"],
+                        default=["false", "true"])
+    parser.add_argument("--ticks", type=int, default=3,
+                        help="evaluation ticks per case, the first is reported apart")
+    parser.add_argument("--update-ratio", type=float, default=0.1,
+                        help="share of root assets updated before each tick")
+    parser.add_argument("--output", type=Path, help="write results to a JSON file")
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    print(f"{'condition':<24}{'part.':>6}{'assets':>8}{'depth':>6}{'fan in':>7}"
+          f"{'first s':>9}{'tick s':>9}{'nodes':>9}{'subsets':>11}{'requested':>10}"
+          f"{'MiB':>8}")
+    for assets in args.assets:
+        for depth in args.depth:
+            for fan_in in args.fan_in:
+                for partitioned in args.partitioned:
+                    for condition in args.conditions:
+                        case = {
+                            "condition": condition,
+                            "partitioned": partitioned == "true",
+                            "assets": assets,
+                            "depth": depth,
+                            "fan_in": fan_in,
+                        }
+                        # a fresh process per case, so the peak memory is its own
+                        with ProcessPoolExecutor(max_workers=1) as executor:
+                            result = executor.submit(
+                                run_case, assets, depth, fan_in, condition,
+                                case["partitioned"], args.ticks, args.update_ratio,
+                            ).result()
+                        results.append({**case, **result})
+                        print(f"{condition:<24}{partitioned:>6}{assets:>8}{depth:>6}"
+                              f"{fan_in:>7}{result['first_tick_seconds']:>9.2f}"
+                              f"{result['tick_seconds']:>9.2f}"
+                              f"{result['evaluated_nodes']:>9.0f}"
+                              f"{result['evaluated_partitions']:>11.0f}"
+                              f"{result['requested']:>10.0f}"
+                              f"{result['peak_megabytes']:>8.0f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
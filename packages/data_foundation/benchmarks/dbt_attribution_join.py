@@ -0,0 +1,200 @@
+"""Benchmark the join strategies of the last click attribution macro on DuckDB.
+
+The ``attribution_last_click_n_days_same_x`` macro is rendered from the dbt project
+once per ``join_strategy``, with ``ref`` pointing at synthetic tables of hits,
+transactions, individuals, and products. Each case times both strategies at a given
+number of individuals and hits per individual, and fails if they attribute the
+transactions differently. The results are printed as a table, and can be written to a
+JSON file to compare runs.
+
+Usage:
+    uv run --with duckdb python benchmarks/dbt_attribution_join.py \\
+        --individuals 1000 10000 --hits-per-individual 10 100
+"""
+
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import jinja2
+
+MACRO_PATH = Path(__file__).parents[1].joinpath(
+    "dbt", "macros", "model_templates", "marketing",
+    "attribution_last_click_n_days_same_x.sql",
+)
+STRATEGIES = ["range", "asof"]
+CRITERIA = {"none": [], "same_sku": ["product_id"], "same_brand": ["brand"]}
+
+# DuckDB has no match_condition clause, the inequality is part of the join condition
+ASOF_PATTERN = re.compile(
+    r"match_condition\s*\((?P<condition>[^)]*)\)\s*on\s+(?P<keys>.*?)\s+where",
+    re.DOTALL,
+)
+
+
+def render_attribution_sql(strategy: str, lookback_window: str,
+                           criteria: list[str]) -> str:
+    """Render the attribution macro for DuckDB.
+
+    Args:
+        strategy: ``join_strategy`` argument of the macro.
+        lookback_window: Number of days a hit is attributable.
+        criteria: Product columns the advertised and transacted products must share.
+
+    Returns:
+        str: A DuckDB query returning the attributed transactions.
+    """
+    environment = jinja2.Environment(extensions=["jinja2.ext.do"])
+    template = environment.from_string(MACRO_PATH.read_text())
+    module = template.make_module({
+        "ref": lambda name: name,
+        "dagster_var": lambda name, default=None: default,
+        "is_incremental": lambda: False,
+        "generate_sid": lambda columns: (
+            "md5(concat_ws(':', " + ", ".join(
+                f"coalesce({column}::varchar, '')" for column in sorted(columns)
+            ) + "))"
+        ),
+        "exceptions": None,
+    })
+    sql = str(module.attribution_last_click_n_days_same_x(
+        lookback_window, criteria, strategy
+    ))
+    return ASOF_PATTERN.sub(
+        lambda match: f"on {match['keys']} and {match['condition']} where", sql
+    )
+
+
+def create_tables(connection: duckdb.DuckDBPyConnection, individuals: int,
+                  hits_per_individual: int, seed: float = 0.42) -> None:
+    """Create synthetic source tables for the macro.
+
+    Every individual gets ``hits_per_individual`` hits spread over a year at distinct
+    times, and half as many transactions, each of a random product.
+
+    Args:
+        connection: DuckDB connection to create the tables in.
+        individuals: Number of individuals.
+        hits_per_individual: Number of hits of each individual.
+        seed: Seed of the random generator so cases are reproducible.
+    """
+    transactions_per_individual = max(hits_per_individual // 2, 1)
+    connection.execute(f"select setseed({seed})")
+    connection.execute(f"""
+        create or replace table stg_inventory_db__products as
+        select
+            product_id::varchar product_id,
+            'brand_' || (product_id % 20)::varchar brand
+        from range(200) products(product_id);
+
+        create or replace table stg_entity_resolution__individual_party_keys as
+        select
+            'party_' || individual_id::varchar individual_party_key,
+            individual_id
+        from range({individuals}) individuals(individual_id);
+
+        create or replace table int_int_marketing__int_attributions as
+        select
+            individual_id::varchar || ':' || hit::varchar hit_id,
+            'party_' || individual_id::varchar individual_party_key,
+            'campaign_' || (hit % 7)::varchar campaign_sid,
+            floor(random() * 200)::int::varchar advertised_product_id,
+            timestamp '2024-01-01'
+                + to_seconds(hit * (31536000 // {hits_per_individual})
+                + floor(random() * 60)::int) attribution_start_at,
+            now() _loaded_at
+        from range({individuals}) individuals(individual_id)
+        cross join range({hits_per_individual}) hits(hit);
+
+        create or replace table stg_transaction_db__transactions as
+        select
+            individual_id::varchar || ':' || transaction::varchar transaction_id,
+            floor(random() * 200)::int::varchar product_id,
+            'web' sales_channel,
+            timestamp '2024-01-01'
+                + to_seconds(floor(random() * 31536000)::int) transacted_at,
+            'party_' || individual_id::varchar individual_party_key,
+            now() _loaded_at
+        from range({individuals}) individuals(individual_id)
+        cross join range({transactions_per_individual}) transactions(transaction);
+    """)
+
+
+def run_case(connection: duckdb.DuckDBPyConnection, sql: str) -> tuple[float, list]:
+    """Run a rendered query and return its duration and sorted result.
+
+    Args:
+        connection: DuckDB connection with the source tables.
+        sql: Rendered attribution query.
+
+    Returns:
+        tuple[float, list]: Seconds the query took, and the attributed rows.
+    """
+    started = time.perf_counter()
+    rows = connection.execute(f"select * from ({sql}) order by all").fetchall()
+    return time.perf_counter() - started, rows
+
+
+def main() -> None:
+    """Run every combination of scale, criteria, and join strategy."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--individuals", nargs="+", type=int, default=[1_000, 10_000])
+    parser.add_argument("--hits-per-individual", nargs="+", type=int,
+                        default=[10, 100])
+    parser.add_argument("--criteria", nargs="+", choices=list(CRITERIA),
+                        default=list(CRITERIA))
+    parser.add_argument("--lookback-window", default="30")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case, the median is reported")
+    parser.add_argument("--output", type=Path, help="write results to a JSON file")
+    args = parser.parse_args()
+
+    connection = duckdb.connect()
+    results: list[dict[str, Any]] = []
+    print(f"{'criteria':<12}{'individuals':>12}{'hits':>8}{'strategy':>10}"
+          f"{'rows':>10}{'seconds':>10}")
+    for individuals in args.individuals:
+        for hits_per_individual in args.hits_per_individual:
+            create_tables(connection, individuals, hits_per_individual)
+            for criteria_name in args.criteria:
+                outputs = {}
+                for strategy in STRATEGIES:
+                    sql = render_attribution_sql(
+                        strategy, args.lookback_window, CRITERIA[criteria_name]
+                    )
+                    durations = []
+                    for _ in range(args.repeat):
+                        duration, outputs[strategy] = run_case(connection, sql)
+                        durations.append(duration)
+                    seconds = statistics.median(durations)
+                    results.append({
+                        "criteria": criteria_name,
+                        "individuals": individuals,
+                        "hits_per_individual": hits_per_individual,
+                        "strategy": strategy,
+                        "rows": len(outputs[strategy]),
+                        "seconds": seconds,
+                    })
+                    print(f"{criteria_name:<12}{individuals:>12}"
+                          f"{hits_per_individual:>8}{strategy:>10}"
+                          f"{len(outputs[strategy]):>10}{seconds:>10.3f}")
+
+                if outputs["range"] != outputs["asof"]:
+                    raise AssertionError(
+                        f"Join strategies disagree for criteria '{criteria_name}' "
+                        f"at {individuals} individuals and {hits_per_individual} "
+                        "hits per individual."
+                    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
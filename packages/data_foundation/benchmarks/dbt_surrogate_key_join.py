@@ -0,0 +1,175 @@
+"""Benchmark the surrogate key strategies of the generate_sid macro on DuckDB.
+
+The ``generate_sid`` macro is rendered from the dbt project once per strategy, and the
+Snowflake hash functions it calls are defined as DuckDB macros with the same output
+types. Each case keys a synthetic fact table of transactions, and a dimension with a
+row per fact, with one strategy. It records the bytes of a key, the size of both tables
+on disk, the time to join them on the key, and the number of colliding keys. The
+results are printed as a table, and can be written to a JSON file to compare runs.
+
+Usage:
+    uv run --with duckdb python benchmarks/dbt_surrogate_key_join.py \\
+        --rows 1000000 10000000
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import jinja2
+
+MACRO_PATH = Path(__file__).parents[1].joinpath(
+    "dbt", "macros", "column_macros", "generate_sid.sql"
+)
+STRATEGIES = ["sha2", "sha2_binary", "md5_binary", "hash"]
+KEY_COLUMNS = ["transaction_id", "product_id", "transacted_at"]
+
+# Snowflake functions called by the macro, with DuckDB equivalents of the same type
+SNOWFLAKE_FUNCTIONS = """
+    create or replace macro nvl(value, fallback) as coalesce(value, fallback);
+    create or replace macro sha2(value, bits) as sha256(value);
+    create or replace macro sha2_binary(value, bits) as unhex(sha256(value));
+    create or replace macro md5_binary(value) as unhex(md5(value));
+"""
+
+
+def render_sid_sql(strategy: str) -> str:
+    """Render the generate_sid macro for a strategy.
+
+    Args:
+        strategy: ``strategy`` argument of the macro.
+
+    Returns:
+        str: A SQL expression of the surrogate key of ``KEY_COLUMNS``.
+    """
+    environment = jinja2.Environment(extensions=["jinja2.ext.do"])
+    template = environment.from_string(MACRO_PATH.read_text())
+    module = template.make_module({
+        "config": {"meta": {}},
+        "var": lambda name, default=None: default,
+        "exceptions": None,
+    })
+    return str(module.generate_sid(KEY_COLUMNS, strategy)).strip()
+
+
+def create_facts(connection: duckdb.DuckDBPyConnection, rows: int,
+                 seed: float = 0.42) -> None:
+    """Create a synthetic table of transactions.
+
+    Args:
+        connection: DuckDB connection to create the table in.
+        rows: Number of transactions.
+        seed: Seed of the random generator so cases are reproducible.
+    """
+    connection.execute(f"select setseed({seed})")
+    connection.execute(f"""
+        create or replace table transactions as
+        select
+            transaction_id,
+            floor(random() * 10000)::int::varchar product_id,
+            timestamp '2024-01-01'
+                + to_seconds(floor(random() * 31536000)::int) transacted_at,
+            round(random() * 100, 2) transaction_revenue
+        from range({rows}) transactions(transaction_id)
+    """)
+
+
+def run_case(connection: duckdb.DuckDBPyConnection, database: str,
+             strategy: str, repeat: int) -> dict[str, Any]:
+    """Key the transactions with a strategy and time a join on the key.
+
+    Args:
+        connection: DuckDB connection with the transactions table.
+        database: Name of an attached, empty database the keyed tables are created in.
+        strategy: Strategy of the surrogate key.
+        repeat: Number of times the join is run, the median is reported.
+
+    Returns:
+        dict[str, Any]: Bytes per key, size of the keyed tables, join seconds, and
+            number of colliding keys.
+    """
+    sid = render_sid_sql(strategy)
+    connection.execute(f"""
+        create table {database}.facts as
+        select {sid} sid, transaction_revenue from transactions;
+
+        create table {database}.dimension as
+        select {sid} sid, product_id, transacted_at from transactions;
+
+        checkpoint {database};
+    """)
+    # the numeric hash is a fixed width 64 bit integer
+    key_width = "8" if strategy == "hash" else "max(octet_length(sid::blob))"
+    key_bytes, collisions = connection.execute(f"""
+        select {key_width}, count(*) - count(distinct sid)
+        from {database}.dimension
+    """).fetchone()
+    megabytes = connection.execute(f"""
+        select used_blocks * block_size / 1024 / 1024
+        from pragma_database_size()
+        where database_name = '{database}'
+    """).fetchone()[0]
+
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.execute(f"""
+            select d.product_id, sum(f.transaction_revenue)
+            from {database}.facts f
+            inner join {database}.dimension d on f.sid = d.sid
+            group by all
+        """).fetchall()
+        durations.append(time.perf_counter() - started)
+
+    return {
+        "key_bytes": key_bytes,
+        "megabytes": megabytes,
+        "seconds": statistics.median(durations),
+        "collisions": collisions,
+    }
+
+
+def main() -> None:
+    """Run every combination of scale and strategy."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", nargs="+", type=int,
+                        default=[1_000_000, 10_000_000])
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES,
+                        default=STRATEGIES)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case, the median is reported")
+    parser.add_argument("--output", type=Path, help="write results to a JSON file")
+    args = parser.parse_args()
+
+    connection = duckdb.connect()
+    connection.execute(SNOWFLAKE_FUNCTIONS)
+    results: list[dict[str, Any]] = []
+    print(f"{'strategy':<14}{'rows':>12}{'key bytes':>11}{'MiB':>10}"
+          f"{'seconds':>10}{'collisions':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            create_facts(connection, rows)
+            for strategy in args.strategies:
+                database = f"{strategy}_{rows}"
+                connection.execute(
+                    f"attach '{Path(directory, database)}.duckdb' as {database}"
+                )
+                result = run_case(connection, database, strategy, args.repeat)
+                connection.execute(f"detach {database}")
+                results.append({"strategy": strategy, "rows": rows, **result})
+                print(f"{strategy:<14}{rows:>12}{result['key_bytes']:>11}"
+                      f"{result['megabytes']:>10.1f}{result['seconds']:>10.3f}"
+                      f"{result['collisions']:>12}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark dlt merge strategies on a local DuckDB destination.
+
+Each case loads a table of ``size`` rows, then times an incremental load that updates
+``size * change_ratio`` of the existing rows and inserts the same number of new rows,
+using the merge strategy under test. Only the load step is timed, since extract and
+normalize do not depend on the strategy. The results are printed as a table, and can
+be written to a JSON file to compare runs or tables of different shapes.
+
+Usage:
+    uv run --with duckdb python benchmarks/dlt_merge_strategies.py \\
+        --sizes 10000 100000 --change-ratios 0.01 0.1 0.5
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, get_args
+
+import dlt
+from dlt.common.schema.typing import TLoaderMergeStrategy
+
+STRATEGIES = list(get_args(TLoaderMergeStrategy))
+
+
+def generate_rows(start: int, stop: int, version: int) -> Iterator[dict[str, Any]]:
+    """Yield synthetic rows with a primary key and a few typical columns.
+
+    Args:
+        start: First id to generate.
+        stop: Id to stop before.
+        version: Value that changes between loads so updated rows differ.
+
+    Yields:
+        dict[str, Any]: A row keyed by ``id``.
+    """
+    for row_id in range(start, stop):
+        yield {
+            "id": row_id,
+            "name": f"name_{row_id}",
+            "amount": row_id * 0.01 + version,
+            "version": version,
+        }
+
+
+def run_case(strategy: str, size: int, change_ratio: float, work_dir: Path) -> float:
+    """Run one benchmark case and return the duration of the incremental load.
+
+    Args:
+        strategy: dlt merge strategy to benchmark.
+        size: Number of rows in the table before the incremental load.
+        change_ratio: Fraction of the existing rows updated by the incremental load.
+        work_dir: Folder for the pipeline working directory and DuckDB database.
+
+    Returns:
+        float: Seconds spent in the load step of the incremental load.
+    """
+    pipeline = dlt.pipeline(
+        pipeline_name=f"benchmark_{strategy.replace('-', '_')}",
+        pipelines_dir=str(work_dir),
+        destination=dlt.destinations.duckdb(
+            str(work_dir.joinpath("merge_strategies.duckdb"))
+        ),
+        dataset_name="benchmark",
+        progress=None,
+    )
+
+    write_disposition = {"disposition": "merge", "strategy": strategy}
+    changed = max(1, int(size * change_ratio))
+
+    @dlt.resource(
+        name="merge_table",
+        primary_key="id",
+        write_disposition=write_disposition, # type: ignore[arg-type]
+    )
+    def initial() -> Iterator[dict[str, Any]]:
+        yield from generate_rows(0, size, version=0)
+
+    @dlt.resource(
+        name="merge_table",
+        primary_key="id",
+        write_disposition=write_disposition, # type: ignore[arg-type]
+    )
+    def incremental() -> Iterator[dict[str, Any]]:
+        yield from generate_rows(size - changed, size + changed, version=1)
+
+    pipeline.run(initial())
+
+    pipeline.extract(incremental())
+    pipeline.normalize()
+    started = time.perf_counter()
+    pipeline.load()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    """Run every combination of strategy, size, and change ratio."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+    parser.add_argument("--change-ratios", nargs="+", type=float,
+                        default=[0.01, 0.1, 0.5])
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES,
+                        default=STRATEGIES)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case, the median is reported")
+    parser.add_argument("--output", type=Path, help="write results to a JSON file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'strategy':<15}{'size':>12}{'change_ratio':>15}{'load_seconds':>15}")
+    for size in args.sizes:
+        for change_ratio in args.change_ratios:
+            for strategy in args.strategies:
+                durations = []
+                for _ in range(args.repeat):
+                    with tempfile.TemporaryDirectory() as work_dir:
+                        durations.append(
+                            run_case(strategy, size, change_ratio, Path(work_dir))
+                        )
+                load_seconds = statistics.median(durations)
+                results.append({
+                    "strategy": strategy,
+                    "size": size,
+                    "change_ratio": change_ratio,
+                    "load_seconds": load_seconds,
+                })
+                print(f"{strategy:<15}{size:>12}{change_ratio:>15}"
+                      f"{load_seconds:>15.3f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
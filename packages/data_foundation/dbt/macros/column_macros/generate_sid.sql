@@ -1,9 +1,44 @@
-{% macro generate_sid(column_names) -%}
+{#
+    Generate a surrogate key from a list of columns. Null values are hashed as empty
+    strings, and the columns are sorted so their order does not change the key.
 
-    (sha2(concat_ws(':'
+    strategy:
+        sha2: 64 character hex string of the sha256 hash, the default.
+        sha2_binary: 32 byte binary sha256 hash, the same collision resistance in half
+            the bytes.
+        md5_binary: 16 byte binary md5 hash.
+        hash: 64 bit number from `hash()`, the narrowest and fastest to join, but
+            collisions become likely past a few billion keys.
+
+    The strategy defaults to `sid_strategy` in `meta.dagster` of the model, then to the
+    `sid_strategy` var. Changing the strategy of an incremental model changes the type
+    of its key, so it requires a full refresh. Use the `sid_collision_rate` test to
+    monitor collisions of the narrower keys, and `benchmarks/dbt_surrogate_key_join.py`
+    to compare their join performance.
+#}
+{% macro generate_sid(column_names, strategy=none) -%}
+
+    {%- set strategy = strategy
+        or ((config.get("meta") or {}).get("dagster") or {}).get("sid_strategy")
+        or var("sid_strategy", "sha2") -%}
+    {%- set key -%}
+        concat_ws(':'
         {%- for column_name in column_names | sort() -%}
             , nvl({{ column_name -}} :: string, '')
         {%- endfor -%}
-        ),256))
+        )
+    {%- endset -%}
+
+    {%- if strategy == "sha2" -%}
+        (sha2({{ key }},256))
+    {%- elif strategy == "sha2_binary" -%}
+        (sha2_binary({{ key }},256))
+    {%- elif strategy == "md5_binary" -%}
+        (md5_binary({{ key }}))
+    {%- elif strategy == "hash" -%}
+        (hash({{ key }}))
+    {%- else -%}
+        {{ exceptions.raise_compiler_error("Unsupported sid strategy '" ~ strategy ~ "', expected 'sha2', 'sha2_binary', 'md5_binary', or 'hash'.") }}
+    {%- endif -%}
 
 {%- endmacro %}
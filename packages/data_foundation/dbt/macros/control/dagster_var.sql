@@ -0,0 +1,15 @@
+{#
+    Read a var set by Dagster for the current run. Dagster passes the vars of a run,
+    such as the partition window and watermarks, as JSON in the `DAGSTER_DBT_RUN_VARS`
+    environment variable instead of `--vars`, because dbt discards the partial parse
+    artifact whenever `--vars` change. Only the files reading a var while they are
+    parsed are parsed again when its value changes.
+
+    Falls back to `var`, so the macros keep working when dbt is run directly with
+    `--vars`.
+#}
+
+{% macro dagster_var(name, default=none) -%}
+    {%- set run_vars = fromjson(env_var("DAGSTER_DBT_RUN_VARS", "{}")) -%}
+    {{- return(run_vars.get(name, var(name, default))) -}}
+{%- endmacro %}
@@ -0,0 +1,18 @@
+{#
+    Return the latest `_loaded_at` of the incremental model being built, so only
+    rows loaded since its last run are processed. Dagster records the watermark on
+    the materialization of every model calling this macro, and passes it back in the
+    `loaded_at_watermarks` var keyed by model name, so the run does not scan the
+    target for its max. The macro falls back to the max of the target when no
+    watermark is set, for example on the first Dagster run or when dbt is run
+    directly.
+#}
+
+{% macro loaded_at_watermark(column="_loaded_at") -%}
+    {%- set watermark = dagster_var("loaded_at_watermarks", {}).get(model.name) -%}
+    {%- if watermark -%}
+        '{{ watermark }}'::timestamp
+    {%- else -%}
+        coalesce((select max({{ column }}) from {{ this }}), '1900-01-01'::timestamp)
+    {%- endif -%}
+{%- endmacro %}
@@ -0,0 +1,20 @@
+{#
+    Bound incremental models to the time window of the Dagster partitions being
+    built. Dagster passes the window as the `min_date` and `max_date` vars, the end
+    is exclusive. Both macros fall back to an unbounded window when the vars are not
+    set, so full builds and non partitioned runs are unaffected.
+#}
+
+{% macro partition_window_filter(column, lookback_days=0) -%}
+    {{ column }} >= '{{ dagster_var("min_date", "1900-01-01") }}'::timestamp - interval '{{ lookback_days }} days'
+    and {{ column }} < '{{ dagster_var("max_date", "9999-12-31") }}'::timestamp
+{%- endmacro %}
+
+
+{% macro partition_window_predicates(column) -%}
+    {#- incremental_predicates for the target alias of the merge or delete+insert -#}
+    {{- return([
+        "DBT_INTERNAL_DEST." ~ column ~ " >= '" ~ dagster_var("min_date", "1900-01-01") ~ "'::timestamp",
+        "DBT_INTERNAL_DEST." ~ column ~ " < '" ~ dagster_var("max_date", "9999-12-31") ~ "'::timestamp",
+    ]) -}}
+{%- endmacro %}
@@ -0,0 +1,17 @@
+{#
+    Restrict the source of a snapshot to the rows changed since its last run. Dagster
+    passes the latest `update_key` the snapshot has already seen in the
+    `snapshot_watermarks` var, keyed by snapshot name. Sling only loads rows at or
+    after its own checkpoint, so no row changed before the watermark. The filter
+    falls back to every row when no watermark is set, so first runs and full
+    refreshes compare the whole source.
+#}
+
+{% macro snapshot_change_window(snapshot_name, column) -%}
+    {%- set watermark = dagster_var("snapshot_watermarks", {}).get(snapshot_name) -%}
+    {%- if watermark -%}
+        {{ column }} >= '{{ watermark }}'
+    {%- else -%}
+        true
+    {%- endif -%}
+{%- endmacro %}
@@ -0,0 +1,59 @@
+{#
+    Restrict data tests of large models to a sample, so their cost scales with the
+    data a run loaded instead of the size of the table. Overrides the
+    `get_where_subquery` macro dbt uses to apply the `where` config of a test to the
+    model it tests.
+
+    The sample is `sample` in `meta.dagster` of the test, or `test_sample` in
+    `meta.dagster` of the tested model:
+        column: the test only reads the rows of the model whose column is within the
+            partitions of the run, passed by Dagster as the `sample_min_date` and
+            `sample_max_date` vars.
+        percent: otherwise, the test reads a block sample of the table, in percent.
+
+    Full refreshes, runs with the `full_tests` var, and runs without a window or
+    percent to sample test the whole table. Keep `get_test_sample_scope` in
+    `defs/dbt/sampled_checks.py` in sync, it records the scope on the check results.
+#}
+{% macro get_where_subquery(relation) -%}
+
+    {%- set filters = [] -%}
+    {%- if config.get("where") -%}
+        {%- do filters.append("(" ~ config.get("where") ~ ")") -%}
+    {%- endif -%}
+
+    {%- set sample = get_test_sample() -%}
+    {%- set sample_clause = "" -%}
+    {%- if sample and not flags.FULL_REFRESH and not dagster_var("full_tests", false) -%}
+        {%- set min_date = dagster_var("sample_min_date") -%}
+        {%- set max_date = dagster_var("sample_max_date") -%}
+        {%- if sample.get("column") and min_date and max_date -%}
+            {%- do filters.append(sample["column"] ~ " >= '" ~ min_date ~ "'::timestamp") -%}
+            {%- do filters.append(sample["column"] ~ " < '" ~ max_date ~ "'::timestamp") -%}
+        {%- elif sample.get("percent") -%}
+            {%- set sample_clause = "sample system (" ~ sample["percent"] ~ ")" -%}
+        {%- endif -%}
+    {%- endif -%}
+
+    {%- if filters or sample_clause -%}
+        {%- set subquery -%}
+            (select * from {{ relation }} {{ sample_clause }}
+            {%- if filters %} where {{ filters | join(" and ") }}{% endif %}) dbt_subquery
+        {%- endset -%}
+        {{- return(subquery) -}}
+    {%- else -%}
+        {{- return(relation) -}}
+    {%- endif -%}
+
+{%- endmacro %}
+
+
+{% macro get_test_sample() -%}
+    {#- the sample of the test, or of the model it is attached to -#}
+    {%- set sample = ((config.get("meta") or {}).get("dagster") or {}).get("sample") -%}
+    {%- if not sample and execute and model.get("attached_node") -%}
+        {%- set node = graph.nodes.get(model["attached_node"]) or {} -%}
+        {%- set sample = (((node.get("config") or {}).get("meta") or {}).get("dagster") or {}).get("test_sample") -%}
+    {%- endif -%}
+    {{- return(sample) -}}
+{%- endmacro %}
@@ -0,0 +1,56 @@
+{#
+    Load seeds with a single COPY INTO from the user stage, instead of the batched
+    inserts of dbt-snowflake. Overrides `snowflake__load_csv_rows`, which the seed
+    materialization dispatches to once the seed table is created or truncated.
+
+    seed_loader:
+        copy: PUT the CSV file to the user stage and COPY INTO the seed table, the
+            default.
+        insert: the batched inserts of dbt-snowflake, for files whose values only
+            parse with dbt's type inference, such as dates that are not ISO 8601.
+
+    The loader defaults to `seed_loader` in `meta.dagster` of the seed, then to the
+    `seed_loader` var. Empty fields and `null` load as nulls with both loaders.
+#}
+{% macro snowflake__load_csv_rows(model, agate_table) %}
+
+    {%- set loader = ((config.get("meta") or {}).get("dagster") or {}).get("seed_loader")
+        or dagster_var("seed_loader", "copy") -%}
+    {%- if loader == "insert" -%}
+        {{ return(dbt.snowflake__load_csv_rows(model, agate_table)) }}
+    {%- elif loader != "copy" -%}
+        {{ exceptions.raise_compiler_error("Unsupported seed loader '" ~ loader ~ "', expected 'copy' or 'insert'.") }}
+    {%- endif -%}
+
+    {%- set stage_path = "@~/dbt_seeds/" ~ invocation_id ~ "/" ~ this.identifier -%}
+    {%- set cols_sql = get_seed_column_quoted_csv(model, agate_table.column_names) -%}
+
+    {%- set put_sql -%}
+        put 'file://{{ model.root_path }}/{{ model.original_file_path }}' '{{ stage_path }}'
+            auto_compress = true overwrite = true
+    {%- endset -%}
+
+    {%- set copy_sql -%}
+        copy into {{ this.render() }} ({{ cols_sql }})
+        from '{{ stage_path }}'
+        file_format = (
+            type = csv
+            skip_header = 1
+            field_delimiter = '{{ config.get("delimiter", ",") }}'
+            field_optionally_enclosed_by = '"'
+            empty_field_as_null = true
+            null_if = ('', 'null', 'NULL')
+        )
+        on_error = abort_statement
+        purge = true
+    {%- endset -%}
+
+    {% do adapter.add_query(put_sql, auto_begin=False) %}
+    {% do adapter.add_query('BEGIN', auto_begin=False) %}
+    {% do adapter.add_query(copy_sql, auto_begin=False) %}
+    {% do adapter.add_query('COMMIT', auto_begin=False) %}
+
+    {# Return SQL so we can render it out into the compiled files #}
+    {{ return(copy_sql) }}
+
+{%- endmacro %}
@@ -1,4 +1,37 @@
-{% macro attribution_last_click_n_days_same_x(lookback_window, criteria=[]) -%}
+{#
+    Attribute each transaction to the latest hit of the same individual within
+    `lookback_window` days before it, optionally requiring the advertised and
+    transacted products to match on each of the `criteria` columns.
+
+    join_strategy:
+        range: joins every hit to the transactions inside its window and keeps the
+            latest hit per transaction, cost grows with hits x transactions per
+            individual.
+        asof: asof joins each transaction to the latest hit before it, so each
+            transaction is matched once regardless of how many hits precede it.
+
+    Both strategies return the same rows, `benchmarks/dbt_attribution_join.py` checks
+    this on synthetic data.
+
+    incremental_mode:
+        loaded_at: incremental runs process transactions loaded since the last run,
+            and hits loaded since the last run less the lookback window.
+        partition: incremental runs process transactions inside the `min_date` and
+            `max_date` window of the Dagster partitions being built, and hits from the
+            lookback window before it, so only recent micro-partitions are scanned.
+            Pair with `incremental_predicates = partition_window_predicates("transacted_at")`
+            to bound the delete on the target as well. Runs without the vars fall back
+            to `loaded_at`.
+#}
+{% macro attribution_last_click_n_days_same_x(lookback_window, criteria=[], join_strategy="range", incremental_mode="loaded_at") -%}
+
+    {%- if join_strategy not in ["range", "asof"] -%}
+        {{ exceptions.raise_compiler_error("Unsupported join_strategy '" ~ join_strategy ~ "', expected 'range' or 'asof'.") }}
+    {%- endif -%}
+    {%- if incremental_mode not in ["loaded_at", "partition"] -%}
+        {{ exceptions.raise_compiler_error("Unsupported incremental_mode '" ~ incremental_mode ~ "', expected 'loaded_at' or 'partition'.") }}
+    {%- endif -%}
+    {%- set is_partition_window = incremental_mode == "partition" and dagster_var("min_date") is not none -%}
 
     with
     attribution as (
@@ -24,21 +57,52 @@
             t.transacted_at,
             t.individual_party_key,
             i.individual_id,
+            {% for criterion in criteria -%}
+                tp.{{ criterion }} transacted_{{ criterion }},
+            {% endfor -%}
             t._loaded_at
         from transactions t
         inner join individual_party_keys i on t.individual_party_key = i.individual_party_key
-        {% if is_incremental() -%}
-            where t._loaded_at >= (select max(_loaded_at) from {{ this }})
+        {% if criteria -%}
+            inner join products tp on t.product_id = tp.product_id
+        {%- endif %}
+        {% if is_incremental() and is_partition_window -%}
+            where {{ partition_window_filter("t.transacted_at") }}
+        {%- elif is_incremental() -%}
+            where t._loaded_at >= {{ loaded_at_watermark() }}
         {%- endif %}
     ),
 
+    attribution_with_entity as (
+        select
+            a.hit_id,
+            i.individual_id,
+            a.campaign_sid,
+            a.advertised_product_id,
+            {% for criterion in criteria -%}
+                ap.{{ criterion }} advertised_{{ criterion }},
+            {% endfor -%}
+            a.attribution_start_at,
+            a.attribution_start_at + interval {{ "'n days'" | replace("n", lookback_window) }} attribution_end_at
+        from attribution a
+        inner join individual_party_keys i on a.individual_party_key = i.individual_party_key
+        {% if criteria -%}
+            inner join products ap on a.advertised_product_id = ap.product_id
+        {%- endif %}
+        {%- if is_incremental() and is_partition_window %}
+            where {{ partition_window_filter("a.attribution_start_at", lookback_window) }}
+        {%- elif is_incremental() %}
+            where a._loaded_at >= {{ loaded_at_watermark() }} - interval {{ "'n days'" | replace("n", lookback_window) }}
+        {% endif %}
+    ),
+
     attributed as (
         select
             {{ generate_sid(["t.transaction_id", "t.product_id", "t.transacted_at"]) }} attribution_sid,
             {{ lookback_window }} lookback_window,
             {{ criteria }} criteria,
             a.hit_id,
-            i.individual_id,
+            t.individual_id,
             a.campaign_sid,
             t.transaction_id,
             a.advertised_product_id,
@@ -46,38 +110,35 @@
             t.sales_channel,
             t.transacted_at,
             a.attribution_start_at,
-            coalesce(
-                lag(a.attribution_start_at) over (
-                    partition by i.individual_id
-                    order by a.attribution_start_at, a.hit_id
-                ),
-                a.attribution_start_at + interval {{ "'n days'" | replace("n", lookback_window) }}
-            ) attribution_end_at,
+            a.attribution_end_at,
             t._loaded_at
-        from attribution a
-        inner join individual_party_keys i on a.individual_party_key = i.individual_party_key
-        inner join transactions_with_entity t on true
-            and i.individual_id = t.individual_id
-            and t.transacted_at >= a.attribution_start_at
-        {% if criteria -%}
-            inner join products ap on a.advertised_product_id = ap.product_id
-            inner join products tp on t.product_id = tp.product_id
+        {% if join_strategy == "asof" -%}
+            from transactions_with_entity t
+            asof join attribution_with_entity a
+                match_condition (t.transacted_at >= a.attribution_start_at)
+                on t.individual_id = a.individual_id
+                {%- for criterion in criteria %}
+                    and t.transacted_{{ criterion }} = a.advertised_{{ criterion }}
+                {%- endfor %}
+            where t.transacted_at < a.attribution_end_at
+        {%- else -%}
+            from attribution_with_entity a
+            inner join transactions_with_entity t on true
+                and a.individual_id = t.individual_id
+                and t.transacted_at >= a.attribution_start_at
+                and t.transacted_at < a.attribution_end_at
+                {%- for criterion in criteria %}
+                    and a.advertised_{{ criterion }} = t.transacted_{{ criterion }}
+                {%- endfor %}
         {%- endif %}
-        where true
-            {% if criteria -%}
-                {%- for criterion in criteria -%}
-                        and ap.{{- criterion }} = tp.{{- criterion }}
-                {% endfor -%}
-            {%- endif -%}
-        {%- if is_incremental() %}
-            and a._loaded_at >= (select max(_loaded_at) - interval {{ "'n days'" | replace("n", lookback_window) }} from {{ this }})
-        {% endif %}
-        qualify t.transacted_at < attribution_end_at
     )
 
     select
         *
     from attributed
-    qualify 1 = row_number() over (partition by attribution_sid order by attribution_start_at desc)
+    qualify 1 = row_number() over (
+        partition by attribution_sid
+        order by attribution_start_at desc, hit_id desc
+    )
 
-{% endmacro %}
\ No newline at end of file
+{% endmacro %}
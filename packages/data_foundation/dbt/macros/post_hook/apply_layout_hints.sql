@@ -0,0 +1,55 @@
+{#-
+Applies the physical layout hints in `meta.dagster` to a table after it is built:
+
+    meta = {"dagster": {
+        "cluster_by": ["to_date(hit_at)"],
+        "automatic_clustering": true,
+        "search_optimization": {"equality": ["hit_sid"]}
+    }}
+
+The clustering key is set on every build, since incremental builds do not recreate
+the table. Automatic clustering is resumed or suspended to match the hint, and only
+search optimizations missing from the table are added. The hints are validated by
+the Dagster translator when the definitions load. Views, ephemeral models, and
+dynamic tables are left untouched.
+
+Runs for every model as a post hook configured in `dbt_project.yml`.
+-#}
+{% macro apply_layout_hints() %}
+
+    {% set hints = (config.get("meta") or {}).get("dagster") or {} %}
+    {% if execute and config.get("materialized") in ["table", "incremental"] %}
+        {% set cluster_by = hints.get("cluster_by") %}
+        {% if cluster_by is string %}
+            {% set cluster_by = [cluster_by] %}
+        {% endif %}
+
+        {% if cluster_by %}
+            {% do run_query("alter table " ~ this ~ " cluster by (" ~ cluster_by | join(", ") ~ ")") %}
+
+            {% if hints.get("automatic_clustering") is not none %}
+                {% set action = "resume" if hints["automatic_clustering"] else "suspend" %}
+                {% do run_query("alter table " ~ this ~ " " ~ action ~ " recluster") %}
+            {% endif %}
+        {% endif %}
+
+        {% set search_optimization = hints.get("search_optimization") or {} %}
+        {% if search_optimization is sequence and search_optimization is not mapping %}
+            {% set search_optimization = {"equality": search_optimization} %}
+        {% endif %}
+
+        {% if search_optimization %}
+            {% set existing = [] %}
+            {% for row in run_query("describe search optimization on " ~ this) %}
+                {% do existing.append((row["method"] | lower, row["target"] | lower)) %}
+            {% endfor %}
+
+            {% for method, columns in search_optimization.items() %}
+                {% for column in columns if (method | lower, column | lower) not in existing %}
+                    {% do run_query("alter table " ~ this ~ " add search optimization on " ~ method ~ "(" ~ column ~ ")") %}
+                {% endfor %}
+            {% endfor %}
+        {% endif %}
+    {% endif %}
+
+{% endmacro %}
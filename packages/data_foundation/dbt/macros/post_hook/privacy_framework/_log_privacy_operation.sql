@@ -27,8 +27,8 @@
 
 {% endmacro %}
 
-{% macro _get_privacy_log() %}
-    {% set schema_fqn = this.database~"."~generate_schema_name("logs") %}
+{% macro _get_privacy_log(database=none) %}
+    {% set schema_fqn = (database or this.database)~"."~generate_schema_name("logs") %}
     {% set privacy_log_fqn = schema_fqn~".privacy_log" %}
 
     {% set create_schema %}
@@ -58,3 +58,22 @@
     {% do return(privacy_log_fqn) %}
 
 {% endmacro %}
+
+{% macro _get_privacy_watermark(database) %}
+    {% set watermark_fqn = database~"."~generate_schema_name("logs")~".privacy_watermark" %}
+
+    {% set create_table %}
+        create table if not exists {{ watermark_fqn }}(
+            fqn varchar,
+            operation varchar,
+            cutoff_at timestamp_ntz,
+            updated_at timestamp_ntz default current_timestamp()
+        )
+        ;
+    {% endset %}
+
+    {% do run_query(create_table) %}
+
+    {% do return(watermark_fqn) %}
+
+{% endmacro %}
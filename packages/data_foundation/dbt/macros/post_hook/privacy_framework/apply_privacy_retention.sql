@@ -0,0 +1,143 @@
+{#-
+Enforces the retention rules of many tables in one operation, run by the privacy
+retention asset rather than after every build:
+
+    dbt run-operation apply_privacy_retention --args '{"rules": [...]}'
+
+Each rule has the `relation` to process, its `reference_date_column`, and optional
+`delete_interval`, `anonymize_interval`, and `pii_columns`. The cutoff of every
+operation is stored in a watermark table, and the next run only processes the rows
+whose reference date crossed the interval since that cutoff, instead of scanning the
+whole table. Set `full_scan` to process every row past the cutoff again, for example
+after late arriving rows were loaded with an old reference date.
+
+All operations of a database are logged to its privacy log with one insert, and
+their watermarks are advanced with one merge.
+-#}
+{%- macro apply_privacy_retention(rules, full_scan=false) %}
+
+    {% if execute %}
+        {% set run_at = run_started_at.strftime("%Y-%m-%d %H:%M:%S") %}
+        {% set databases = {} %}
+
+        {% for rule in rules %}
+            {% set database = rule["relation"].split(".")[0] %}
+            {% if database not in databases %}
+                {% set privacy_log_fqn = _get_privacy_log(database) %}
+                {% set watermark_fqn = _get_privacy_watermark(database) %}
+                {% set watermarks = {} %}
+                {% for row in run_query("select fqn, operation, max(cutoff_at)::varchar from " ~ watermark_fqn ~ " group by all") %}
+                    {% do watermarks.update({row[0] ~ ":" ~ row[1]: row[2]}) %}
+                {% endfor %}
+                {% do databases.update({database: {
+                    "privacy_log": privacy_log_fqn,
+                    "watermark": watermark_fqn,
+                    "watermarks": watermarks,
+                    "operations": [],
+                }}) %}
+            {% endif %}
+            {% set state = databases[database] %}
+
+            {% set operations = [] %}
+            {% if rule.get("delete_interval") %}
+                {% do operations.append(("delete", rule["delete_interval"], [])) %}
+            {% endif %}
+            {% if rule.get("anonymize_interval") and rule.get("pii_columns") %}
+                {% do operations.append(("anonymize", rule["anonymize_interval"], rule["pii_columns"])) %}
+            {% endif %}
+
+            {% for operation, interval, columns in operations %}
+                {% set column = rule["reference_date_column"] %}
+                {% set cutoff = "'" ~ run_at ~ "'::timestamp_ntz - interval '" ~ interval ~ "'" %}
+                {% set previous_cutoff = state["watermarks"].get(rule["relation"] ~ ":" ~ operation) %}
+
+                {% set dml %}
+                    {% if operation == "delete" %}
+                        delete from {{ rule["relation"] }}
+                    {% else %}
+                        update {{ rule["relation"] }} set
+                            {% for col in columns %}
+                                {{ col }} = Null
+                                {%- if not loop.last -%}
+                                    ,
+                                {%- endif -%}
+                            {%- endfor %}
+                    {% endif %}
+                    where {{ column }} <= {{ cutoff }}
+                    {% if previous_cutoff and not full_scan %}
+                        and {{ column }} > '{{ previous_cutoff }}'::timestamp_ntz
+                    {% endif %}
+                    {% if operation == "anonymize" %}
+                        and ( false
+                            {% for col in columns %}
+                                or {{ col }} is not null
+                            {%- endfor %}
+                        )
+                    {% endif %}
+                {% endset %}
+
+                {% set affected_rows = run_query(dml)[0][0] %}
+                {% do state["operations"].append({
+                    "operation": operation,
+                    "relation": rule["relation"],
+                    "reference_date_column": column,
+                    "columns": columns,
+                    "interval": interval,
+                    "cutoff": cutoff,
+                    "affected_rows": affected_rows,
+                }) %}
+                {{ log(operation|capitalize ~ " retention applied to '" ~ rule["relation"] ~ "', " ~ affected_rows ~ " rows affected.", True) }}
+            {% endfor %}
+        {% endfor %}
+
+        {% for database, state in databases.items() if state["operations"] %}
+            {% set log_dml %}
+                insert into {{ state["privacy_log"] }} (
+                    operation, fqn, database_name, schema_name, table_name,
+                    reference_date_column, anonymized_columns, retention_interval,
+                    affected_rows
+                )
+                {% for entry in state["operations"] %}
+                    {% set parts = entry["relation"].split(".") %}
+                    select
+                        '{{ entry["operation"] }}',
+                        '{{ entry["relation"] }}',
+                        '{{ parts[0] }}',
+                        '{{ parts[1] }}',
+                        '{{ parts[2] }}',
+                        '{{ entry["reference_date_column"] }}',
+                        {{ entry["columns"]|string }},
+                        '{{ entry["interval"] }}',
+                        {{ entry["affected_rows"] }}
+                    {% if not loop.last %}union all{% endif %}
+                {% endfor %}
+                ;
+            {% endset %}
+
+            {% set watermark_dml %}
+                merge into {{ state["watermark"] }} w
+                using (
+                    {% for entry in state["operations"] %}
+                        select
+                            '{{ entry["relation"] }}' fqn,
+                            '{{ entry["operation"] }}' operation,
+                            {{ entry["cutoff"] }} cutoff_at
+                        {% if not loop.last %}union all{% endif %}
+                    {% endfor %}
+                ) s
+                on w.fqn = s.fqn and w.operation = s.operation
+                when matched then update set
+                    cutoff_at = s.cutoff_at,
+                    updated_at = current_timestamp()
+                when not matched then insert (fqn, operation, cutoff_at)
+                    values (s.fqn, s.operation, s.cutoff_at)
+                ;
+            {% endset %}
+
+            {% do run_query(log_dml) %}
+            {% do run_query(watermark_dml) %}
+            {{ log("Privacy retention logged to: '" ~ state["privacy_log"] ~ "'", True) }}
+        {% endfor %}
+    {% endif %}
+
+{%- endmacro %}
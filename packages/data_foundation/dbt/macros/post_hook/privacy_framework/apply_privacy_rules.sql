@@ -1,5 +1,17 @@
+{#-
+Applies the privacy rules of a model as a post hook.
+
+Retention is normally enforced by the privacy retention asset from the rules in
+`meta.privacy`, so the post hook only applies the dynamic mask to the `pii_columns`
+listed there. Passing `delete_interval` or `anonymize_interval` still enforces
+retention on every build.
+-#}
 {% macro apply_privacy_rules(apply_mask=True, delete_interval=None, anonymize_interval=None, reference_date_column=None, pii_columns=[] ) %}
 
+    {% if not pii_columns %}
+        {% set pii_columns = (config.get("meta") or {}).get("privacy", {}).get("pii_columns", []) %}
+    {% endif %}
+
     {% if apply_mask %}
         {% do apply_dynamic_data_mask(pii_columns) %}
     {% endif %}
@@ -0,0 +1,23 @@
+{#-
+Switches the session to the warehouse Dagster chose for the run:
+
+    {"snowflake_warehouse": "compute_wh_large"}
+
+Adaptive runs pass the warehouse in the `snowflake_warehouse` run var, see
+macros/control/dagster_var.sql. The warehouse of the profile stays static, because
+dbt reparses the whole project whenever the connection details of the profile change.
+Hooks are rendered when a node runs rather than when the project is parsed, so the
+run var does not invalidate the partial parse artifact. Nodes that pin
+`snowflake_warehouse` in their config, such as dynamic tables, keep their own
+warehouse, and runs without the var keep the warehouse of the profile.
+
+Runs for every model, seed, and snapshot as a pre hook configured in `dbt_project.yml`.
+-#}
+{% macro use_run_warehouse() %}
+
+    {% set warehouse = dagster_var("snowflake_warehouse") %}
+    {% if execute and warehouse and not config.get("snowflake_warehouse") %}
+        use warehouse {{ warehouse }}
+    {% endif %}
+
+{% endmacro %}
@@ -4,8 +4,17 @@
         alias = "int_attributions_last_click_30d",
         materialized="incremental",
         incremental_strategy="delete+insert",
-        unique_key="attribution_sid"
+        unique_key="attribution_sid",
+        incremental_predicates=partition_window_predicates("transacted_at"),
+        tags=["partitioned"],
+        meta={
+            "dagster": {
+                "partition": "monthly",
+                "partition_start_date": "2025-07-01",
+                "test_sample": {"column": "transacted_at"}
+            }
+        }
     )
 -}}
 
-{{- attribution_last_click_n_days_same_x("30") -}} --noqa:all
+{{- attribution_last_click_n_days_same_x("30", join_strategy="asof", incremental_mode="partition") -}} --noqa:all
@@ -58,7 +58,7 @@ inner join campaigns c on true --noqa:LT02
     and h.campaign_id = c.campaign_id
 
 {% if is_incremental() -%}
-    where greatest_ignore_nulls(h._loaded_at, c._loaded_at) >= (
-        select max(_loaded_at) from {{ this }}
-    )
+    where
+        greatest_ignore_nulls(h._loaded_at, c._loaded_at)
+        >= {{ loaded_at_watermark() }}
 {%- endif %}
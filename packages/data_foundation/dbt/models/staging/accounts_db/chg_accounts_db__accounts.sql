@@ -0,0 +1,11 @@
+{{-
+    config(
+        materialized = "ephemeral",
+        alias = "accounts_changes"
+    )
+-}}
+
+-- the alias keeps the relation name distinct from the staging model of the table
+-- accounts changed since the last run of snp_accounts_db__accounts
+select * from {{ source("accounts_db", "accounts") }} --noqa:AM04
+where {{ snapshot_change_window("snp_accounts_db__accounts", "updated_at") }}
@@ -9,21 +9,19 @@
             "dagster": {
                 "automation_condition": "eager",
                 "freshness_check": {"lower_bound_delta_seconds": 129600}
+            },
+            "privacy": {
+                "delete_interval": "10 years",
+                "anonymize_interval": "5 years",
+                "reference_date_column": "updated_at",
+                "pii_columns": [
+                    "account_first_name",
+                    "account_last_name",
+                    "account_email",
+                ]
             }
         },
-        post_hook = ["{{
-            apply_privacy_rules(
-                apply_mask=True,
-                delete_interval='10 years',
-                anonymize_interval='5 years',
-                reference_date_column='updated_at',
-                pii_columns=[
-                    'account_first_name',
-                    'account_last_name',
-                    'account_email',
-                ]
-            )
-        }}"]
+        post_hook = ["{{ apply_privacy_rules() }}"]
     )
 -}}
 
@@ -10,7 +10,11 @@
             "dagster": {
                 "partition": "monthly",
                 "partition_start_date": "2025-07-01",
-                "automation_condition": "eager"
+                "automation_condition": "eager",
+                "cluster_by": ["to_date(hit_at)"],
+                "automatic_clustering": true,
+                "max_clustering_depth": 8,
+                "test_sample": {"column": "hit_at"}
             }
         }
     )
@@ -59,6 +63,6 @@ left join accounts a on h.post_evar133 = a.id
 
 {% if is_incremental() -%}
     where
-        hit_at >= '{{ var("min_date", "1900-01-01") }}'
-        and hit_at <= '{{ var("max_date", "9999-12-31") }}'
+        hit_at >= '{{ dagster_var("min_date", "1900-01-01") }}'
+        and hit_at <= '{{ dagster_var("max_date", "9999-12-31") }}'
 {%- endif %}
@@ -27,5 +27,5 @@ select
 from individual_party_keys
 
 {% if is_incremental() -%}
-    where _loaded_at >= coalesce((select max(_loaded_at) from {{ this }}), '1900-01-01')
+    where _loaded_at >= {{ loaded_at_watermark() }}
 {%- endif %}
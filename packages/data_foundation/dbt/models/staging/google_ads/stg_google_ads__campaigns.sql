@@ -26,7 +26,7 @@ select
 from campaigns
 
 {% if is_incremental() -%}
-    where _loaded_at >= coalesce((select max(_loaded_at) from {{ this }}), '1900-01-01')
+    where _loaded_at >= {{ loaded_at_watermark() }}
 {%- endif %}
 
 qualify 1 = row_number() over (partition by id order by _loaded_at desc)
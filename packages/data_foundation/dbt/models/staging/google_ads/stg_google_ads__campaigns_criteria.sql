@@ -31,5 +31,5 @@ from campaigns a
 inner join campaign_criteria b on a._dlt_id = b._dlt_parent_id
 
 {% if is_incremental() -%}
-    where _loaded_at >= coalesce((select max(_loaded_at) from {{ this }}), '1900-01-01')
+    where _loaded_at >= {{ loaded_at_watermark() }}
 {%- endif %}
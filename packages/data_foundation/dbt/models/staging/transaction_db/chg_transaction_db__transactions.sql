@@ -0,0 +1,13 @@
+{{-
+    config(
+        materialized = "ephemeral",
+        alias = "transactions_changes"
+    )
+-}}
+
+-- the alias keeps the relation name distinct from the staging model of the table
+-- transactions changed since the last run of snp_transaction_db__transactions_snapshot
+select * from {{ source("transaction_db", "transactions") }} --noqa:AM04
+where {{ snapshot_change_window(
+    "snp_transaction_db__transactions_snapshot", "date_time"
+) }}
@@ -0,0 +1,33 @@
+{#
+    Measure the collision rate of a surrogate key generated with `generate_sid`.
+    Every distinct combination of `source_columns` should have its own key, so the
+    rate is the share of combinations that share a key with another combination.
+
+    Returns a single row with the number of combinations, keys, and the collision
+    rate when the rate exceeds `max_collision_rate`. Configure `store_failures` to
+    keep the row of each run and follow the rate over time.
+#}
+{% test sid_collision_rate(model, column_name, source_columns, max_collision_rate=0) %}
+
+    with
+    combinations as (
+        select distinct
+            {{ column_name }} sid,
+            {{ source_columns | join(", ") }}
+        from {{ model }}
+    ),
+
+    summary as (
+        select
+            count(*) combinations,
+            count(distinct sid) sids,
+            count(*) - count(distinct sid) collisions,
+            (count(*) - count(distinct sid)) / nullif(count(*), 0) collision_rate
+        from combinations
+    )
+
+    select *
+    from summary
+    where collision_rate > {{ max_collision_rate }}
+
+{% endtest %}
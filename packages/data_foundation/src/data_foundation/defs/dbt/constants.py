@@ -1,10 +1,33 @@
 """Constant values that are useful in selecting dbt models."""
 
 # partition selectors
-TIME_PARTITION_SELECTOR = "config.tags:partitioned"
+TIME_PARTITION_TAG = "partitioned"
+TIME_PARTITION_SELECTOR = f"config.tags:{TIME_PARTITION_TAG}"
 
 
 # resource type selectors
 SNAPSHOT_SELECTOR = "resource_type:snapshot"
 MODEL_SELECTOR = "resource_type:model"
 SEED_SELECTOR = "resource_type:seed"
+
+
+# materializations
+DYNAMIC_TABLE_MATERIALIZATION = "dynamic_table"
+
+
+# materialization metadata of the Sling assets read by the snapshot precheck
+ROW_COUNT_METADATA_KEY = "dagster/row_count"
+MAX_UPDATE_KEY_METADATA_KEY = "max_update_key"
+
+# validated physical layout hints of a dbt node, see get_layout_hints_from_meta
+LAYOUT_HINTS_METADATA_KEY = "dbt_layout_hints"
+
+# latest _loaded_at of incremental models calling the loaded_at_watermark macro
+LOADED_AT_WATERMARK_MACRO = "loaded_at_watermark"
+LOADED_AT_WATERMARK_METADATA_KEY = "dbt_loaded_at_watermark"
+
+# dbt tests that run outside of the runs that build their models
+DEFERRED_CHECK_METADATA_KEY = "dbt_deferred_check"
+
+# environment variable holding the vars of a run, read by the dagster_var macro
+RUN_VARS_ENV = "DAGSTER_DBT_RUN_VARS"
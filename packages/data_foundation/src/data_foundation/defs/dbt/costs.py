@@ -0,0 +1,179 @@
+"""Asset that attributes Snowflake warehouse cost to the dbt assets that incurred it.
+
+Every query dbt runs through Dagster carries an opaque id comment with the unique id of
+the node that issued it. The cost attribution asset reads the recent query history,
+aggregates the credits, elapsed time, and bytes scanned per dbt node and per Dagster
+asset key, and publishes the ranked results as tables in its materialization metadata.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import dagster as dg
+from dagster_dbt.asset_utils import DAGSTER_DBT_UNIQUE_ID_METADATA_KEY
+from dagster_snowflake import SnowflakeResource
+from data_platform_utils.query_attribution import (
+    aggregate_query_costs,
+    get_query_history_sql,
+    group_costs,
+    rank_costs,
+)
+
+COST_TABLE_SCHEMA = dg.TableSchema(
+    columns=[
+        dg.TableColumn("key", "string"),
+        dg.TableColumn("credits", "float"),
+        dg.TableColumn("elapsed_seconds", "float"),
+        dg.TableColumn("bytes_scanned", "int"),
+        dg.TableColumn("query_count", "int"),
+        dg.TableColumn("invocations", "int"),
+    ]
+)
+
+
+class CostAttributionConfig(dg.Config):
+    """Runtime configuration of the cost attribution asset.
+
+    Attributes:
+        lookback_hours: Hours of query history attributed by a materialization.
+        top_n: Number of entries kept in each cost table.
+        rank_by: Measure the cost tables are ranked by, one of ``credits``,
+            ``elapsed_seconds``, or ``bytes_scanned``.
+    """
+
+    lookback_hours: int = 24
+    top_n: int = 25
+    rank_by: str = "credits"
+
+
+def get_unique_id_asset_keys(
+    assets_defs: Iterable[dg.AssetsDefinition],
+) -> dict[str, str]:
+    """Map the unique id of every dbt node in the given definitions to its asset key.
+
+    Args:
+        assets_defs: dbt assets definitions.
+
+    Returns:
+        dict[str, str]: User facing asset key strings keyed by dbt unique id.
+    """
+    return {
+        spec.metadata[DAGSTER_DBT_UNIQUE_ID_METADATA_KEY]: spec.key.to_user_string()
+        for assets_def in assets_defs
+        for spec in assets_def.specs
+        if DAGSTER_DBT_UNIQUE_ID_METADATA_KEY in spec.metadata
+    }
+
+
+def get_cost_table(
+    costs: Mapping[str, Mapping[str, Any]], rank_by: str, top_n: int
+) -> dg.TableMetadataValue:
+    """Rank costs into a table metadata value.
+
+    Args:
+        costs: Costs keyed by dbt unique id or asset key.
+        rank_by: Measure to rank the rows by.
+        top_n: Number of rows kept.
+
+    Returns:
+        dagster.TableMetadataValue: The most expensive entries in descending order.
+    """
+    return dg.MetadataValue.table(
+        records=[
+            dg.TableRecord({
+                "key": key,
+                "credits": round(cost["credits"], 6),
+                "elapsed_seconds": round(cost["elapsed_seconds"], 3),
+                "bytes_scanned": cost["bytes_scanned"],
+                "query_count": cost["query_count"],
+                "invocations": cost["invocations"],
+            })
+            for key, cost in rank_costs(costs, by=rank_by, top_n=top_n)
+        ],
+        schema=COST_TABLE_SCHEMA,
+    )
+
+
+def get_cost_metadata(
+    rows: Iterable[Mapping[str, Any]],
+    asset_keys: Mapping[str, str],
+    rank_by: str = "credits",
+    top_n: int = 25,
+) -> dict[str, Any]:
+    """Aggregate query history rows into the materialization metadata of the asset.
+
+    Args:
+        rows: Query history rows returned by
+            :func:`data_platform_utils.query_attribution.get_query_history_sql`.
+        asset_keys: Asset key of each dbt unique id.
+        rank_by: Measure the cost tables are ranked by.
+        top_n: Number of entries kept in each cost table.
+
+    Returns:
+        dict[str, Any]: Totals for the window, and cost tables per asset and per node.
+    """
+    node_costs = aggregate_query_costs(rows)
+    asset_costs = group_costs(node_costs, asset_keys)
+
+    return {
+        "total_credits": round(sum(c["credits"] for c in node_costs.values()), 6),
+        "total_elapsed_seconds": round(
+            sum(c["elapsed_seconds"] for c in node_costs.values()), 3
+        ),
+        "attributed_queries": sum(c["query_count"] for c in node_costs.values()),
+        "cost_by_asset": get_cost_table(asset_costs, rank_by, top_n),
+        "cost_by_node": get_cost_table(node_costs, rank_by, top_n),
+    }
+
+
+def build_cost_attribution_asset(
+    assets_defs: Iterable[dg.AssetsDefinition],
+) -> dg.AssetsDefinition:
+    """Build the asset that attributes warehouse cost to the given dbt assets.
+
+    Args:
+        assets_defs: dbt assets definitions whose queries are attributed.
+
+    Returns:
+        dagster.AssetsDefinition: A daily asset that reads the Snowflake query history
+            with the ``snowflake`` resource.
+    """
+    asset_keys = get_unique_id_asset_keys(assets_defs)
+
+    @dg.asset(
+        key=["dbt", "cost_attribution"],
+        group_name="observability",
+        kinds={"snowflake", "dbt"},
+        automation_condition=dg.AutomationCondition.on_cron("0 6 * * *"),
+        description="Snowflake credits, elapsed time, and bytes scanned of recent "
+        "dbt queries ranked per dbt asset.",
+    )
+    def dbt_cost_attribution( # pragma: no coverage
+        context: dg.AssetExecutionContext,
+        snowflake: SnowflakeResource,
+        config: CostAttributionConfig,
+    ) -> dg.MaterializeResult:
+        """Read the query history and publish the cost of each dbt asset.
+
+        Args:
+            context: Dagster execution context used for logging.
+            snowflake: Snowflake resource with access to the account usage views.
+            config: Window and ranking of the attribution.
+
+        Returns:
+            dagster.MaterializeResult: Cost totals and tables as metadata.
+        """
+        with snowflake.get_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(get_query_history_sql(config.lookback_hours))
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
+
+        context.log.info(f"Attributing {len(rows)} dbt queries.")
+        return dg.MaterializeResult(
+            metadata=get_cost_metadata(
+                rows, asset_keys, rank_by=config.rank_by, top_n=config.top_n
+            )
+        )
+
+    return dbt_cost_attribution
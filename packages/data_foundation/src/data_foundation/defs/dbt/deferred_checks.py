@@ -0,0 +1,113 @@
+"""Run the non-blocking dbt tests outside of the runs that build their models.
+
+``dbt build`` runs every test right after the model it tests, so warn severity and
+expensive tests hold threads and lengthen the run even though nothing downstream
+waits on them. Tests with ``warn`` severity, or marked ``deferred`` in
+``meta.dagster``, are deferred: the runs that materialize their models exclude them,
+and a dedicated automation sensor launches them in a separate, low-priority run once
+their models have been updated. Blocking tests keep running right after their model,
+so downstream assets are unblocked as soon as they pass.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import dagster as dg
+from dagster_dbt.asset_utils import DAGSTER_DBT_UNIQUE_ID_METADATA_KEY
+from data_platform_utils.helpers import get_nested
+
+from .constants import DEFERRED_CHECK_METADATA_KEY
+
+DEFERRED_CHECKS_SENSOR_NAME = "dbt_deferred_checks_sensor"
+DEFERRED_CHECKS_RUN_PRIORITY = "-1"
+
+
+def is_deferred_test(test_resource_props: Mapping[str, Any]) -> bool:
+    """Check whether a dbt test runs outside of the runs that build its model.
+
+    Args:
+        test_resource_props: dbt test node dictionary.
+
+    Returns:
+        bool: Whether the test has ``warn`` severity, or sets ``deferred`` in
+            ``meta.dagster``.
+    """
+    severity = get_nested(test_resource_props, ["config", "severity"]) or "error"
+    meta = (
+        get_nested(test_resource_props, ["config", "meta", "dagster"])
+        or get_nested(test_resource_props, ["meta", "dagster"])
+        or {}
+    )
+    return severity.lower() == "warn" or bool(meta.get("deferred"))
+
+
+def get_deferred_check_keys(
+    assets_defs: Iterable[dg.AssetsDefinition],
+) -> dict[dg.AssetCheckKey, str]:
+    """Return the checks the translator marked as deferred.
+
+    Args:
+        assets_defs: dbt assets definitions built with the custom translator.
+
+    Returns:
+        dict[dagster.AssetCheckKey, str]: The dbt unique id of each deferred check.
+    """
+    return {
+        spec.key: spec.metadata[DAGSTER_DBT_UNIQUE_ID_METADATA_KEY]
+        for assets_def in assets_defs
+        for spec in assets_def.check_specs
+        if spec.metadata.get(DEFERRED_CHECK_METADATA_KEY)
+    }
+
+
+def get_excluded_tests(context: dg.AssetExecutionContext) -> list[str]:
+    """Return the deferred tests to exclude from a run.
+
+    Runs that only execute checks, such as the runs of the deferred checks sensor,
+    exclude nothing.
+
+    Args:
+        context: Execution context of the dbt assets run.
+
+    Returns:
+        list[str]: Unique ids of the selected deferred tests, when the run
+            materializes assets.
+    """
+    if not context.selected_asset_keys:
+        return []
+
+    deferred_check_keys = get_deferred_check_keys([context.assets_def])
+    return sorted(
+        deferred_check_keys[check_key]
+        for check_key in context.selected_asset_check_keys
+        if check_key in deferred_check_keys
+    )
+
+
+def build_deferred_checks_sensor(
+    assets_defs: Iterable[dg.AssetsDefinition],
+) -> list[dg.AutomationConditionSensorDefinition]:
+    """Build the automation sensor that runs the deferred checks.
+
+    Args:
+        assets_defs: dbt assets definitions containing the deferred checks.
+
+    Returns:
+        list[dagster.AutomationConditionSensorDefinition]: A sensor launching the
+            deferred checks at low priority, an empty list when no check is
+            deferred.
+    """
+    deferred_check_keys = get_deferred_check_keys(assets_defs)
+    if not deferred_check_keys:
+        return []
+
+    return [
+        dg.AutomationConditionSensorDefinition(
+            DEFERRED_CHECKS_SENSOR_NAME,
+            target=dg.AssetSelection.checks(*deferred_check_keys),
+            run_tags={"dagster/priority": DEFERRED_CHECKS_RUN_PRIORITY},
+            default_status=dg.DefaultSensorStatus.RUNNING,
+            description="Runs the non-blocking dbt tests after their models are "
+            "updated, in low-priority runs separate from the model builds.",
+        )
+    ]
@@ -13,6 +13,7 @@ from dagster.components import definitions
 from dagster_dbt import DbtProject
 
 from .factory import Factory
+from .parse_artifacts import prepare_parse_artifacts
 
 
 @definitions
@@ -35,9 +36,10 @@ def defs() -> Definitions:
 
         Returns:
             dagster_dbt.DbtProject: The fully configured dbt project instance that
-                Dagster will interact with when executing assets. The helper runs
-                ``prepare_if_dev`` to ensure the project is ready for local execution
-                when targeting a development profile.
+                Dagster will interact with when executing assets. The project is
+                parsed again when the parse artifacts shipped with the code no longer
+                match it, so the manifest and partial parse artifact are always
+                current.
         """
         project = DbtProject(
             project_dir=project_dir,
@@ -46,7 +48,12 @@ def defs() -> Definitions:
             state_path=state_path,
             profile="dbt",
         )
-        # project.prepare_if_dev()
+        prepare_parse_artifacts(project)
         return project
     
-    return Factory.build_definitions(dbt)
+    max_shards = os.getenv("DBT_MAX_SHARDS")
+    return Factory.build_definitions(
+        dbt,
+        shard_by=os.getenv("DBT_SHARD_BY") or None,
+        max_shards=int(max_shards) if max_shards else None,
+    )
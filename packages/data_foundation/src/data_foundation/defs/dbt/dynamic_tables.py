@@ -0,0 +1,305 @@
+"""Observe the refreshes of dbt models materialized as Snowflake dynamic tables.
+
+Snowflake refreshes a dynamic table on its own to stay within its ``target_lag``, so
+dbt only needs to run the model when its definition changes. The dynamic table sensor
+reads the refresh history of every dynamic table in the project, and records each
+refresh that changed data as an observation of the asset. The data timestamp of the
+refresh is used as the data version, so downstream assets see new data without the
+dynamic table being rebuilt by Dagster.
+
+Set ``DBT_DYNAMIC_TABLE_STUB=true`` to read refreshes from :class:`RefreshHistoryStub`
+instead of Snowflake, for local development without warehouse access.
+"""
+
+import json
+import re
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import dagster as dg
+from dagster._core.definitions.data_version import DATA_VERSION_TAG
+from dagster_snowflake import SnowflakeResource
+
+from .constants import DYNAMIC_TABLE_MATERIALIZATION
+from .costs import get_unique_id_asset_keys
+
+# refreshes that did not change the data of the table
+NO_DATA_REFRESH_ACTIONS = ("NO_DATA",)
+
+# refresh statistics recorded as observation metadata
+REFRESH_STATISTICS = {
+    "numInsertedRows": "rows_inserted",
+    "numDeletedRows": "rows_deleted",
+    "numCopiedRows": "rows_copied",
+}
+
+TARGET_LAG_PATTERN = re.compile(
+    r"(?P<value>\d+)\s*(?P<unit>second|minute|hour|day)s?", re.IGNORECASE
+)
+
+
+def get_dynamic_tables(manifest: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the models of a manifest materialized as dynamic tables.
+
+    Args:
+        manifest: A parsed dbt manifest.
+
+    Returns:
+        dict[str, dict[str, Any]]: The ``relation`` and ``target_lag`` of each dynamic
+            table keyed by unique id.
+    """
+    return {
+        unique_id: {
+            "relation": node["relation_name"],
+            "target_lag": node["config"].get("target_lag"),
+        }
+        for unique_id, node in manifest.get("nodes", {}).items()
+        if node.get("config", {}).get("materialized") == DYNAMIC_TABLE_MATERIALIZATION
+    }
+
+
+def normalize_relation(relation: str) -> str:
+    """Normalize a relation name so dbt and Snowflake names compare equal.
+
+    Args:
+        relation: A fully qualified, optionally quoted, relation name.
+
+    Returns:
+        str: The unquoted lower case relation name.
+    """
+    return relation.replace('"', "").lower()
+
+
+def get_refresh_history_sql(relations: Iterable[str], since: datetime) -> str:
+    """Build the query that reads the refresh history of dynamic tables.
+
+    The ``information_schema`` table function is scoped to a database and returns
+    refreshes without the latency of the account usage views, so it is queried once
+    per table.
+
+    Args:
+        relations: Fully qualified names of the dynamic tables.
+        since: Only refreshes with a later data timestamp are returned.
+
+    Returns:
+        str: SQL returning the columns read by :func:`get_refresh_observations`.
+    """
+    since_literal = since.astimezone(UTC).strftime("%Y-%m-%d %H:%M:%S")
+    queries = [
+        f"""
+        select
+            qualified_name,
+            state,
+            refresh_action,
+            data_timestamp,
+            refresh_start_time,
+            refresh_end_time,
+            query_id,
+            statistics
+        from table({relation.split(".")[0]}.information_schema
+            .dynamic_table_refresh_history(
+                name => '{relation}',
+                data_timestamp_start => '{since_literal}'::timestamp_ltz
+            ))
+        where state = 'SUCCEEDED'
+        """
+        for relation in relations
+    ]
+    return "union all".join(queries)
+
+
+def get_refresh_observations(
+    rows: Iterable[Mapping[str, Any]],
+    asset_keys: Mapping[str, dg.AssetKey],
+    cursor: Mapping[str, str],
+) -> tuple[list[dg.AssetObservation], dict[str, str]]:
+    """Turn refresh history rows into observations of the dynamic table assets.
+
+    Column names are matched case insensitively, so rows can be passed directly from
+    a Snowflake cursor.
+
+    Args:
+        rows: Successful refreshes returned by :func:`get_refresh_history_sql`.
+        asset_keys: Asset key of each dynamic table keyed by normalized relation name.
+        cursor: Data timestamp of the latest processed refresh of each relation.
+
+    Returns:
+        tuple[list[dagster.AssetObservation], dict[str, str]]: An observation for each
+            new refresh that changed data, and the advanced cursor.
+    """
+    cursor = dict(cursor)
+    refreshes = []
+    for row in rows:
+        row = {key.lower(): value for key, value in row.items()}
+        relation = normalize_relation(row["qualified_name"])
+        data_timestamp = row["data_timestamp"]
+        if isinstance(data_timestamp, datetime):
+            data_timestamp = data_timestamp.astimezone(UTC).isoformat()
+        if relation in asset_keys and data_timestamp > cursor.get(relation, ""):
+            refreshes.append((data_timestamp, relation, row))
+
+    observations = []
+    for data_timestamp, relation, row in sorted(refreshes, key=lambda r: r[:2]):
+        cursor[relation] = data_timestamp
+        if row.get("refresh_action") in NO_DATA_REFRESH_ACTIONS:
+            continue
+
+        statistics = row.get("statistics") or {}
+        if isinstance(statistics, str):
+            statistics = json.loads(statistics)
+        metadata: dict[str, Any] = {
+            "refresh_action": row.get("refresh_action"),
+            "data_timestamp": data_timestamp,
+            "query_id": row.get("query_id"),
+        }
+        if row.get("refresh_start_time") and row.get("refresh_end_time"):
+            metadata["refresh_seconds"] = round(
+                (row["refresh_end_time"] - row["refresh_start_time"]).total_seconds(), 3
+            )
+        for statistic, key in REFRESH_STATISTICS.items():
+            if statistic in statistics:
+                metadata[key] = int(statistics[statistic])
+
+        observations.append(
+            dg.AssetObservation(
+                asset_key=asset_keys[relation],
+                metadata={k: v for k, v in metadata.items() if v is not None},
+                tags={DATA_VERSION_TAG: data_timestamp},
+            )
+        )
+    return observations, cursor
+
+
+def parse_target_lag(target_lag: str | None) -> timedelta:
+    """Convert a dynamic table ``target_lag`` to a duration.
+
+    Args:
+        target_lag: A lag such as ``24 hour``, or ``downstream``.
+
+    Returns:
+        datetime.timedelta: The lag, one hour when the table refreshes downstream or
+            the lag can not be parsed.
+    """
+    match = TARGET_LAG_PATTERN.fullmatch((target_lag or "").strip())
+    if not match:
+        return timedelta(hours=1)
+    return timedelta(**{f"{match['unit'].lower()}s": int(match["value"])})
+
+
+class RefreshHistoryStub:
+    """A stub of the Snowflake refresh history for local development. Every dynamic
+    table is refreshed at each multiple of its target lag since the epoch, with a
+    data change on every refresh.
+    """
+
+    def __init__(self, dynamic_tables: Mapping[str, Mapping[str, Any]]) -> None:
+        self.dynamic_tables = dynamic_tables
+
+    def get_refresh_history(
+        self, since: datetime, now: datetime | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the latest refresh of each dynamic table since a point in time.
+
+        Args:
+            since: Only refreshes with a later data timestamp are returned.
+            now: Time the history is read at, defaults to the current time.
+
+        Returns:
+            list[dict[str, Any]]: Refresh history rows like the ones returned by
+                :func:`get_refresh_history_sql`.
+        """
+        now = now or datetime.now(UTC)
+        rows = []
+        for dynamic_table in self.dynamic_tables.values():
+            lag = parse_target_lag(dynamic_table["target_lag"])
+            epoch = datetime(1970, 1, 1, tzinfo=UTC)
+            data_timestamp = now - (now - epoch) % lag
+            if data_timestamp > since:
+                rows.append({
+                    "qualified_name": dynamic_table["relation"].upper(),
+                    "state": "SUCCEEDED",
+                    "refresh_action": "INCREMENTAL",
+                    "data_timestamp": data_timestamp,
+                    "refresh_start_time": data_timestamp,
+                    "refresh_end_time": data_timestamp + timedelta(seconds=1),
+                    "query_id": None,
+                    "statistics": {},
+                })
+        return rows
+
+
+def build_dynamic_table_sensor(
+    manifest: dict[str, Any],
+    assets_defs: Iterable[dg.AssetsDefinition],
+    use_stub: bool = False,
+    lookback_hours: int = 24,
+) -> dg.SensorDefinition:
+    """Build the sensor that observes the refreshes of the project's dynamic tables.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        assets_defs: dbt assets definitions containing the dynamic table assets.
+        use_stub: Read the refresh history from :class:`RefreshHistoryStub` instead of
+            the ``snowflake`` resource.
+        lookback_hours: How far back refreshes are read on the first tick.
+
+    Returns:
+        dagster.SensorDefinition: A sensor emitting an observation with a new data
+            version for each refresh of a dynamic table.
+    """
+    dynamic_tables = get_dynamic_tables(manifest)
+    unique_id_asset_keys = get_unique_id_asset_keys(assets_defs)
+    asset_keys = {
+        normalize_relation(dynamic_table["relation"]): dg.AssetKey.from_user_string(
+            unique_id_asset_keys[unique_id]
+        )
+        for unique_id, dynamic_table in dynamic_tables.items()
+        if unique_id in unique_id_asset_keys
+    }
+
+    @dg.sensor(
+        name="dbt_dynamic_table_sensor",
+        minimum_interval_seconds=300,
+        default_status=dg.DefaultSensorStatus.RUNNING,
+        description="Observes the refreshes of dbt models materialized as Snowflake "
+        "dynamic tables.",
+    )
+    def dynamic_table_sensor(
+        context: dg.SensorEvaluationContext, snowflake: SnowflakeResource
+    ) -> dg.SensorResult | dg.SkipReason:
+        """Observe the refreshes since the previous tick.
+
+        Args:
+            context: Sensor context holding the cursor of the latest refreshes.
+            snowflake: Snowflake resource used to read the refresh history.
+
+        Returns:
+            dagster.SensorResult | dagster.SkipReason: Observations of the new
+                refreshes and the advanced cursor.
+        """
+        if not asset_keys:
+            return dg.SkipReason("The dbt project has no dynamic tables.")
+
+        cursor = json.loads(context.cursor) if context.cursor else {}
+        since = datetime.now(UTC) - timedelta(hours=lookback_hours)
+        if cursor:
+            since = min(datetime.fromisoformat(value) for value in cursor.values())
+
+        if use_stub:
+            rows = RefreshHistoryStub(dynamic_tables).get_refresh_history(since)
+        else: # pragma: no cover
+            with snowflake.get_connection() as connection:
+                snowflake_cursor = connection.cursor()
+                snowflake_cursor.execute(get_refresh_history_sql(asset_keys, since))
+                columns = [column[0] for column in snowflake_cursor.description]
+                rows = [
+                    dict(zip(columns, row, strict=True))
+                    for row in snowflake_cursor.fetchall()
+                ]
+
+        observations, cursor = get_refresh_observations(rows, asset_keys, cursor)
+        context.log.info(f"Observed {len(observations)} dynamic table refreshes.")
+        return dg.SensorResult(asset_events=observations, cursor=json.dumps(cursor))
+
+    return dynamic_table_sensor
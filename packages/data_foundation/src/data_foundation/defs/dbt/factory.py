@@ -6,26 +6,104 @@ Launchpad. Each documented function clarifies the expected parameters and emitte
 values to make customizations easier.
 """
 
+import hashlib
 import json
 import os
-from collections.abc import Callable, Generator
+import threading
+from collections.abc import Callable, Generator, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from functools import cache
+from pathlib import Path
 from typing import Any
 
 import dagster as dg
+from dagster._core.definitions.data_version import CODE_VERSION_TAG, DATA_VERSION_TAG
+from dagster._core.storage.tags import (
+    AUTOMATION_CONDITION_TAG,
+    BACKFILL_ID_TAG,
+    SCHEDULE_NAME_TAG,
+    SENSOR_NAME_TAG,
+)
 from dagster_dbt import (
     DagsterDbtTranslatorSettings,
+    DbtCliInvocation,
     DbtCliResource,
     DbtProject,
     build_freshness_checks_from_dbt_assets,
     dbt_assets,
 )
-from dagster_dbt.asset_utils import DBT_DEFAULT_SELECT
+from dagster_dbt.asset_utils import (
+    DAGSTER_DBT_UNIQUE_ID_METADATA_KEY,
+    DBT_DEFAULT_SELECT,
+)
+from dagster_snowflake import SnowflakeResource
+from data_platform_utils.helpers import get_nested
+from data_platform_utils.secrets import get_secret
 
-from .constants import TIME_PARTITION_SELECTOR
+from .constants import (
+    LOADED_AT_WATERMARK_MACRO,
+    LOADED_AT_WATERMARK_METADATA_KEY,
+    MAX_UPDATE_KEY_METADATA_KEY,
+    ROW_COUNT_METADATA_KEY,
+    RUN_VARS_ENV,
+    TIME_PARTITION_SELECTOR,
+    TIME_PARTITION_TAG,
+)
+from .costs import build_cost_attribution_asset
+from .deferred_checks import build_deferred_checks_sensor, get_excluded_tests
+from .dynamic_tables import build_dynamic_table_sensor, get_dynamic_tables
+from .instrumentation import (
+    EXECUTION_SECONDS_METADATA_KEY,
+    RUN_SUMMARY_DIR_ENV,
+    build_run_summary,
+    build_run_summary_spec,
+    format_run_summary,
+    get_check_observations,
+    get_node_metadata,
+    get_node_observations,
+    get_run_summary_observation,
+    write_run_summary,
+)
+from .layout import build_layout_checks
+from .manifest import (
+    get_dag_width,
+    get_descendants,
+    get_macro_dependents,
+    get_modified_nodes,
+    get_selection,
+    get_shards,
+    load_manifest,
+)
+from .privacy import build_privacy_retention_asset
+from .sampled_checks import (
+    add_sample_scope,
+    build_full_checks_schedule,
+    get_sample_scopes,
+)
 from .translator import CustomDagsterDbtTranslator
 
 is_defer = os.getenv("TARGET", "").lower() == "dev"
+is_modified_only = os.getenv("DBT_MODIFIED_ONLY", "").lower() == "true"
+is_skip_unchanged = os.getenv("DBT_SKIP_UNCHANGED", "").lower() == "true"
+is_skip_unchanged_seeds = os.getenv("DBT_SKIP_UNCHANGED_SEEDS", "").lower() == "true"
+
+partition_chunk_size = int(os.getenv("DBT_PARTITION_CHUNK_SIZE", "0"))
+is_adaptive = os.getenv("DBT_ADAPTIVE", "").lower() == "true"
+is_dynamic_table_stub = os.getenv("DBT_DYNAMIC_TABLE_STUB", "").lower() == "true"
+is_skip_dynamic_tables = os.getenv("DBT_SKIP_DYNAMIC_TABLES", "").lower() == "true"
+is_snapshot_precheck = os.getenv("DBT_SNAPSHOT_PRECHECK", "").lower() == "true"
+is_loaded_at_watermarks = os.getenv("DBT_LOADED_AT_WATERMARKS", "").lower() == "true"
+is_defer_checks = os.getenv("DBT_DEFER_CHECKS", "").lower() == "true"
+
+INPUT_FINGERPRINT_METADATA_KEY = "dbt_input_fingerprint"
+SEED_HASH_METADATA_KEY = "dbt_seed_hash"
+SNAPSHOT_CHANGE_SIGNAL_METADATA_KEY = "dbt_snapshot_change_signal"
+# observations of an asset searched for its latest watermark or data version
+OBSERVATION_LOOKBACK = 25
+
+# serializes the invocations that set the run vars environment variable
+run_vars_lock = threading.Lock()
 
 
 class DbtConfig(dg.Config):
@@ -38,11 +116,70 @@ class DbtConfig(dg.Config):
             production artifacts during local runs.
         favor_state: Augments ``--defer`` by preferring stored state when resolving
             nodes, matching dbt Cloud's behavior.
+        modified_only: Builds only the selected nodes that changed compared to the
+            stored state manifest, and their downstream nodes, deferring everything
+            else to production. When unset, it applies to runs launched by hand or
+            by a deploy while ``DBT_MODIFIED_ONLY`` is ``true``, while runs started
+            by schedules, sensors, automation conditions, and backfills build their
+            whole selection, as they are triggered by new data rather than new code.
+        skip_unchanged: Skips non partitioned models whose code and upstream
+            materializations are unchanged since they were last materialized.
+            Defaults to ``True`` when ``DBT_SKIP_UNCHANGED`` is ``true``.
+        skip_unchanged_seeds: Skips seeds whose CSV file and config are unchanged
+            since they were last materialized. Defaults to ``True`` when
+            ``DBT_SKIP_UNCHANGED_SEEDS`` is ``true``.
+        skip_dynamic_tables: Skips models materialized as dynamic tables whose code
+            is unchanged since they were last materialized, as Snowflake refreshes
+            them on its own. Defaults to ``True`` when ``DBT_SKIP_DYNAMIC_TABLES`` is
+            ``true``.
+        snapshot_precheck: Skips snapshots with ``meta.dagster.snapshot_precheck``
+            whose raw tables did not change since their last run, and restricts the
+            others to the rows changed since then. Defaults to ``True`` when
+            ``DBT_SNAPSHOT_PRECHECK`` is ``true``.
+        defer_checks: Excludes the deferred tests from runs that materialize their
+            models, the deferred checks sensor runs them on their own. Only tests
+            marked deferred when the definitions loaded with ``DBT_DEFER_CHECKS``
+            set to ``true`` are excluded, which also sets the default.
+        full_tests: Runs sampled tests against the whole tables, as the full checks
+            schedule does.
+        loaded_at_watermarks: Passes the ``_loaded_at`` watermark recorded after the
+            last run of each incremental model calling ``loaded_at_watermark``, so
+            the model does not scan its target for it. Defaults to ``True`` when
+            ``DBT_LOADED_AT_WATERMARKS`` is ``true``.
+        partition_chunk_size: Number of partitions each dbt invocation covers when a
+            run spans a partition range, so large backfills are split into smaller
+            windows that can be resumed. ``0`` runs the whole range at once.
+            Defaults to ``DBT_PARTITION_CHUNK_SIZE``.
+        partition_chunk_concurrency: Number of chunks that run at the same time, at
+            least ``1``. Concurrent chunks write to the same tables, so their writes
+            wait on each other.
+        adaptive: Sizes each invocation to its selection, ``--threads`` is set to the
+            width of the selected DAG and the warehouse is chosen from the historical
+            runtime of the selected models. Defaults to ``True`` when
+            ``DBT_ADAPTIVE`` is ``true``.
+        max_threads: Upper bound on the threads picked by the adaptive mode.
+        warehouses: Warehouses the adaptive mode chooses from, smallest first.
+        warehouse_runtime_seconds: Expected runtime below which each warehouse but
+            the last is chosen, longer runs use the last warehouse.
     """
 
     full_refresh: bool = False
     defer_to_prod: bool = is_defer
     favor_state: bool = False
+    modified_only: bool | None = None
+    skip_unchanged: bool = is_skip_unchanged
+    skip_unchanged_seeds: bool = is_skip_unchanged_seeds
+    skip_dynamic_tables: bool = is_skip_dynamic_tables
+    snapshot_precheck: bool = is_snapshot_precheck
+    defer_checks: bool = is_defer_checks
+    full_tests: bool = False
+    loaded_at_watermarks: bool = is_loaded_at_watermarks
+    partition_chunk_size: int = partition_chunk_size
+    partition_chunk_concurrency: int = 1
+    adaptive: bool = is_adaptive
+    max_threads: int = 16
+    warehouses: list[str] = ["compute_wh_xsmall", "compute_wh", "compute_wh_large"]
+    warehouse_runtime_seconds: list[float] = [300, 3600]
 
 
 class Factory:
@@ -50,22 +187,37 @@ class Factory:
 
     @cache
     @staticmethod
-    def build_definitions(dbt: Callable[[], DbtProject]) -> dg.Definitions:
+    def build_definitions(
+        dbt: Callable[[], DbtProject],
+        shard_by: str | None = None,
+        max_shards: int | None = None,
+    ) -> dg.Definitions:
         """Create Dagster definitions backed by the supplied dbt project factory.
 
         Args:
             dbt: A zero-argument callable that yields a ready-to-use
                 :class:`DbtProject` instance.
+            shard_by: Optional mode for splitting the non partitioned models into one
+                assets definition per shard, so independent parts of the project build
+                in separate processes. One of ``group``, ``folder``, or
+                ``component``.
+            max_shards: Upper bound on the number of shards when sharding by
+                ``component``.
 
         Returns:
             dagster.Definitions: Definitions composed of dbt assets, freshness checks,
-                and the dbt CLI resource configured with the project directory supplied
-                by the callable.
+                layout checks of clustered models, the warehouse cost attribution and
+                privacy retention assets, the run summaries asset, the dynamic table
+                and deferred checks sensors, the full checks schedule of sampled
+                tests, the dbt CLI resource configured with the project directory
+                supplied by the callable, and the Snowflake resource used to read the
+                warehouse metadata.
         """
 
         dbt_project = dbt()
         assert dbt_project
-        
+        manifest = load_manifest(dbt_project.manifest_path)
+
         assets = [
             Factory._get_assets(
                 "dbt_partitioned_models",
@@ -73,24 +225,82 @@ class Factory:
                 select=TIME_PARTITION_SELECTOR,
                 partitioned=True,
             ),
-            Factory._get_assets(
-                "dbt_non_partitioned_models",
-                dbt_project=dbt_project,
-                exclude=TIME_PARTITION_SELECTOR,
-                partitioned=False,
-            ),
         ]
 
+        if shard_by:
+            shards = get_shards(
+                manifest, shard_by, max_shards, exclude_tags=(TIME_PARTITION_TAG,)
+            )
+            for shard_name, unique_ids in shards.items():
+                assets.append(
+                    Factory._get_assets(
+                        f"dbt_non_partitioned_models__{shard_name}",
+                        dbt_project=dbt_project,
+                        select=get_selection(manifest, unique_ids),
+                        exclude=TIME_PARTITION_SELECTOR,
+                        partitioned=False,
+                        pool=f"dbt_{shard_name}",
+                    )
+                )
+        else:
+            assets.append(
+                Factory._get_assets(
+                    "dbt_non_partitioned_models",
+                    dbt_project=dbt_project,
+                    exclude=TIME_PARTITION_SELECTOR,
+                    partitioned=False,
+                )
+            )
+
         freshness_checks = build_freshness_checks_from_dbt_assets(dbt_assets=assets)
         freshness_sensor = dg.build_sensor_for_freshness_checks(
             freshness_checks=freshness_checks, name="dbt_freshness_checks_sensor"
         )
 
         return dg.Definitions(
-            resources={"dbt": DbtCliResource(project_dir=dbt_project)},
-            assets=assets,
-            asset_checks=freshness_checks,
-            sensors=[freshness_sensor],
+            resources={
+                "dbt": DbtCliResource(project_dir=dbt_project),
+                "snowflake": SnowflakeResource(
+                    account=get_secret("DESTINATION__SNOWFLAKE__HOST"),
+                    user=get_secret("DESTINATION__SNOWFLAKE__USER"),
+                    password=get_secret("DESTINATION__SNOWFLAKE__PASSWORD"),
+                    role=get_secret("DESTINATION__SNOWFLAKE__ROLE"),
+                    warehouse=get_secret("DESTINATION__SNOWFLAKE__WAREHOUSE"),
+                ),
+            },
+            assets=[
+                *assets,
+                build_cost_attribution_asset(assets),
+                build_privacy_retention_asset(manifest, assets),
+                build_run_summary_spec(),
+            ],
+            asset_checks=[*freshness_checks, *build_layout_checks(assets)],
+            sensors=[
+                freshness_sensor,
+                *build_deferred_checks_sensor(assets),
+                build_dynamic_table_sensor(
+                    manifest, assets, use_stub=is_dynamic_table_stub
+                ),
+            ],
+            schedules=build_full_checks_schedule(assets, manifest),
+        )
+
+    @cache
+    @staticmethod
+    def _get_translator() -> CustomDagsterDbtTranslator:
+        """Return the translator shared by every dbt assets definition, so each node
+        of the manifest is translated once however many definitions select it.
+
+        Returns:
+            CustomDagsterDbtTranslator: The shared translator instance.
+        """
+        return CustomDagsterDbtTranslator(
+            settings=DagsterDbtTranslatorSettings(
+                enable_duplicate_source_asset_keys=False,
+                enable_asset_checks=True,
+                enable_source_tests_as_checks=True,
+            ),
+            defer_non_blocking_checks=is_defer_checks,
         )
 
     @cache
@@ -101,6 +311,7 @@ class Factory:
         partitioned: bool = False,
         select: str = DBT_DEFAULT_SELECT,
         exclude: str | None = None,
+        pool: str = "dbt",
     ) -> dg.AssetsDefinition:
         """Build a ``dbt_assets`` definition for a subset of the dbt project.
 
@@ -110,6 +321,8 @@ class Factory:
             partitioned: Indicates whether the assets rely on partition time windows.
             select: dbt selection string narrowing which models to materialize.
             exclude: Optional selection string for excluding models from the run.
+            pool: Concurrency pool that limits how many runs of the definition
+                execute at once.
 
         Returns:
             dagster.AssetsDefinition: A Dagster assets definition that streams dbt CLI
@@ -121,19 +334,16 @@ class Factory:
             manifest=dbt_project.manifest_path,
             select=select,
             exclude=exclude,
-            dagster_dbt_translator=CustomDagsterDbtTranslator(
-                settings=DagsterDbtTranslatorSettings(
-                    enable_duplicate_source_asset_keys=False,
-                    enable_asset_checks=True,
-                    enable_source_tests_as_checks=True,
-                )
-            ),
+            dagster_dbt_translator=Factory._get_translator(),
             backfill_policy=dg.BackfillPolicy.single_run(),
             project=dbt_project,
-            pool="dbt",
+            pool=pool,
         )
         def assets( # pragma: no coverage
-            context: dg.AssetExecutionContext, dbt: DbtCliResource, config: DbtConfig
+            context: dg.AssetExecutionContext,
+            dbt: DbtCliResource,
+            snowflake: SnowflakeResource,
+            config: DbtConfig,
         ) -> Generator[dg.Output[Any] | dg.AssetMaterialization | dg.AssetObservation
                        | dg. AssetCheckResult | dg.AssetCheckEvaluation, Any, Any]:
             """Materialize the selected dbt models via the dbt CLI resource.
@@ -143,6 +353,8 @@ class Factory:
                     structured logging APIs.
                 dbt: The Dagster-provided dbt CLI resource bound to the selected
                     project directory.
+                snowflake: Snowflake resource used to record the ``_loaded_at``
+                    watermarks of the built models.
                 config: Runtime configuration emitted from :class:`DbtConfig` that
                     toggles dbt CLI flags.
 
@@ -152,27 +364,1181 @@ class Factory:
                     in the UI.
             """
             args = ["build"]
+            # runs that only execute checks of partitioned models have no partitions
+            partitioned_run = partitioned and bool(context.selected_asset_keys)
 
             if config.full_refresh:
                 args.append("--full-refresh")
 
-            if config.defer_to_prod:
+            modified_only = Factory._is_modified_only(context, config)
+            if config.defer_to_prod or modified_only:
                 args.extend(dbt.get_defer_args())
                 if config.favor_state:
                     args.append("--favor-state")
 
-            if partitioned:
-                # Partitioned assets inject the selected time window into dbt vars so
-                # the models can filter appropriately.
-                time_window = context.partition_time_window
-                format = "%Y-%m-%d %H:%M:%S"
-                dbt_vars = {
-                    "min_date": time_window.start.strftime(format),
-                    "max_date": time_window.end.strftime(format),
-                }
+            # skipped nodes are excluded in addition to the dagster selection, and
+            # recorded as observations so the UI shows why they did not run
+            skipped: dict[str, tuple[dg.AssetKey, str]] = {}
+            if modified_only:
+                unmodified = Factory._get_unmodified_selection(context, dbt_project)
+                for unique_id, asset_key in unmodified.items():
+                    skipped[unique_id] = (asset_key, "unmodified")
+
+            fingerprints: dict[dg.AssetKey, str] = {}
+            if config.skip_unchanged and not partitioned and not config.full_refresh:
+                fingerprints = Factory._get_input_fingerprints(context, dbt_project)
+                unchanged = Factory._get_unchanged_selection(
+                    context, dbt_project, fingerprints
+                )
+                for unique_id, asset_key in unchanged.items():
+                    skipped.setdefault(unique_id, (asset_key, "inputs_unchanged"))
+
+            seed_hashes: dict[dg.AssetKey, str] = {}
+            if config.skip_unchanged_seeds:
+                seed_hashes = Factory._get_seed_hashes(context, dbt_project)
+                if not config.full_refresh:
+                    unchanged = Factory._get_unchanged_seeds(context, seed_hashes)
+                    for unique_id, asset_key in unchanged.items():
+                        skipped.setdefault(unique_id, (asset_key, "seed_unchanged"))
+
+            if config.skip_dynamic_tables and not config.full_refresh:
+                dynamic_tables = Factory._get_unchanged_dynamic_tables(
+                    context, dbt_project
+                )
+                for unique_id, asset_key in dynamic_tables.items():
+                    skipped.setdefault(unique_id, (asset_key, "dynamic_table"))
+
+            change_signals: dict[dg.AssetKey, dict[str, Any]] = {}
+            snapshot_watermarks: dict[str, str] = {}
+            if config.snapshot_precheck and not config.full_refresh:
+                unchanged, snapshot_watermarks, change_signals = (
+                    Factory._get_snapshot_prechecks(context, dbt_project)
+                )
+                for unique_id, asset_key in unchanged.items():
+                    skipped.setdefault(unique_id, (asset_key, "source_unchanged"))
 
-                args.extend(("--vars", json.dumps(dbt_vars)))
+            # skipped nodes and deferred tests share one --exclude, dbt unions its
+            # selectors with any --exclude added by the dagster selection
+            excluded = [*skipped]
+            if config.defer_checks:
+                excluded.extend(get_excluded_tests(context))
+            if excluded:
+                manifest = load_manifest(dbt_project.manifest_path)
+                args.extend(("--exclude", get_selection(manifest, excluded)))
+            for asset_key, reason in skipped.values():
+                yield dg.AssetObservation(
+                    asset_key=asset_key, metadata={"dbt_skipped_reason": reason}
+                )
+
+            dbt_vars: dict[str, Any] = {}
+            if config.adaptive:
+                adaptive_args, dbt_vars = Factory._get_adaptive_args(
+                    context, dbt_project, config, skipped, partitioned_run
+                )
+                args.extend(adaptive_args)
+            if snapshot_watermarks:
+                dbt_vars["snapshot_watermarks"] = snapshot_watermarks
+
+            # partitioned models are bounded by the partition window instead
+            watermark_targets: dict[dg.AssetKey, tuple[str, str | None]] = {}
+            if config.loaded_at_watermarks and not partitioned:
+                loaded_at_watermarks, watermark_targets = (
+                    Factory._get_loaded_at_watermarks(context, dbt_project)
+                )
+                if config.full_refresh:
+                    watermark_targets = {
+                        asset_key: (relation, None)
+                        for asset_key, (relation, _) in watermark_targets.items()
+                    }
+                elif loaded_at_watermarks:
+                    dbt_vars["loaded_at_watermarks"] = loaded_at_watermarks
 
-            yield from dbt.cli(args, context=context).stream()
+            # sampled tests read the partitions of the whole run, not of a chunk
+            if config.full_tests:
+                dbt_vars["full_tests"] = True
+            elif partitioned_run:
+                window = Factory._get_partition_vars(context, context.partition_keys)
+                dbt_vars["sample_min_date"] = window["min_date"]
+                dbt_vars["sample_max_date"] = window["max_date"]
+            sample_scopes = get_sample_scopes(
+                context,
+                load_manifest(dbt_project.manifest_path),
+                dbt_vars,
+                config.full_refresh,
+            )
+
+            if partitioned_run:
+                for event in Factory._build_partition_chunks(
+                    context, dbt, args, config, dbt_vars
+                ):
+                    yield add_sample_scope(event, sample_scopes)
+                return
+
+            materialized = set()
+            invocation = Factory._cli(context, dbt, args, dbt_vars)
+            for event in Factory._stream_with_run_results(context, invocation):
+                if isinstance(event, dg.Output):
+                    materialized.add(context.asset_key_for_output(event.output_name))
+                elif isinstance(event, dg.AssetMaterialization):
+                    materialized.add(event.asset_key)
+                event = Factory._add_input_fingerprint(context, event, fingerprints)
+                event = Factory._add_seed_hash(context, event, seed_hashes)
+                event = add_sample_scope(event, sample_scopes)
+                yield Factory._add_snapshot_change_signal(
+                    context, event, change_signals
+                )
+            yield from Factory._get_loaded_at_observations(
+                context,
+                snowflake,
+                {key: watermark_targets[key]
+                 for key in materialized if key in watermark_targets},
+            )
 
         return assets
+
+    @staticmethod
+    def _is_modified_only(context: dg.AssetExecutionContext, config: DbtConfig) -> bool:
+        """Return whether a run only builds the nodes with modified code.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            config: Runtime configuration of the run.
+
+        Returns:
+            bool: ``config.modified_only`` when it is set, otherwise whether
+                ``DBT_MODIFIED_ONLY`` is ``true`` and the run was not started by a
+                schedule, sensor, automation condition, or backfill.
+        """
+        if config.modified_only is not None:
+            return config.modified_only
+        automated_tags = (AUTOMATION_CONDITION_TAG, BACKFILL_ID_TAG,
+                          SCHEDULE_NAME_TAG, SENSOR_NAME_TAG)
+        tags = context.run.tags
+        return is_modified_only and not any(tag in tags for tag in automated_tags)
+
+    @staticmethod
+    def _get_unmodified_selection(
+        context: dg.AssetExecutionContext, dbt_project: DbtProject
+    ) -> dict[str, dg.AssetKey]:
+        """Return the selected dbt nodes that can be skipped by a modified only run.
+
+        A node can be skipped when neither it nor any of its upstream nodes changed
+        compared to the manifest stored in the state path of the project. When no
+        stored manifest exists every node is treated as modified.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project with a ``state_path``.
+
+        Returns:
+            dict[str, dagster.AssetKey]: Asset keys of the skippable nodes keyed by
+                their dbt unique id.
+        """
+        state_manifest_path = Path(dbt_project.state_path or "", "manifest.json")
+        if not dbt_project.state_path or not state_manifest_path.exists():
+            context.log.warning("No state manifest found at "
+                f"'{state_manifest_path}', building the full selection.")
+            return {}
+
+        manifest = load_manifest(dbt_project.manifest_path)
+        modified = get_descendants(
+            manifest, get_modified_nodes(manifest, load_manifest(state_manifest_path))
+        )
+
+        unmodified = {}
+        for asset_key in context.selected_asset_keys:
+            spec = context.assets_def.specs_by_key[asset_key]
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            if unique_id and unique_id not in modified:
+                unmodified[unique_id] = asset_key
+        return unmodified
+
+    @staticmethod
+    def _get_unchanged_dynamic_tables(
+        context: dg.AssetExecutionContext, dbt_project: DbtProject
+    ) -> dict[str, dg.AssetKey]:
+        """Return the selected dynamic tables whose code did not change since they
+        were last materialized.
+
+        Snowflake keeps dynamic tables up to date, so running them again only
+        recreates the table. A dynamic table is rebuilt when it has never been
+        materialized or its code version differs from its latest materialization.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project.
+
+        Returns:
+            dict[str, dagster.AssetKey]: Asset keys of the unchanged dynamic tables
+                keyed by their dbt unique id.
+        """
+        dynamic_tables = get_dynamic_tables(load_manifest(dbt_project.manifest_path))
+        selected = {}
+        for asset_key in context.selected_asset_keys:
+            spec = context.assets_def.specs_by_key[asset_key]
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            if unique_id in dynamic_tables:
+                selected[asset_key] = (unique_id, spec.code_version)
+        if not selected:
+            return {}
+
+        unchanged = {}
+        for record in context.instance.get_asset_records(list(selected)):
+            asset_key = record.asset_entry.asset_key
+            unique_id, code_version = selected[asset_key]
+            materialization_record = record.asset_entry.last_materialization_record
+            materialization = (
+                materialization_record and materialization_record.asset_materialization
+            )
+            if materialization and code_version and (
+                materialization.tags.get(CODE_VERSION_TAG) == code_version
+            ):
+                unchanged[unique_id] = asset_key
+        return unchanged
+
+    @staticmethod
+    def _get_snapshot_prechecks(
+        context: dg.AssetExecutionContext, dbt_project: DbtProject
+    ) -> tuple[dict[str, dg.AssetKey], dict[str, str], dict[dg.AssetKey, dict]]:
+        """Compare the raw tables of the selected snapshots with their last run.
+
+        Applies to snapshots with ``meta.dagster.snapshot_precheck``. The change signal
+        of a snapshot is the row count and latest ``update_key`` that Sling recorded
+        on the latest materialization of each upstream asset. A snapshot whose signal
+        matches the one recorded on its last materialization is unchanged. Otherwise
+        it only compares the rows from the latest ``update_key`` it has already seen.
+        Snapshots without a signal, or that never recorded one, compare every row.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project.
+
+        Returns:
+            tuple[dict[str, dagster.AssetKey], dict[str, str], dict[dagster.AssetKey,
+                dict]]: Asset keys of the unchanged snapshots keyed by unique id, the
+                watermark of each changed snapshot keyed by snapshot name for the
+                ``snapshot_watermarks`` var, and the current signal of each
+                snapshot to record on its materialization.
+        """
+        manifest = load_manifest(dbt_project.manifest_path)
+        assets_def = context.assets_def
+        snapshots = {}
+        for asset_key in context.selected_asset_keys:
+            spec = assets_def.specs_by_key[asset_key]
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            node = manifest["nodes"].get(unique_id, {})
+            if node.get("resource_type") == "snapshot" and get_nested(
+                node, ["config", "meta", "dagster", "snapshot_precheck"]
+            ):
+                snapshots[asset_key] = (unique_id, node["name"])
+        if not snapshots:
+            return {}, {}, {}
+
+        upstream_keys = {
+            upstream_key
+            for asset_key in snapshots
+            for upstream_key in assets_def.asset_deps.get(asset_key, set())
+        }
+        metadata = {}
+        for record in context.instance.get_asset_records(
+            [*snapshots, *upstream_keys]
+        ):
+            materialization_record = record.asset_entry.last_materialization_record
+            materialization = (
+                materialization_record and materialization_record.asset_materialization
+            )
+            if materialization:
+                metadata[record.asset_entry.asset_key] = {
+                    key: value.value for key, value in materialization.metadata.items()
+                }
+
+        unchanged, watermarks, signals = {}, {}, {}
+        for asset_key, (unique_id, name) in snapshots.items():
+            signal = {}
+            for upstream_key in sorted(assets_def.asset_deps.get(asset_key, set())):
+                upstream = metadata.get(upstream_key, {})
+                if upstream.get(MAX_UPDATE_KEY_METADATA_KEY) is None:
+                    signal = {}
+                    break
+                signal[upstream_key.to_user_string()] = {
+                    "row_count": upstream.get(ROW_COUNT_METADATA_KEY),
+                    "max_update_key": upstream[MAX_UPDATE_KEY_METADATA_KEY],
+                }
+            if not signal:
+                continue
+
+            signals[asset_key] = signal
+            previous = metadata.get(asset_key, {}).get(
+                SNAPSHOT_CHANGE_SIGNAL_METADATA_KEY
+            )
+            if previous == signal:
+                unchanged[unique_id] = asset_key
+            elif previous and len(previous) == 1:
+                # the source of a snapshot is a single raw table
+                watermarks[name] = next(iter(previous.values()))["max_update_key"]
+        return unchanged, watermarks, signals
+
+    @staticmethod
+    def _add_snapshot_change_signal(
+        context: dg.AssetExecutionContext,
+        event: Any,
+        change_signals: dict[dg.AssetKey, dict],
+    ) -> Any:
+        """Record the change signal a snapshot was built from on its materialization,
+        so the next run can tell whether its raw tables changed.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            event: An event streamed from the dbt CLI.
+            change_signals: Current change signal of each prechecked snapshot.
+
+        Returns:
+            The event, with the signal added to its metadata when it materializes a
+                prechecked snapshot.
+        """
+        if isinstance(event, dg.Output):
+            asset_key = context.asset_key_for_output(event.output_name)
+        elif isinstance(event, dg.AssetMaterialization):
+            asset_key = event.asset_key
+        else:
+            return event
+
+        if signal := change_signals.get(asset_key):
+            return event.with_metadata(
+                {**event.metadata, SNAPSHOT_CHANGE_SIGNAL_METADATA_KEY: signal}
+            )
+        return event
+
+    @staticmethod
+    def _get_loaded_at_watermarks(
+        context: dg.AssetExecutionContext, dbt_project: DbtProject
+    ) -> tuple[dict[str, str], dict[dg.AssetKey, tuple[str, str | None]]]:
+        """Read the ``_loaded_at`` watermarks of the selected incremental models.
+
+        Applies to incremental models calling the ``loaded_at_watermark`` macro. The
+        watermark of a model is the latest ``_loaded_at`` of its target, recorded on
+        an observation after each run that built it. Only the latest
+        ``OBSERVATION_LOOKBACK`` observations of a model are searched, a model without
+        a watermark among them scans its target.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project.
+
+        Returns:
+            tuple[dict[str, str], dict[dagster.AssetKey, tuple[str, str | None]]]: The
+                recorded watermark of each model keyed by model name for the
+                ``loaded_at_watermarks`` var, and the relation and recorded watermark
+                of each model to record the new watermark of after the run.
+        """
+        manifest = load_manifest(dbt_project.manifest_path)
+        dependents = get_macro_dependents(manifest, LOADED_AT_WATERMARK_MACRO)
+        selected = {}
+        for asset_key in context.selected_asset_keys:
+            spec = context.assets_def.specs_by_key[asset_key]
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            node = manifest["nodes"].get(unique_id, {})
+            if unique_id in dependents and (
+                get_nested(node, ["config", "materialized"]) == "incremental"
+            ):
+                selected[asset_key] = node
+        if not selected:
+            return {}, {}
+
+        previous = {}
+        for asset_key in selected:
+            observations = context.instance.fetch_observations(
+                asset_key, limit=OBSERVATION_LOOKBACK
+            )
+            for record in observations.records:
+                watermark = record.asset_observation.metadata.get(
+                    LOADED_AT_WATERMARK_METADATA_KEY
+                )
+                if watermark:
+                    previous[asset_key] = watermark.value
+                    break
+
+        watermarks, targets = {}, {}
+        for asset_key, node in selected.items():
+            if asset_key in previous:
+                watermarks[node["name"]] = previous[asset_key]
+            targets[asset_key] = (node["relation_name"], previous.get(asset_key))
+        return watermarks, targets
+
+    @staticmethod
+    def _get_loaded_at_observations(
+        context: dg.AssetExecutionContext,
+        snowflake: SnowflakeResource,
+        targets: dict[dg.AssetKey, tuple[str, str | None]],
+    ) -> list[dg.AssetObservation]:
+        """Record the latest ``_loaded_at`` of the built models, so the next run can
+        pass it to the ``loaded_at_watermark`` macro.
+
+        The watermarks of every model are read in a single query once the invocation
+        has finished. Every row loaded by the run is at or after the recorded
+        watermark, so each model only reads the micro-partitions loaded since its
+        previous run. A failed query is logged, and the next run reuses the previous
+        watermark, which is still a lower bound of the rows it has to process.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            snowflake: Snowflake resource used to read the watermarks.
+            targets: Relation and recorded watermark of each built watermarked model.
+
+        Returns:
+            list[dagster.AssetObservation]: An observation holding the new watermark
+                of each model with rows.
+        """
+        if not targets:
+            return []
+
+        asset_keys = list(targets)
+        queries, params = [], []
+        for index, asset_key in enumerate(asset_keys):
+            relation, previous = targets[asset_key]
+            query = f"select {index}, max(_loaded_at) from {relation}"
+            if previous:
+                query += " where _loaded_at >= %s::timestamp"
+                params.append(previous)
+            queries.append(query)
+
+        try:
+            with snowflake.get_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute("\nunion all\n".join(queries), params)
+                rows = cursor.fetchall()
+        except Exception as error:
+            context.log.warning(f"Could not read the _loaded_at watermarks: {error}")
+            return []
+
+        observations = []
+        for index, watermark in rows:
+            if watermark is None:
+                continue
+            if isinstance(watermark, datetime):
+                # microsecond precision rounds down, so no row is skipped next run
+                watermark = watermark.isoformat(sep=" ")
+            observations.append(dg.AssetObservation(
+                asset_key=asset_keys[index],
+                metadata={LOADED_AT_WATERMARK_METADATA_KEY: str(watermark)},
+            ))
+        return observations
+
+    @staticmethod
+    def _get_input_fingerprints(
+        context: dg.AssetExecutionContext, dbt_project: DbtProject
+    ) -> dict[dg.AssetKey, str]:
+        """Fingerprint the inputs of each selected dbt node.
+
+        The fingerprint combines the checksum of the node in the manifest with the
+        state of every upstream asset, so it changes whenever the code of the node
+        changes or any of its inputs receive new data. A selected upstream node
+        contributes its own fingerprint, as it may be rebuilt by the same run, and
+        any other upstream the fingerprint recorded on its latest materialization.
+        Upstream assets without a recorded fingerprint contribute the storage id of
+        their latest materialization and the latest data version observed among
+        their last ``OBSERVATION_LOOKBACK`` observations. Observations without a data
+        version, such as the ones this factory records on every run, are ignored.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project.
+
+        Returns:
+            dict[dagster.AssetKey, str]: Fingerprint of each selected asset.
+        """
+        manifest = load_manifest(dbt_project.manifest_path)
+        assets_def = context.assets_def
+        selected = context.selected_asset_keys
+        upstream_keys = {
+            upstream_key
+            for asset_key in selected
+            for upstream_key in assets_def.asset_deps.get(asset_key, set())
+        }
+        records = {
+            record.asset_entry.asset_key: record.asset_entry
+            for record in context.instance.get_asset_records(
+                list(upstream_keys - selected)
+            )
+        }
+
+        def get_upstream_input(upstream_key: dg.AssetKey) -> list[Any]:
+            if upstream_key in selected:
+                return [upstream_key.to_user_string(), get_fingerprint(upstream_key)]
+
+            entry = records.get(upstream_key)
+            record = entry and entry.last_materialization_record
+            materialization = record and record.asset_materialization
+            fingerprint = materialization and materialization.metadata.get(
+                INPUT_FINGERPRINT_METADATA_KEY
+            )
+            if fingerprint:
+                return [upstream_key.to_user_string(), fingerprint.value]
+
+            observations = context.instance.fetch_observations(
+                upstream_key, limit=OBSERVATION_LOOKBACK
+            )
+            data_version = next((
+                observation.asset_observation.tags[DATA_VERSION_TAG]
+                for observation in observations.records
+                if DATA_VERSION_TAG in observation.asset_observation.tags
+            ), None)
+            return [
+                upstream_key.to_user_string(),
+                record.storage_id if record else None,
+                data_version,
+            ]
+
+        fingerprints: dict[dg.AssetKey, str] = {}
+
+        def get_fingerprint(asset_key: dg.AssetKey) -> str:
+            if asset_key not in fingerprints:
+                spec = assets_def.specs_by_key[asset_key]
+                unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+                node = manifest["nodes"].get(unique_id, {})
+                inputs = [node.get("checksum", {}).get("checksum")]
+                for upstream_key in sorted(assets_def.asset_deps.get(asset_key, set())):
+                    inputs.append(get_upstream_input(upstream_key))
+                fingerprints[asset_key] = hashlib.sha256(
+                    json.dumps(inputs).encode()
+                ).hexdigest()
+            return fingerprints[asset_key]
+
+        for asset_key in selected:
+            get_fingerprint(asset_key)
+        return fingerprints
+
+    @staticmethod
+    def _get_unchanged_selection(
+        context: dg.AssetExecutionContext,
+        dbt_project: DbtProject,
+        fingerprints: dict[dg.AssetKey, str],
+    ) -> dict[str, dg.AssetKey]:
+        """Return the selected dbt nodes whose inputs did not change since they were
+        last materialized.
+
+        A node is unchanged when its fingerprint matches the fingerprint recorded on
+        its latest materialization, and none of its upstream nodes will be rebuilt
+        by this run.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project.
+            fingerprints: Current fingerprint of each selected asset.
+
+        Returns:
+            dict[str, dagster.AssetKey]: Asset keys of the unchanged nodes keyed by
+                their dbt unique id.
+        """
+        manifest = load_manifest(dbt_project.manifest_path)
+        records = {
+            record.asset_entry.asset_key: record.asset_entry
+            for record in context.instance.get_asset_records(list(fingerprints))
+        }
+
+        unique_ids = {}
+        changed = set()
+        for asset_key, fingerprint in fingerprints.items():
+            spec = context.assets_def.specs_by_key[asset_key]
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            if not unique_id:
+                continue
+            unique_ids[unique_id] = asset_key
+
+            entry = records.get(asset_key)
+            record = entry and entry.last_materialization_record
+            materialization = record and record.asset_materialization
+            previous = materialization and materialization.metadata.get(
+                INPUT_FINGERPRINT_METADATA_KEY
+            )
+            if not previous or previous.value != fingerprint:
+                changed.add(unique_id)
+
+        rebuilt = get_descendants(manifest, changed)
+        return {
+            unique_id: asset_key
+            for unique_id, asset_key in unique_ids.items()
+            if unique_id not in rebuilt
+        }
+
+    @staticmethod
+    def _add_input_fingerprint(
+        context: dg.AssetExecutionContext,
+        event: Any,
+        fingerprints: dict[dg.AssetKey, str],
+    ) -> Any:
+        """Record the input fingerprint on the materialization of a dbt node, so the
+        next run can tell whether the node needs to be rebuilt.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            event: An event streamed from the dbt CLI.
+            fingerprints: Current fingerprint of each selected asset.
+
+        Returns:
+            The event, with the fingerprint added to its metadata when it
+                materializes a fingerprinted asset.
+        """
+        if isinstance(event, dg.Output):
+            asset_key = context.asset_key_for_output(event.output_name)
+        elif isinstance(event, dg.AssetMaterialization):
+            asset_key = event.asset_key
+        else:
+            return event
+
+        if fingerprint := fingerprints.get(asset_key):
+            return event.with_metadata(
+                {**event.metadata, INPUT_FINGERPRINT_METADATA_KEY: fingerprint}
+            )
+        return event
+
+    @staticmethod
+    def _get_seed_hashes(
+        context: dg.AssetExecutionContext, dbt_project: DbtProject
+    ) -> dict[dg.AssetKey, str]:
+        """Hash the CSV file and config of each selected seed.
+
+        The manifest checksum of a seed is only its path once the file is larger than
+        dbt's hashing limit, so the file is hashed here instead.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project.
+
+        Returns:
+            dict[dagster.AssetKey, str]: Hash of each selected seed.
+        """
+        manifest = load_manifest(dbt_project.manifest_path)
+        seed_hashes = {}
+        for asset_key in context.selected_asset_keys:
+            spec = context.assets_def.specs_by_key[asset_key]
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            node = manifest["nodes"].get(unique_id, {})
+            if node.get("resource_type") != "seed":
+                continue
+
+            path = Path(dbt_project.project_dir, node["original_file_path"])
+            if not path.exists():
+                continue
+            digest = hashlib.sha256(
+                json.dumps(node.get("config", {}), sort_keys=True, default=str).encode()
+            )
+            with open(path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+            seed_hashes[asset_key] = digest.hexdigest()
+        return seed_hashes
+
+    @staticmethod
+    def _get_unchanged_seeds(
+        context: dg.AssetExecutionContext, seed_hashes: dict[dg.AssetKey, str]
+    ) -> dict[str, dg.AssetKey]:
+        """Return the selected seeds whose hash matches the hash recorded on their
+        latest materialization.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            seed_hashes: Current hash of each selected seed.
+
+        Returns:
+            dict[str, dagster.AssetKey]: Asset keys of the unchanged seeds keyed by
+                their dbt unique id.
+        """
+        records = {
+            record.asset_entry.asset_key: record.asset_entry
+            for record in context.instance.get_asset_records(list(seed_hashes))
+        }
+
+        unchanged = {}
+        for asset_key, seed_hash in seed_hashes.items():
+            entry = records.get(asset_key)
+            record = entry and entry.last_materialization_record
+            materialization = record and record.asset_materialization
+            previous = materialization and materialization.metadata.get(
+                SEED_HASH_METADATA_KEY
+            )
+            if previous and previous.value == seed_hash:
+                spec = context.assets_def.specs_by_key[asset_key]
+                unique_id = spec.metadata[DAGSTER_DBT_UNIQUE_ID_METADATA_KEY]
+                unchanged[unique_id] = asset_key
+        return unchanged
+
+    @staticmethod
+    def _add_seed_hash(
+        context: dg.AssetExecutionContext,
+        event: Any,
+        seed_hashes: dict[dg.AssetKey, str],
+    ) -> Any:
+        """Record the hash of a seed on its materialization, so the next run can
+        skip it when the file did not change.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            event: An event streamed from the dbt CLI.
+            seed_hashes: Current hash of each selected seed.
+
+        Returns:
+            The event, with the hash added to its metadata when it materializes a
+                hashed seed.
+        """
+        if isinstance(event, dg.Output):
+            asset_key = context.asset_key_for_output(event.output_name)
+        elif isinstance(event, dg.AssetMaterialization):
+            asset_key = event.asset_key
+        else:
+            return event
+
+        if seed_hash := seed_hashes.get(asset_key):
+            return event.with_metadata(
+                {**event.metadata, SEED_HASH_METADATA_KEY: seed_hash}
+            )
+        return event
+
+    @staticmethod
+    def _get_adaptive_args(
+        context: dg.AssetExecutionContext,
+        dbt_project: DbtProject,
+        config: DbtConfig,
+        skipped: Mapping[str, Any],
+        partitioned: bool,
+    ) -> tuple[list[str], dict[str, Any]]:
+        """Size the dbt invocation to the nodes it will build.
+
+        The thread count is the width of the selected DAG, capped by
+        ``config.max_threads``. The warehouse is chosen from the runtime the selected
+        models took when they were last materialized, scaled by the number of
+        partitions in the run, and passed as the ``snowflake_warehouse`` var read by
+        the ``use_run_warehouse`` pre hook. Without any recorded runtime the profile
+        default is kept.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt_project: Configured dbt project.
+            config: Runtime configuration of the run.
+            skipped: Unique ids of the selected nodes that will not be built.
+            partitioned: Whether the run covers a partition range.
+
+        Returns:
+            tuple[list[str], dict[str, Any]]: The ``--threads`` arguments and the
+                vars selecting the warehouse.
+        """
+        manifest = load_manifest(dbt_project.manifest_path)
+        selected = {}
+        for asset_key in context.selected_asset_keys:
+            spec = context.assets_def.specs_by_key[asset_key]
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            if unique_id and unique_id not in skipped:
+                selected[asset_key] = unique_id
+
+        threads = max(min(get_dag_width(manifest, selected.values()),
+                          config.max_threads), 1)
+        args = ["--threads", str(threads)]
+
+        dbt_vars = {}
+        runtime = Factory._get_historical_runtime(context, list(selected))
+        if runtime is not None:
+            if partitioned:
+                runtime *= len(context.partition_keys)
+            dbt_vars["snowflake_warehouse"] = Factory._get_warehouse_for_runtime(
+                runtime, config.warehouses, config.warehouse_runtime_seconds
+            )
+
+        context.log.info(f"Running {len(selected)} dbt nodes with {threads} threads "
+            f"on warehouse '{dbt_vars.get('snowflake_warehouse', 'default')}', "
+            f"expected runtime {runtime} seconds.")
+        return args, dbt_vars
+
+    @staticmethod
+    def _get_historical_runtime(
+        context: dg.AssetExecutionContext, asset_keys: list[dg.AssetKey]
+    ) -> float | None:
+        """Sum the execution time of the last run of each asset.
+
+        The runtime is the ``dbt_execution_seconds`` recorded from ``run_results.json``
+        on the latest of the last ``OBSERVATION_LOOKBACK`` observations carrying it,
+        or the execution duration Dagster recorded on the last materialization.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            asset_keys: Assets whose runtime is summed.
+
+        Returns:
+            float | None: Total seconds of the assets with a recorded runtime, or
+                ``None`` when none of them has one.
+        """
+        runtimes = []
+        for record in context.instance.get_asset_records(asset_keys):
+            asset_key = record.asset_entry.asset_key
+            observations = context.instance.fetch_observations(
+                asset_key, limit=OBSERVATION_LOOKBACK
+            )
+            runtime = next((
+                observation.asset_observation.metadata[EXECUTION_SECONDS_METADATA_KEY]
+                for observation in observations.records
+                if EXECUTION_SECONDS_METADATA_KEY
+                in observation.asset_observation.metadata
+            ), None)
+            if runtime is None:
+                materialization = record.asset_entry.last_materialization_record
+                metadata = (
+                    materialization.asset_materialization.metadata
+                    if materialization and materialization.asset_materialization
+                    else {}
+                )
+                runtime = metadata.get("Execution Duration")
+            if runtime is not None:
+                runtimes.append(float(runtime.value))
+        return sum(runtimes) if runtimes else None
+
+    @staticmethod
+    def _get_warehouse_for_runtime(
+        runtime: float, warehouses: list[str], runtime_seconds: list[float]
+    ) -> str:
+        """Return the smallest warehouse whose runtime threshold exceeds a runtime.
+
+        Args:
+            runtime: Expected runtime of the invocation in seconds.
+            warehouses: Warehouses ordered from smallest to largest.
+            runtime_seconds: Runtime below which each warehouse but the last is used.
+
+        Returns:
+            str: The chosen warehouse, the last warehouse when every threshold is
+                exceeded.
+        """
+        for warehouse, threshold in zip(warehouses, runtime_seconds, strict=False):
+            if runtime < threshold:
+                return warehouse
+        return warehouses[-1]
+
+    @staticmethod
+    def _stream_with_run_results(
+        context: dg.AssetExecutionContext,
+        invocation: DbtCliInvocation,
+        events: Iterable[Any] | None = None,
+    ) -> Generator[Any, Any, Any]:
+        """Stream the events of a dbt invocation, followed by its run results.
+
+        Events are yielded as dbt emits them, so each model is recorded as soon as it
+        finishes. ``run_results.json`` is only written at the end of the invocation,
+        so the timing and adapter response of each materialized node are then
+        recorded on an observation of its asset, the execution time of each test on
+        an observation of the asset it checks, and a summary of the slowest and most
+        expensive nodes is logged and recorded on the ``dbt/run_summaries`` asset.
+        The summary is also written to ``DBT_RUN_SUMMARY_DIR`` when it is set. A
+        failed invocation raises its error after the events of the nodes that did
+        complete have been emitted.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            invocation: A dbt CLI invocation started with ``raise_on_error=False``.
+            events: Events of the invocation that were already streamed, such as
+                the events collected by a worker thread. Streams the invocation when
+                not given.
+
+        Yields:
+            Events streamed from the dbt CLI invocation, and the run results
+                observations.
+        """
+        asset_keys, check_keys = {}, {}
+        for event in invocation.stream() if events is None else events:
+            unique_id = getattr(event, "metadata", {}).get("unique_id")
+            unique_id = getattr(unique_id, "value", unique_id)
+            if isinstance(event, dg.Output | dg.AssetMaterialization):
+                asset_keys[unique_id] = (
+                    context.asset_key_for_output(event.output_name)
+                    if isinstance(event, dg.Output) else event.asset_key
+                )
+            elif isinstance(event, dg.AssetCheckResult | dg.AssetCheckEvaluation):
+                check_keys[unique_id] = dg.AssetCheckKey(
+                    event.asset_key, event.check_name)
+            yield event
+
+        try:
+            run_results = invocation.get_artifact("run_results.json")
+        except FileNotFoundError:
+            run_results = {}
+        node_metadata = get_node_metadata(run_results)
+        yield from get_node_observations(node_metadata, asset_keys)
+        yield from get_check_observations(node_metadata, check_keys)
+
+        if node_metadata:
+            summary = build_run_summary(run_results)
+            yield get_run_summary_observation(summary, context.run.run_id)
+            message = "Slowest dbt nodes"
+            if summary_dir := os.getenv(RUN_SUMMARY_DIR_ENV):
+                summary_path = write_run_summary(
+                    summary, context.run.run_id, summary_dir
+                )
+                message += f", full summary at '{summary_path}'"
+            context.log.info(f"{message}:\n{format_run_summary(summary)}")
+
+        if error := invocation.get_error():
+            raise error
+
+    @staticmethod
+    def _cli(
+        context: dg.AssetExecutionContext,
+        dbt: DbtCliResource,
+        args: list[str],
+        dbt_vars: dict[str, Any] | None = None,
+    ) -> DbtCliInvocation:
+        """Start a dbt CLI invocation with the vars of the run.
+
+        dbt discards its partial parse artifact whenever ``--vars`` change, so the
+        vars are passed in the ``DAGSTER_DBT_RUN_VARS`` environment variable instead,
+        which the ``dagster_var`` macro reads.
+
+        ``DbtCliResource.cli`` takes no environment of its own, it copies
+        ``os.environ`` when it builds the dbt process, so the variable is set on the
+        process environment only while the invocation starts, then restored. This is
+        safe because every invocation setting it holds ``run_vars_lock``, the
+        started process keeps its own copy, and nothing else reads the variable.
+        Steps run in separate processes under the default executor, so the lock only
+        has to serialize the chunks of a single run.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt: The dbt CLI resource.
+            args: dbt CLI arguments.
+            dbt_vars: Vars of the invocation.
+
+        Returns:
+            dagster_dbt.DbtCliInvocation: The started invocation.
+        """
+        with run_vars_lock:
+            previous = os.environ.get(RUN_VARS_ENV)
+            os.environ[RUN_VARS_ENV] = json.dumps(dbt_vars or {})
+            try:
+                return dbt.cli(args, context=context, raise_on_error=False)
+            finally:
+                if previous is None:
+                    os.environ.pop(RUN_VARS_ENV, None)
+                else:
+                    os.environ[RUN_VARS_ENV] = previous
+
+    @staticmethod
+    def _get_partition_vars(
+        context: dg.AssetExecutionContext,
+        partition_keys: list[str],
+        dbt_vars: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Build the vars that limit partitioned models to the time window of a run
+        of consecutive partitions.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            partition_keys: Consecutive partition keys covered by the invocation.
+            dbt_vars: Other vars passed to the invocation.
+
+        Returns:
+            dict[str, Any]: The ``min_date`` and ``max_date`` of the window, and any
+                other vars.
+        """
+        partitions_def = context.assets_def.partitions_def
+        start = partitions_def.time_window_for_partition_key(partition_keys[0]).start
+        end = partitions_def.time_window_for_partition_key(partition_keys[-1]).end
+
+        format = "%Y-%m-%d %H:%M:%S"
+        return {
+            **(dbt_vars or {}),
+            "min_date": start.strftime(format),
+            "max_date": end.strftime(format),
+        }
+
+    @staticmethod
+    def _get_partition_chunks(
+        context: dg.AssetExecutionContext, chunk_size: int
+    ) -> list[list[str]]:
+        """Split the partition keys of a run into chunks of consecutive partitions.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            chunk_size: Maximum number of partitions per chunk, ``0`` keeps the whole
+                range in a single chunk.
+
+        Returns:
+            list[list[str]]: The partition keys of each chunk in order.
+        """
+        partition_keys = list(context.partition_keys)
+        if chunk_size <= 0:
+            return [partition_keys]
+        return [
+            partition_keys[index:index + chunk_size]
+            for index in range(0, len(partition_keys), chunk_size)
+        ]
+
+    @staticmethod
+    def _get_completed_partitions(context: dg.AssetExecutionContext) -> set[str]:
+        """Return the partitions that earlier attempts of this run already completed
+        for every selected asset.
+
+        The run and its parents are followed back to the original run, so a retry of
+        a chunked backfill resumes from the last completed chunk.
+
+        Args:
+            context: Execution context of the dbt assets run.
+
+        Returns:
+            set[str]: Partition keys materialized for all selected assets.
+        """
+        instance = context.instance
+        materialized = {asset_key: set() for asset_key in context.selected_asset_keys}
+
+        run_id = context.run.parent_run_id
+        while run_id:
+            for entry in instance.all_logs(
+                run_id, of_type=dg.DagsterEventType.ASSET_MATERIALIZATION
+            ):
+                materialization = entry.asset_materialization
+                if materialization and materialization.asset_key in materialized:
+                    materialized[materialization.asset_key].add(
+                        materialization.partition
+                    )
+            parent_run = instance.get_run_by_id(run_id)
+            run_id = parent_run.parent_run_id if parent_run else None
+
+        return set.intersection(*materialized.values()) if materialized else set()
+
+    @staticmethod
+    def _build_partition_chunks(
+        context: dg.AssetExecutionContext,
+        dbt: DbtCliResource,
+        args: list[str],
+        config: DbtConfig,
+        dbt_vars: dict[str, Any] | None = None,
+    ) -> Generator[Any, Any, Any]:
+        """Materialize the partition range of a run one chunk of partitions at a time.
+
+        Every chunk but the last is run with ``dbt run`` and reports a
+        materialization per partition as soon as it completes, so the progress of a
+        backfill is visible and a retry resumes after the last completed chunk. The
+        last chunk is run with the original command, so tests run once against the
+        fully loaded tables, and also reports a materialization per partition of its
+        own chunk. A full refresh rebuilds the tables in the first chunk of the first
+        attempt only, a retry resumes on the tables that attempt rebuilt.
+
+        Chunks running at the same time each ``delete+insert`` their window into the
+        same incremental tables. Snowflake serializes the statements on each table, so
+        concurrency only helps when transforming the data outweighs writing it. Their
+        worker threads only run dbt and collect its events, which are then emitted
+        from the main thread. When a chunk fails, the materializations of every chunk
+        are still emitted before the first error is raised.
+
+        Args:
+            context: Execution context of the dbt assets run.
+            dbt: The dbt CLI resource.
+            args: dbt CLI arguments without the partition vars.
+            config: Runtime configuration of the run.
+            dbt_vars: Other vars passed to every invocation with the partition vars.
+
+        Yields:
+            Events streamed from the dbt CLI invocations.
+
+        Raises:
+            ValueError: When ``partition_chunk_concurrency`` is lower than ``1``.
+        """
+        if config.partition_chunk_concurrency < 1:
+            raise ValueError("partition_chunk_concurrency must be at least 1, got "
+                f"{config.partition_chunk_concurrency}.")
+
+        *chunks, final_chunk = Factory._get_partition_chunks(
+            context, config.partition_chunk_size
+        )
+        completed = Factory._get_completed_partitions(context) if chunks else set()
+        pending = [chunk for chunk in chunks if not completed.issuperset(chunk)]
+        if len(pending) < len(chunks):
+            context.log.info(f"Resuming after {len(chunks) - len(pending)} completed "
+                "partition chunks.")
+        if config.partition_chunk_concurrency > 1 and len(pending) > 1:
+            context.log.warning(f"Running {config.partition_chunk_concurrency} "
+                "partition chunks at once, their writes to the same tables wait on "
+                "each other.")
+
+        run_args = ["run", *args[1:]]
+        incremental_args = [arg for arg in args if arg != "--full-refresh"]
+        incremental_run_args = [arg for arg in run_args if arg != "--full-refresh"]
+
+        def run_chunk(chunk: list[str], chunk_args: list[str]) -> Generator:
+            partition_vars = Factory._get_partition_vars(context, chunk, dbt_vars)
+            invocation = Factory._cli(context, dbt, chunk_args, partition_vars)
+            yield from Factory._stream_with_run_results(context, invocation)
+
+        def collect_chunk(chunk: list[str], chunk_args: list[str]) -> tuple[
+            DbtCliInvocation | None, list[Any], Exception | None
+        ]:
+            invocation, events = None, []
+            try:
+                partition_vars = Factory._get_partition_vars(context, chunk, dbt_vars)
+                invocation = Factory._cli(context, dbt, chunk_args, partition_vars)
+                events.extend(invocation.stream())
+            except Exception as error:
+                return invocation, events, error
+            return invocation, events, None
+
+        def to_materializations(chunk: list[str], events: Iterable[Any]) -> Generator:
+            # outputs would materialize every partition of the run
+            for event in events:
+                if isinstance(event, dg.Output):
+                    asset_key = context.asset_key_for_output(event.output_name)
+                    for partition_key in chunk:
+                        yield dg.AssetMaterialization(
+                            asset_key=asset_key,
+                            partition=partition_key,
+                            metadata=event.metadata,
+                        )
+                else:
+                    yield event
+
+        # a full refresh rebuilds the tables before any chunk loads into them, a
+        # retry that finds completed chunks resumes on the rebuilt tables instead
+        if config.full_refresh and pending and not completed:
+            chunk, *pending = pending
+            yield from to_materializations(chunk, run_chunk(chunk, run_args))
+            context.log.info(f"Completed partitions {chunk[0]} to {chunk[-1]}.")
+
+        if config.partition_chunk_concurrency == 1:
+            for chunk in pending:
+                yield from to_materializations(
+                    chunk, run_chunk(chunk, incremental_run_args)
+                )
+                context.log.info(f"Completed partitions {chunk[0]} to {chunk[-1]}.")
+        else:
+            # concurrent chunks are collected in their threads and yielded as they end
+            errors = []
+            with ThreadPoolExecutor(
+                max_workers=config.partition_chunk_concurrency
+            ) as executor:
+                futures = {
+                    executor.submit(collect_chunk, chunk, incremental_run_args): chunk
+                    for chunk in pending
+                }
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    invocation, events, error = future.result()
+                    stream = (
+                        Factory._stream_with_run_results(context, invocation, events)
+                        if invocation and not error else events
+                    )
+                    try:
+                        yield from to_materializations(chunk, stream)
+                    except Exception as stream_error:
+                        error = error or stream_error
+                    if error:
+                        errors.append(error)
+                    else:
+                        context.log.info(
+                            f"Completed partitions {chunk[0]} to {chunk[-1]}."
+                        )
+            if errors:
+                raise errors[0]
+
+        partition_vars = Factory._get_partition_vars(context, final_chunk, dbt_vars)
+        if not chunks:
+            invocation = Factory._cli(context, dbt, args, partition_vars)
+            yield from Factory._stream_with_run_results(context, invocation)
+            return
+
+        invocation = Factory._cli(context, dbt, incremental_args, partition_vars)
+        yield from to_materializations(
+            final_chunk, Factory._stream_with_run_results(context, invocation)
+        )
@@ -0,0 +1,233 @@
+"""Per node timing and warehouse metadata parsed from dbt ``run_results.json``.
+
+dbt records the timing, status, and adapter response of every node it executes in the
+``run_results.json`` artifact of an invocation. These helpers turn that artifact into
+Dagster observations of each materialized node and of each checked asset, and into a
+per run summary that ranks the slowest and most expensive nodes, recorded on the
+``dbt/run_summaries`` asset, so hot models can be found from Dagster instead of the
+warehouse query history.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import dagster as dg
+
+RUN_SUMMARY_DIR_ENV = "DBT_RUN_SUMMARY_DIR"
+RUN_SUMMARY_ASSET_KEY = dg.AssetKey(["dbt", "run_summaries"])
+EXECUTION_SECONDS_METADATA_KEY = "dbt_execution_seconds"
+
+# adapter response fields that measure data scanned, named differently per adapter
+BYTES_SCANNED_FIELDS = ("bytes_scanned", "bytes_processed", "bytes_billed")
+
+
+def get_node_metadata(run_results: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Extract timing and adapter response metadata for each node in a run.
+
+    Args:
+        run_results: A parsed ``run_results.json`` artifact.
+
+    Returns:
+        dict[str, dict[str, Any]]: Metadata for each executed node keyed by unique id.
+    """
+    node_metadata = {}
+    for result in run_results.get("results", []):
+        adapter_response = result.get("adapter_response") or {}
+        metadata: dict[str, Any] = {
+            "dbt_status": result.get("status"),
+            EXECUTION_SECONDS_METADATA_KEY: round(result.get("execution_time") or 0, 3),
+            "dbt_thread_id": result.get("thread_id"),
+        }
+        for step in result.get("timing", []):
+            if step.get("started_at") and step.get("completed_at"):
+                started_at = datetime.fromisoformat(step["started_at"])
+                completed_at = datetime.fromisoformat(step["completed_at"])
+                metadata[f"dbt_{step['name']}_seconds"] = round(
+                    (completed_at - started_at).total_seconds(), 3
+                )
+        if (rows_affected := adapter_response.get("rows_affected")) is not None:
+            metadata["dbt_rows_affected"] = rows_affected
+        if query_id := adapter_response.get("query_id"):
+            metadata["dbt_query_id"] = query_id
+        for field in BYTES_SCANNED_FIELDS:
+            if (bytes_scanned := adapter_response.get(field)) is not None:
+                metadata["dbt_bytes_scanned"] = bytes_scanned
+                break
+
+        node_metadata[result["unique_id"]] = metadata
+    return node_metadata
+
+
+def get_node_observations(
+    node_metadata: dict[str, dict[str, Any]], asset_keys: dict[str, dg.AssetKey]
+) -> list[dg.AssetObservation]:
+    """Build an observation with the run results metadata of each materialized node.
+
+    ``run_results.json`` is only written once the invocation exits, after the
+    materializations have been streamed, so the metadata is recorded on an
+    observation of each asset instead.
+
+    Args:
+        node_metadata: Metadata for each executed node keyed by unique id.
+        asset_keys: Asset key of each materialized node keyed by unique id.
+
+    Returns:
+        list[dagster.AssetObservation]: An observation per materialized node with
+            run results metadata.
+    """
+    return [
+        dg.AssetObservation(asset_key=asset_keys[unique_id], metadata=metadata)
+        for unique_id, metadata in node_metadata.items()
+        if unique_id in asset_keys
+    ]
+
+
+def get_check_observations(
+    node_metadata: dict[str, dict[str, Any]], check_keys: dict[str, dg.AssetCheckKey]
+) -> list[dg.AssetObservation]:
+    """Build an observation of each checked asset with the runtime of its tests.
+
+    Check results are streamed before ``run_results.json`` is written, like
+    materializations, so the execution time of each test is recorded on an
+    observation of the asset it checks, keyed by the name of its check.
+
+    Args:
+        node_metadata: Metadata for each executed node keyed by unique id.
+        check_keys: Check key of each evaluated test keyed by unique id.
+
+    Returns:
+        list[dagster.AssetObservation]: An observation per checked asset with a
+            ``dbt_execution_seconds/<check name>`` entry for each of its tests.
+    """
+    check_seconds: dict[dg.AssetKey, dict[str, float]] = {}
+    for unique_id, check_key in check_keys.items():
+        if unique_id in node_metadata:
+            check_seconds.setdefault(check_key.asset_key, {})[
+                f"{EXECUTION_SECONDS_METADATA_KEY}/{check_key.name}"
+            ] = node_metadata[unique_id][EXECUTION_SECONDS_METADATA_KEY]
+    return [
+        dg.AssetObservation(asset_key=asset_key, metadata=metadata)
+        for asset_key, metadata in check_seconds.items()
+    ]
+
+
+def build_run_summary(run_results: dict[str, Any], top_n: int = 10) -> dict[str, Any]:
+    """Rank the nodes of a run by execution time and by the data they processed.
+
+    Args:
+        run_results: A parsed ``run_results.json`` artifact.
+        top_n: Number of nodes in each ranking.
+
+    Returns:
+        dict[str, Any]: Summary with the invocation id, total elapsed time, the node
+            count by status, and the slowest and most expensive nodes.
+    """
+    node_metadata = get_node_metadata(run_results)
+    nodes = [
+        {"unique_id": unique_id, **metadata}
+        for unique_id, metadata in node_metadata.items()
+    ]
+
+    statuses: dict[str, int] = {}
+    for node in nodes:
+        statuses[node["dbt_status"]] = statuses.get(node["dbt_status"], 0) + 1
+
+    def cost(node: dict[str, Any]) -> tuple[int, int]:
+        return (node.get("dbt_bytes_scanned") or 0, node.get("dbt_rows_affected") or 0)
+
+    return {
+        "invocation_id": run_results.get("metadata", {}).get("invocation_id"),
+        "elapsed_seconds": round(run_results.get("elapsed_time") or 0, 3),
+        "statuses": statuses,
+        "slowest": sorted(
+            nodes, key=lambda node: node[EXECUTION_SECONDS_METADATA_KEY], reverse=True
+        )[:top_n],
+        "most_expensive": sorted(nodes, key=cost, reverse=True)[:top_n],
+    }
+
+
+def get_run_summary_observation(
+    summary: dict[str, Any], run_id: str
+) -> dg.AssetObservation:
+    """Record a run summary as an observation of the run summaries asset, so the
+    summaries of past runs are kept by Dagster rather than on the worker.
+
+    Args:
+        summary: A summary built by :func:`build_run_summary`.
+        run_id: Dagster run id the invocation belongs to.
+
+    Returns:
+        dagster.AssetObservation: Observation holding the summary.
+    """
+    return dg.AssetObservation(
+        asset_key=RUN_SUMMARY_ASSET_KEY,
+        metadata={
+            "dagster_run_id": run_id,
+            "dbt_invocation_id": summary["invocation_id"],
+            "dbt_elapsed_seconds": summary["elapsed_seconds"],
+            "dbt_statuses": dg.MetadataValue.json(summary["statuses"]),
+            "dbt_slowest_nodes": dg.MetadataValue.md(format_run_summary(summary)),
+            "dbt_run_summary": dg.MetadataValue.json(summary),
+        },
+    )
+
+
+def write_run_summary(
+    summary: dict[str, Any], run_id: str, summary_dir: Path | str
+) -> Path:
+    """Write a run summary as a JSON artifact.
+
+    Args:
+        summary: A summary built by :func:`build_run_summary`.
+        run_id: Dagster run id the invocation belongs to.
+        summary_dir: Folder to write the artifact to.
+
+    Returns:
+        Path: Path of the written artifact.
+    """
+    summary_dir = Path(summary_dir)
+    summary_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = summary_dir.joinpath(
+        f"{run_id}_{summary['invocation_id']}.json"
+    )
+    with open(summary_path, "w") as file:
+        json.dump(summary, file, indent=2)
+    return summary_path
+
+
+def format_run_summary(summary: dict[str, Any]) -> str:
+    """Format the slowest nodes of a run summary as a markdown table.
+
+    Args:
+        summary: A summary built by :func:`build_run_summary`.
+
+    Returns:
+        str: Markdown table of the slowest nodes.
+    """
+    lines = [
+        "| node | status | seconds | rows affected |",
+        "| --- | --- | --- | --- |",
+    ]
+    for node in summary["slowest"]:
+        lines.append(
+            f"| {node['unique_id']} | {node['dbt_status']} | "
+            f"{node['dbt_execution_seconds']} | {node.get('dbt_rows_affected', '')} |"
+        )
+    return "\n".join(lines)
+
+
+def build_run_summary_spec() -> dg.AssetSpec:
+    """Declare the asset the run summaries are recorded on.
+
+    Returns:
+        dagster.AssetSpec: An external asset observed once per dbt invocation.
+    """
+    return dg.AssetSpec(
+        key=RUN_SUMMARY_ASSET_KEY,
+        group_name="observability",
+        kinds={"dbt"},
+        description="Summary of each dbt invocation, ranking its slowest and most "
+        "expensive nodes.",
+    )
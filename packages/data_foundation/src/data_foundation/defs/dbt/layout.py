@@ -0,0 +1,191 @@
+"""Asset checks that measure the physical layout of clustered dbt models.
+
+Models declare their layout in ``meta.dagster``, and the ``apply_layout_hints`` post
+hook applies it to the table. For every model with ``cluster_by``, the layout check
+reads the clustering information of the table and the partitions its latest build
+scanned, so the effect of a clustering key on pruning can be followed from Dagster.
+"""
+
+import json
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import dagster as dg
+from dagster_snowflake import SnowflakeResource
+
+from .constants import LAYOUT_HINTS_METADATA_KEY
+
+LAYOUT_CHECK_NAME = "clustering_layout"
+QUERY_ID_METADATA_KEY = "dbt_query_id"
+
+
+def get_clustered_assets(
+    assets_defs: Iterable[dg.AssetsDefinition],
+) -> dict[dg.AssetKey, dict[str, Any]]:
+    """Return the dbt assets whose layout hints declare a clustering key.
+
+    Args:
+        assets_defs: dbt assets definitions built with the custom translator.
+
+    Returns:
+        dict[dagster.AssetKey, dict[str, Any]]: The ``relation`` and validated layout
+            hints of each clustered asset.
+    """
+    clustered_assets = {}
+    for assets_def in assets_defs:
+        for spec in assets_def.specs:
+            hints = spec.metadata.get(LAYOUT_HINTS_METADATA_KEY)
+            hints = getattr(hints, "value", hints)
+            if hints and hints.get("cluster_by"):
+                relation = spec.metadata["dagster/table_name"]
+                clustered_assets[spec.key] = {
+                    "relation": getattr(relation, "value", relation), **hints
+                }
+    return clustered_assets
+
+
+def get_clustering_information_sql(relation: str, cluster_by: list[str]) -> str:
+    """Build the query that reads the clustering information of a table.
+
+    Args:
+        relation: Fully qualified name of the table.
+        cluster_by: Clustering key the information is computed for.
+
+    Returns:
+        str: SQL returning the ``system$clustering_information`` JSON document.
+    """
+    columns = ", ".join(cluster_by).replace("'", "''")
+    return f"select system$clustering_information('{relation}', '({columns})')"
+
+
+def get_partitions_scanned_sql(relation: str, query_id: str) -> str:
+    """Build the query that reads the partitions a query scanned.
+
+    Args:
+        relation: Fully qualified name of the table, its database holds the query
+            history function.
+        query_id: Id of the query that built the table.
+
+    Returns:
+        str: SQL returning ``partitions_scanned`` and ``partitions_total``.
+    """
+    return f"""
+        select partitions_scanned, partitions_total
+        from table({relation.split(".")[0]}.information_schema.query_history(
+            end_time_range_start => dateadd(day, -7, current_timestamp()),
+            result_limit => 10000
+        ))
+        where query_id = '{query_id}'
+    """
+
+
+def get_layout_metadata(
+    clustering_information: Mapping[str, Any],
+    partitions_scanned: int | None = None,
+    partitions_total: int | None = None,
+) -> dict[str, Any]:
+    """Summarize the layout of a table as check metadata.
+
+    Args:
+        clustering_information: Parsed ``system$clustering_information`` document.
+        partitions_scanned: Partitions scanned by the latest build of the table.
+        partitions_total: Partitions of the tables the latest build read.
+
+    Returns:
+        dict[str, Any]: Clustering depth and overlap, partition count, and the share
+            of partitions the latest build scanned.
+    """
+    metadata: dict[str, Any] = {
+        "cluster_by_keys": clustering_information.get("cluster_by_keys"),
+        "total_partition_count": clustering_information.get("total_partition_count"),
+        "average_depth": clustering_information.get("average_depth"),
+        "average_overlaps": clustering_information.get("average_overlaps"),
+    }
+    if partitions_scanned is not None and partitions_total:
+        metadata["partitions_scanned"] = partitions_scanned
+        metadata["partitions_total"] = partitions_total
+        metadata["partitions_scanned_ratio"] = round(
+            partitions_scanned / partitions_total, 4
+        )
+    return {key: value for key, value in metadata.items() if value is not None}
+
+
+def build_layout_checks(
+    assets_defs: Iterable[dg.AssetsDefinition],
+) -> list[dg.AssetChecksDefinition]:
+    """Build the layout checks of the clustered dbt models.
+
+    Args:
+        assets_defs: dbt assets definitions containing the clustered models.
+
+    Returns:
+        list[dagster.AssetChecksDefinition]: A check per clustered model that runs
+            after the model is materialized, an empty list when no model is
+            clustered.
+    """
+    clustered_assets = get_clustered_assets(assets_defs)
+    if not clustered_assets:
+        return []
+
+    @dg.multi_asset_check(
+        name="dbt_layout_checks",
+        specs=[
+            dg.AssetCheckSpec(
+                LAYOUT_CHECK_NAME,
+                asset=asset_key,
+                description="Clustering depth of the table and the share of "
+                "micro-partitions its latest build scanned.",
+                automation_condition=dg.AutomationCondition.any_deps_updated(),
+            )
+            for asset_key in clustered_assets
+        ],
+        can_subset=True,
+    )
+    def dbt_layout_checks( # pragma: no coverage
+        context: dg.AssetCheckExecutionContext, snowflake: SnowflakeResource
+    ) -> Iterable[dg.AssetCheckResult]:
+        """Read the layout of each selected model.
+
+        Args:
+            context: Check execution context with the selected checks.
+            snowflake: Snowflake resource used to read the layout.
+
+        Yields:
+            dagster.AssetCheckResult: The layout of each model, which warns when the
+                average depth exceeds ``max_clustering_depth``.
+        """
+        with snowflake.get_connection() as connection:
+            cursor = connection.cursor()
+            for check_key in context.selected_asset_check_keys:
+                node = clustered_assets[check_key.asset_key]
+                cursor.execute(
+                    get_clustering_information_sql(node["relation"], node["cluster_by"])
+                )
+                clustering_information = json.loads(cursor.fetchone()[0])
+
+                partitions: tuple[int | None, int | None] = (None, None)
+                event = context.instance.get_latest_materialization_event(
+                    check_key.asset_key
+                )
+                materialization = event and event.asset_materialization
+                query_id = materialization and materialization.metadata.get(
+                    QUERY_ID_METADATA_KEY
+                )
+                if query_id:
+                    cursor.execute(
+                        get_partitions_scanned_sql(node["relation"], query_id.value)
+                    )
+                    partitions = cursor.fetchone() or partitions
+
+                metadata = get_layout_metadata(clustering_information, *partitions)
+                max_depth = node.get("max_clustering_depth")
+                yield dg.AssetCheckResult(
+                    asset_key=check_key.asset_key,
+                    check_name=check_key.name,
+                    passed=max_depth is None
+                    or metadata.get("average_depth", 0) <= max_depth,
+                    severity=dg.AssetCheckSeverity.WARN,
+                    metadata=metadata,
+                )
+
+    return [dbt_layout_checks]
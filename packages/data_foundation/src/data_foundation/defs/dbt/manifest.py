@@ -0,0 +1,347 @@
+"""Helpers for analysing the dbt manifest graph.
+
+The dbt factory uses these helpers to plan how the project is split into Dagster assets
+definitions. They operate on the parsed ``manifest.json`` so they can run at definition
+load time without invoking dbt.
+"""
+
+import json
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+# resource types that are selected directly, tests follow their parents in dbt build
+SELECTABLE_RESOURCE_TYPES = ("model", "seed", "snapshot")
+
+SHARD_BY_GROUP = "group"
+SHARD_BY_FOLDER = "folder"
+SHARD_BY_COMPONENT = "component"
+SHARD_BY_OPTIONS = (SHARD_BY_GROUP, SHARD_BY_FOLDER, SHARD_BY_COMPONENT)
+
+
+@cache
+def load_manifest(manifest_path: Path | str) -> dict[str, Any]:
+    """Load and cache a dbt manifest.
+
+    Args:
+        manifest_path: Path to a ``manifest.json`` file.
+
+    Returns:
+        dict[str, Any]: The parsed manifest.
+    """
+    with open(manifest_path) as file:
+        return json.load(file)
+
+
+def get_selectable_nodes(
+    manifest: dict[str, Any], exclude_tags: tuple[str, ...] = ()
+) -> dict[str, dict[str, Any]]:
+    """Return the models, seeds, and snapshots of a manifest keyed by unique id.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        exclude_tags: Nodes with any of these tags are left out.
+
+    Returns:
+        dict[str, dict[str, Any]]: Nodes that can be selected directly.
+    """
+    return {
+        unique_id: node
+        for unique_id, node in manifest.get("nodes", {}).items()
+        if node.get("resource_type") in SELECTABLE_RESOURCE_TYPES
+        and not set(exclude_tags).intersection(node.get("config", {}).get("tags", []))
+    }
+
+
+def get_shard_key(node: dict[str, Any], shard_by: str, project_name: str) -> str:
+    """Return the shard a node belongs to when sharding by group or folder.
+
+    Args:
+        node: A dbt manifest node.
+        shard_by: Either ``group`` or ``folder``.
+        project_name: Name of the root dbt project.
+
+    Returns:
+        str: The dbt group of the node, or the top level folder of the node within its
+            resource path. Nodes without a group, and nodes of installed packages when
+            sharding by folder, are keyed by their package name.
+    """
+    if shard_by == SHARD_BY_GROUP:
+        return node.get("group") or node["package_name"]
+
+    if node["package_name"] != project_name:
+        return node["package_name"]
+
+    fqn = node["fqn"]
+    if node["resource_type"] == "model" and len(fqn) > 2:
+        return fqn[1]
+    return f"{node['resource_type']}s"
+
+
+def get_connected_components(
+    manifest: dict[str, Any],
+    max_shards: int | None = None,
+    exclude_tags: tuple[str, ...] = (),
+) -> dict[str, list[str]]:
+    """Split the selectable nodes into subgraphs that share no dependencies.
+
+    Nodes are connected by their ``depends_on`` edges, and by tests that reference more
+    than one node, so a relationship test never spans two components. When
+    ``max_shards`` is set, the components are packed into that many shards, largest
+    first, so a project with many small islands does not produce a definition per
+    island.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        max_shards: Optional upper bound on the number of shards returned.
+        exclude_tags: Nodes with any of these tags are left out.
+
+    Returns:
+        dict[str, list[str]]: Sorted unique ids of each component, keyed by a stable
+            ``component_<n>`` name ordered by the first unique id in the component.
+    """
+    nodes = get_selectable_nodes(manifest, exclude_tags)
+    parents = {unique_id: unique_id for unique_id in nodes}
+
+    def find(unique_id: str) -> str:
+        while parents[unique_id] != unique_id:
+            parents[unique_id] = parents[parents[unique_id]]
+            unique_id = parents[unique_id]
+        return unique_id
+
+    def union(left: str, right: str) -> None:
+        parents[find(left)] = find(right)
+
+    for unique_id, node in manifest.get("nodes", {}).items():
+        linked = [parent for parent in node.get("depends_on", {}).get("nodes", [])
+                  if parent in nodes]
+        if unique_id in nodes:
+            linked.append(unique_id)
+        for left, right in zip(linked, linked[1:], strict=False):
+            union(left, right)
+
+    members = defaultdict(list)
+    for unique_id in nodes:
+        members[find(unique_id)].append(unique_id)
+    components = sorted(sorted(component) for component in members.values())
+
+    if max_shards and len(components) > max_shards:
+        bins: list[list[str]] = [[] for _ in range(max_shards)]
+        for component in sorted(components, key=len, reverse=True):
+            min(bins, key=len).extend(component)
+        components = sorted(sorted(shard) for shard in bins if shard)
+
+    return {
+        f"{SHARD_BY_COMPONENT}_{index}": component
+        for index, component in enumerate(components, start=1)
+    }
+
+
+def get_shards(
+    manifest: dict[str, Any],
+    shard_by: str,
+    max_shards: int | None = None,
+    exclude_tags: tuple[str, ...] = (),
+) -> dict[str, list[str]]:
+    """Partition the selectable nodes of a manifest into disjoint shards.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        shard_by: ``group`` to shard by dbt group, ``folder`` to shard by top level
+            folder, or ``component`` to shard by connected subgraphs of the DAG.
+        max_shards: Upper bound on the number of component shards.
+        exclude_tags: Nodes with any of these tags are left out.
+
+    Returns:
+        dict[str, list[str]]: Sorted unique ids of the nodes in each shard keyed by a
+            shard name that is safe to use in a Dagster definition name.
+
+    Raises:
+        ValueError: If ``shard_by`` is not a supported option.
+    """
+    if shard_by not in SHARD_BY_OPTIONS:
+        raise ValueError(f"Unsupported shard option '{shard_by}', expected one of "
+            f"{SHARD_BY_OPTIONS}.")
+
+    if shard_by == SHARD_BY_COMPONENT:
+        return get_connected_components(manifest, max_shards, exclude_tags)
+
+    project_name = manifest.get("metadata", {}).get("project_name", "")
+    shards = defaultdict(list)
+    for unique_id, node in get_selectable_nodes(manifest, exclude_tags).items():
+        shard_key = get_shard_key(node, shard_by, project_name)
+        shard_name = re.sub(r"\W", "_", shard_key)
+        shards[shard_name].append(unique_id)
+    return {name: sorted(shards[name]) for name in sorted(shards)}
+
+
+def get_selection(manifest: dict[str, Any], unique_ids: list[str]) -> str:
+    """Build a dbt selection string that selects exactly the given nodes.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        unique_ids: Unique ids of models, seeds, snapshots, or tests.
+
+    Returns:
+        str: A space separated union of ``fqn:`` selectors.
+    """
+    nodes = manifest["nodes"]
+    return " ".join(
+        "fqn:" + ".".join(nodes[unique_id]["fqn"]) for unique_id in unique_ids
+    )
+
+
+def get_modified_nodes(
+    manifest: dict[str, Any], state_manifest: dict[str, Any]
+) -> set[str]:
+    """Return the nodes that are new or changed compared to a stored manifest.
+
+    A node is modified when it does not exist in the stored manifest, when its file
+    checksum or unrendered config differ, or when a macro it calls, directly or
+    through other macros, has changed. The unrendered config is compared so that
+    config rendered from the environment, such as the target schema or ``env_var``
+    values, does not mark every node modified when a development parse is compared
+    with the production state. This mirrors the ``state:modified`` selector of dbt
+    so it can be evaluated without invoking dbt.
+
+    Args:
+        manifest: The manifest of the project being deployed.
+        state_manifest: The manifest of the last production deployment.
+
+    Returns:
+        set[str]: Unique ids of the modified nodes.
+    """
+    state_nodes = state_manifest.get("nodes", {})
+    state_macros = state_manifest.get("macros", {})
+
+    modified_macros = _get_macro_callers(manifest, {
+        unique_id for unique_id, macro in manifest.get("macros", {}).items()
+        if state_macros.get(unique_id, {}).get("macro_sql") != macro.get("macro_sql")
+    })
+
+    modified = set()
+    for unique_id, node in manifest.get("nodes", {}).items():
+        state_node = state_nodes.get(unique_id)
+        node_macros = node.get("depends_on", {}).get("macros", [])
+        if (
+            state_node is None
+            or state_node.get("checksum") != node.get("checksum")
+            or state_node.get("unrendered_config") != node.get("unrendered_config")
+            or modified_macros.intersection(node_macros)
+        ):
+            modified.add(unique_id)
+    return modified
+
+
+def get_descendants(manifest: dict[str, Any], unique_ids: set[str]) -> set[str]:
+    """Return the given nodes together with every node downstream of them.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        unique_ids: Unique ids to start from.
+
+    Returns:
+        set[str]: The starting nodes and all of their descendants.
+    """
+    child_map = defaultdict(set)
+    for unique_id, node in manifest.get("nodes", {}).items():
+        for parent in node.get("depends_on", {}).get("nodes", []):
+            child_map[parent].add(unique_id)
+
+    descendants = set(unique_ids)
+    queue = list(unique_ids)
+    while queue:
+        for child in child_map[queue.pop()]:
+            if child not in descendants:
+                descendants.add(child)
+                queue.append(child)
+    return descendants
+
+
+def get_macro_dependents(manifest: dict[str, Any], macro_name: str) -> set[str]:
+    """Return the nodes that call a macro, directly or through other macros.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        macro_name: Name of the macro, in any package.
+
+    Returns:
+        set[str]: Unique ids of the nodes depending on the macro.
+    """
+    callers = _get_macro_callers(manifest, {
+        unique_id for unique_id, macro in manifest.get("macros", {}).items()
+        if macro.get("name") == macro_name
+    })
+    return {
+        unique_id for unique_id, node in manifest.get("nodes", {}).items()
+        if callers.intersection(node.get("depends_on", {}).get("macros", []))
+    }
+
+
+def _get_macro_callers(manifest: dict[str, Any], macro_ids: set[str]) -> set[str]:
+    """Return the given macros together with every macro calling them, directly or
+    through other macros.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        macro_ids: Unique ids of the macros to start from.
+
+    Returns:
+        set[str]: The starting macros and all of their callers.
+    """
+    caller_map = defaultdict(set)
+    for unique_id, macro in manifest.get("macros", {}).items():
+        for called in macro.get("depends_on", {}).get("macros", []):
+            caller_map[called].add(unique_id)
+
+    callers = set(macro_ids)
+    queue = list(macro_ids)
+    while queue:
+        for caller in caller_map[queue.pop()]:
+            if caller not in callers:
+                callers.add(caller)
+                queue.append(caller)
+    return callers
+
+
+def get_dag_width(manifest: dict[str, Any], unique_ids: Iterable[str]) -> int:
+    """Return the largest number of nodes of a selection that can run at once.
+
+    Nodes are layered by the longest chain of selected parents above them, nodes in
+    the same layer do not depend on each other, so the widest layer bounds how many
+    dbt threads the selection can keep busy.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        unique_ids: Unique ids of the selected nodes.
+
+    Returns:
+        int: Size of the widest layer, ``0`` for an empty selection.
+    """
+    selected = set(unique_ids)
+    nodes = manifest.get("nodes", {})
+    depths: dict[str, int] = {}
+
+    def get_depth(unique_id: str) -> int:
+        stack = [unique_id]
+        while stack:
+            current = stack[-1]
+            depends_on = nodes.get(current, {}).get("depends_on", {})
+            parents = [
+                parent for parent in depends_on.get("nodes", []) if parent in selected
+            ]
+            pending = [parent for parent in parents if parent not in depths]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            depths[current] = max((depths[parent] + 1 for parent in parents), default=0)
+        return depths[unique_id]
+
+    layers: dict[int, int] = defaultdict(int)
+    for unique_id in selected:
+        layers[get_depth(unique_id)] += 1
+    return max(layers.values(), default=0)
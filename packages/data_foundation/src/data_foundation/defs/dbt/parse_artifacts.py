@@ -0,0 +1,155 @@
+"""Validate the dbt parse artifacts shipped with the code location.
+
+The image build parses the dbt project and ships ``manifest.json`` and
+``partial_parse.msgpack`` in its target folder, together with a hash of the project
+they were parsed from. The dbt resource copies ``partial_parse.msgpack`` into the
+target folder of every invocation, so dbt only parses the files that changed instead
+of the whole project. When the project no longer matches the hash, for example after
+a local edit or a dbt upgrade, the project is parsed again when the definitions load.
+
+Run as a script by the image build after parsing, it records the hash, and only
+depends on the standard library so it runs in the dbt build stage:
+
+    python parse_artifacts.py dbt --target prod
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dagster_dbt import DbtProject
+
+PARSE_ARTIFACTS_FILE = "parse_artifacts.json"
+PARSE_ARTIFACT_NAMES = ("manifest.json", "partial_parse.msgpack")
+
+# written by dbt or unrelated to parsing
+EXCLUDED_DIRS = ("target", "logs", "state")
+
+
+def get_dbt_version() -> str:
+    """Return the installed dbt-core version, partial parse artifacts are only valid
+    for the version that wrote them.
+
+    Returns:
+        str: The version, empty when dbt-core is not installed.
+    """
+    try:
+        return version("dbt-core")
+    except PackageNotFoundError:
+        return ""
+
+
+def get_project_hash(project_dir: Path | str, target: str) -> str:
+    """Hash the files of a dbt project together with the settings of the parse.
+
+    Hidden files and the folders written by dbt are ignored.
+
+    Args:
+        project_dir: Directory of the dbt project.
+        target: dbt target the project is parsed for.
+
+    Returns:
+        str: A sha256 hex digest.
+    """
+    project_dir = Path(project_dir)
+    digest = hashlib.sha256(json.dumps([get_dbt_version(), target]).encode())
+    for path in sorted(project_dir.rglob("*")):
+        relative_path = path.relative_to(project_dir)
+        if (
+            not path.is_file()
+            or relative_path.parts[0] in EXCLUDED_DIRS
+            or any(part.startswith(".") for part in relative_path.parts)
+        ):
+            continue
+        digest.update(relative_path.as_posix().encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def write_parse_artifacts_hash(
+    project_dir: Path | str, target_path: Path | str, target: str
+) -> Path:
+    """Record the hash of the project the artifacts in the target folder were parsed
+    from.
+
+    Args:
+        project_dir: Directory of the dbt project.
+        target_path: Target folder holding the parse artifacts, relative to the
+            project directory.
+        target: dbt target the project was parsed for.
+
+    Returns:
+        pathlib.Path: Path of the written file.
+    """
+    path = Path(project_dir, target_path, PARSE_ARTIFACTS_FILE)
+    path.write_text(json.dumps({
+        "project_hash": get_project_hash(project_dir, target),
+        "dbt_version": get_dbt_version(),
+        "target": target,
+    }, indent=2))
+    return path
+
+
+def are_parse_artifacts_current(
+    project_dir: Path | str, target_path: Path | str, target: str
+) -> bool:
+    """Check that the parse artifacts in the target folder match the project.
+
+    Args:
+        project_dir: Directory of the dbt project.
+        target_path: Target folder holding the parse artifacts, relative to the
+            project directory.
+        target: dbt target the project is parsed for.
+
+    Returns:
+        bool: Whether every artifact exists and the recorded hash matches.
+    """
+    target_dir = Path(project_dir, target_path)
+    if not all(target_dir.joinpath(name).exists() for name in PARSE_ARTIFACT_NAMES):
+        return False
+    try:
+        recorded = json.loads(target_dir.joinpath(PARSE_ARTIFACTS_FILE).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+    return recorded.get("project_hash") == get_project_hash(project_dir, target)
+
+
+def prepare_parse_artifacts(project: "DbtProject") -> bool:
+    """Parse a dbt project again when its parse artifacts are stale.
+
+    Args:
+        project: The dbt project, parsed with its own profile and target so the
+            artifacts are valid for the invocations of the dbt resource.
+
+    Returns:
+        bool: Whether the project was parsed.
+    """
+    target = project.target or ""
+    if are_parse_artifacts_current(project.project_dir, project.target_path, target):
+        return False
+
+    project.preparer.prepare(project)
+    write_parse_artifacts_hash(project.project_dir, project.target_path, target)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record the hash of a parsed dbt "
+                                     "project next to its parse artifacts.")
+    parser.add_argument("project_dir", type=Path)
+    parser.add_argument("--target-path", default="target")
+    parser.add_argument("--target", default=os.getenv("TARGET", "dev"))
+    args = parser.parse_args()
+
+    missing = [
+        name for name in PARSE_ARTIFACT_NAMES
+        if not Path(args.project_dir, args.target_path, name).exists()
+    ]
+    if missing:
+        parser.error(f"Parse the project first, missing {', '.join(missing)}.")
+    print(write_parse_artifacts_hash(args.project_dir, args.target_path, args.target))
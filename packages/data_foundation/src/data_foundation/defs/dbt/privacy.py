@@ -0,0 +1,134 @@
+"""Asset that enforces the privacy retention rules of the dbt project.
+
+Models and snapshots declare how long their rows are kept in ``meta.privacy``:
+
+.. code-block:: yaml
+
+    meta:
+      privacy:
+        delete_interval: 10 years
+        anonymize_interval: 5 years
+        reference_date_column: updated_at
+        pii_columns: [first_name, last_name, email]
+
+Rather than deleting and anonymizing the whole table after every build, the privacy
+retention asset runs the ``apply_privacy_retention`` operation on its own schedule. The
+operation keeps a watermark of the last cutoff per table, only processes the rows that
+crossed the interval since then, and logs all operations with a single insert.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+import dagster as dg
+from dagster_dbt import DbtCliResource
+
+from .costs import get_unique_id_asset_keys
+
+PRIVACY_RULE_KEYS = (
+    "delete_interval",
+    "anonymize_interval",
+    "reference_date_column",
+    "pii_columns",
+)
+
+
+def get_privacy_rules(manifest: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Collect the retention rules of the nodes of a manifest.
+
+    Args:
+        manifest: A parsed dbt manifest.
+
+    Returns:
+        dict[str, dict[str, Any]]: The relation and retention settings of every node
+            with a delete or anonymize interval in ``meta.privacy``, keyed by unique id.
+
+    Raises:
+        ValueError: If a node with a retention interval has no reference date column.
+    """
+    rules = {}
+    for unique_id, node in manifest.get("nodes", {}).items():
+        privacy = (node.get("config", {}).get("meta") or {}).get("privacy") or {}
+        if not (privacy.get("delete_interval") or privacy.get("anonymize_interval")):
+            continue
+        if not privacy.get("reference_date_column"):
+            raise ValueError(
+                f"'{unique_id}' has a retention interval but no reference_date_column."
+            )
+        rules[unique_id] = {
+            "relation": node["relation_name"],
+            **{key: privacy[key] for key in PRIVACY_RULE_KEYS if key in privacy},
+        }
+    return rules
+
+
+class PrivacyRetentionConfig(dg.Config):
+    """Runtime configuration of the privacy retention asset.
+
+    Attributes:
+        full_scan: Ignore the watermarks and process every row past the cutoff, for
+            example after rows with an old reference date were loaded late.
+    """
+
+    full_scan: bool = False
+
+
+def build_privacy_retention_asset(
+    manifest: dict[str, Any], assets_defs: Iterable[dg.AssetsDefinition]
+) -> dg.AssetsDefinition:
+    """Build the asset that applies the retention rules of the dbt project.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        assets_defs: dbt assets definitions, the asset depends on the assets with
+            retention rules so it is shown downstream of them.
+
+    Returns:
+        dagster.AssetsDefinition: A daily asset that runs ``apply_privacy_retention``
+            with the ``dbt`` resource.
+    """
+    rules = get_privacy_rules(manifest)
+    asset_keys = get_unique_id_asset_keys(assets_defs)
+
+    @dg.asset(
+        key=["dbt", "privacy_retention"],
+        group_name="privacy",
+        kinds={"snowflake", "dbt"},
+        deps=[
+            dg.AssetKey.from_user_string(asset_keys[unique_id])
+            for unique_id in rules
+            if unique_id in asset_keys
+        ],
+        automation_condition=(
+            dg.AutomationCondition.cron_tick_passed("0 3 * * *")
+            & ~dg.AutomationCondition.in_progress()
+        ),
+        metadata={"rules": rules},
+        description="Deletes and anonymizes rows past the retention intervals in "
+        "meta.privacy, processing only rows that crossed the interval since the last "
+        "run.",
+    )
+    def dbt_privacy_retention( # pragma: no coverage
+        context: dg.AssetExecutionContext,
+        dbt: DbtCliResource,
+        config: PrivacyRetentionConfig,
+    ) -> dg.MaterializeResult:
+        """Run the retention operation for every rule.
+
+        Args:
+            context: Dagster execution context used for logging.
+            dbt: The dbt CLI resource.
+            config: Whether to ignore the watermarks.
+
+        Returns:
+            dagster.MaterializeResult: The number of tables processed.
+        """
+        args = {"rules": list(rules.values()), "full_scan": config.full_scan}
+        context.log.info(f"Applying privacy retention to {len(rules)} tables.")
+        dbt.cli(
+            ["run-operation", "apply_privacy_retention", "--args", json.dumps(args)]
+        ).wait()
+        return dg.MaterializeResult(metadata={"tables": len(rules)})
+
+    return dbt_privacy_retention
@@ -0,0 +1,177 @@
+"""Sampled execution of the dbt tests of large models.
+
+Tests with ``sample`` in ``meta.dagster``, or attached to a model with ``test_sample``
+in ``meta.dagster``, only read a sample of the model: the rows within the partitions
+of the run when the sample has a ``column`` and the run is partitioned, or a block
+sample of ``percent`` of the table otherwise. The ``get_where_subquery`` macro applies
+the sample, and the scope a test ran with is recorded as ``dbt_sample_scope`` on its
+check result. A weekly schedule runs the sampled tests against the whole tables.
+"""
+
+import os
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import dagster as dg
+from dagster_dbt.asset_utils import DAGSTER_DBT_UNIQUE_ID_METADATA_KEY
+from data_platform_utils.helpers import get_nested
+
+SAMPLE_SCOPE_METADATA_KEY = "dbt_sample_scope"
+FULL_CHECKS_JOB_NAME = "dbt_full_checks"
+FULL_CHECKS_CRON = os.getenv("DBT_FULL_CHECKS_CRON", "0 4 * * 0")
+
+
+def get_test_sample(
+    manifest: Mapping[str, Any], test_unique_id: str
+) -> dict[str, Any] | None:
+    """Return the sample a dbt test is restricted to.
+
+    Args:
+        manifest: A parsed dbt manifest.
+        test_unique_id: Unique id of the dbt test.
+
+    Returns:
+        dict[str, Any] | None: The ``sample`` of the test, or the ``test_sample`` of
+            the model it is attached to, ``None`` when the test is not sampled.
+    """
+    nodes = manifest["nodes"]
+    test = nodes.get(test_unique_id, {})
+    if sample := get_nested(test, ["config", "meta", "dagster", "sample"]):
+        return sample
+    model = nodes.get(test.get("attached_node"), {})
+    return get_nested(model, ["config", "meta", "dagster", "test_sample"])
+
+
+def get_test_sample_scope(
+    sample: Mapping[str, Any], dbt_vars: Mapping[str, Any], full_refresh: bool
+) -> str:
+    """Describe the rows a sampled test reads, as the ``get_where_subquery`` macro
+    restricts them.
+
+    Args:
+        sample: Sample of the test.
+        dbt_vars: Vars of the invocation.
+        full_refresh: Whether the invocation is a full refresh.
+
+    Returns:
+        str: ``full``, the partition window of the run, or the sampled percent.
+    """
+    if full_refresh or dbt_vars.get("full_tests"):
+        return "full"
+    min_date = dbt_vars.get("sample_min_date")
+    max_date = dbt_vars.get("sample_max_date")
+    if sample.get("column") and min_date and max_date:
+        return f"{sample['column']} from {min_date} to {max_date}"
+    if sample.get("percent"):
+        return f"{sample['percent']}% block sample"
+    return "full"
+
+
+def get_sampled_check_keys(
+    assets_defs: Iterable[dg.AssetsDefinition], manifest: Mapping[str, Any]
+) -> dict[dg.AssetCheckKey, dict[str, Any]]:
+    """Return the checks of sampled dbt tests.
+
+    Args:
+        assets_defs: dbt assets definitions built with the custom translator.
+        manifest: A parsed dbt manifest.
+
+    Returns:
+        dict[dagster.AssetCheckKey, dict[str, Any]]: The sample of each check.
+    """
+    sampled_check_keys = {}
+    for assets_def in assets_defs:
+        for spec in assets_def.check_specs:
+            unique_id = spec.metadata.get(DAGSTER_DBT_UNIQUE_ID_METADATA_KEY)
+            if unique_id and (sample := get_test_sample(manifest, unique_id)):
+                sampled_check_keys[spec.key] = sample
+    return sampled_check_keys
+
+
+def get_sample_scopes(
+    context: dg.AssetExecutionContext,
+    manifest: Mapping[str, Any],
+    dbt_vars: Mapping[str, Any],
+    full_refresh: bool,
+) -> dict[dg.AssetCheckKey, str]:
+    """Describe the rows each selected sampled check reads in a run.
+
+    Args:
+        context: Execution context of the dbt assets run.
+        manifest: A parsed dbt manifest.
+        dbt_vars: Vars of the invocation.
+        full_refresh: Whether the invocation is a full refresh.
+
+    Returns:
+        dict[dagster.AssetCheckKey, str]: The scope of each selected sampled check.
+    """
+    sampled_check_keys = get_sampled_check_keys([context.assets_def], manifest)
+    return {
+        check_key: get_test_sample_scope(
+            sampled_check_keys[check_key], dbt_vars, full_refresh
+        )
+        for check_key in context.selected_asset_check_keys
+        if check_key in sampled_check_keys
+    }
+
+
+def add_sample_scope(event: Any, sample_scopes: dict[dg.AssetCheckKey, str]) -> Any:
+    """Record the scope of a sampled check on its result.
+
+    Args:
+        event: An event streamed from the dbt CLI.
+        sample_scopes: The scope of each selected sampled check.
+
+    Returns:
+        The event, with the scope added to its metadata when it is the result of a
+            sampled check.
+    """
+    if not isinstance(event, dg.AssetCheckResult):
+        return event
+
+    check_key = dg.AssetCheckKey(event.asset_key, event.check_name)
+    if scope := sample_scopes.get(check_key):
+        return event.with_metadata(
+            {**event.metadata, SAMPLE_SCOPE_METADATA_KEY: scope}
+        )
+    return event
+
+
+def build_full_checks_schedule(
+    assets_defs: Iterable[dg.AssetsDefinition], manifest: Mapping[str, Any]
+) -> list[dg.ScheduleDefinition]:
+    """Build the schedule that runs the sampled checks against the whole tables.
+
+    Args:
+        assets_defs: dbt assets definitions containing the sampled checks.
+        manifest: A parsed dbt manifest.
+
+    Returns:
+        list[dagster.ScheduleDefinition]: A schedule running the sampled checks with
+            the ``full_tests`` option on ``DBT_FULL_CHECKS_CRON``, an empty list when
+            no check is sampled.
+    """
+    assets_defs = list(assets_defs)
+    sampled_check_keys = get_sampled_check_keys(assets_defs, manifest)
+    if not sampled_check_keys:
+        return []
+
+    job = dg.define_asset_job(
+        FULL_CHECKS_JOB_NAME,
+        selection=dg.AssetSelection.checks(*sampled_check_keys),
+        config={"ops": {
+            assets_def.op.name: {"config": {"full_tests": True}}
+            for assets_def in assets_defs
+            if any(check_key in sampled_check_keys
+                   for check_key in assets_def.check_keys)
+        }},
+        description="Runs the sampled dbt tests against the whole tables.",
+    )
+    return [
+        dg.ScheduleDefinition(
+            name=f"{FULL_CHECKS_JOB_NAME}_schedule",
+            job=job,
+            cron_schedule=FULL_CHECKS_CRON,
+            default_status=dg.DefaultScheduleStatus.RUNNING,
+        )
+    ]
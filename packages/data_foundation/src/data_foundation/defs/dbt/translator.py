@@ -7,18 +7,63 @@ structure returned.
 """
 
 import re
-from collections.abc import Mapping
-from typing import Any, override
+from collections.abc import Callable, Mapping
+from functools import wraps
+from typing import TYPE_CHECKING, Any, override
 
 import dagster as dg
-from dagster_dbt import DagsterDbtTranslator
+from dagster_dbt import DagsterDbtTranslator, DagsterDbtTranslatorSettings
 from data_platform_utils.automation_conditions import CustomAutomationCondition
 from data_platform_utils.helpers import (
     get_automation_condition_from_meta,
+    get_layout_hints_from_meta,
     get_nested,
     get_partitions_def_from_meta,
 )
 
+from .constants import (
+    DEFERRED_CHECK_METADATA_KEY,
+    DYNAMIC_TABLE_MATERIALIZATION,
+    LAYOUT_HINTS_METADATA_KEY,
+)
+from .deferred_checks import is_deferred_test
+
+if TYPE_CHECKING:
+    from dagster_dbt import DbtProject
+
+# <step>_<schema>__<table>, ex: stg_source__table
+NAME_PATTERN = re.compile(r"(.*?)_(.*)__(.*)")
+
+
+def cache_by_unique_id(method: Callable) -> Callable:
+    """Cache the result of a translator method per dbt node.
+
+    dagster-dbt calls the translator for every node each time an assets definition is
+    built from the manifest, so the result is stored on the translator instance keyed
+    by the ``unique_id`` of the node. Resources without a ``unique_id`` are not cached.
+
+    Args:
+        method: A translator method that accepts the dbt resource properties.
+
+    Returns:
+        Callable: The method wrapped with a per node cache.
+    """
+
+    @wraps(method)
+    def wrapper(
+        self: "CustomDagsterDbtTranslator", dbt_resource_props: Mapping[str, Any]
+    ) -> Any:
+        unique_id = dbt_resource_props.get("unique_id")
+        if unique_id is None:
+            return method(self, dbt_resource_props)
+
+        cache = self._node_cache.setdefault(method.__name__, {})
+        if unique_id not in cache:
+            cache[unique_id] = method(self, dbt_resource_props)
+        return cache[unique_id]
+
+    return wrapper
+
 
 class CustomDagsterDbtTranslator(DagsterDbtTranslator):
     """Overrides methods of the standard translator.
@@ -27,9 +72,25 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
     a representation of a dbt resource (models, tests, sources, etc).
     Methods are overridden to customize the implementation.
 
+    Results of the overridden methods are cached per ``unique_id``, so an instance
+    should only translate nodes of a single manifest.
+
+    With ``defer_non_blocking_checks``, the non-blocking and ``deferred`` tests are
+    marked so they run in their own low-priority run, see ``deferred_checks``.
+
     See parent class for details on the purpose of each override"""
 
+    def __init__(
+        self,
+        settings: DagsterDbtTranslatorSettings | None = None,
+        defer_non_blocking_checks: bool = False,
+    ) -> None:
+        super().__init__(settings)
+        self._node_cache: dict[str, dict[str, Any]] = {}
+        self.defer_non_blocking_checks = defer_non_blocking_checks
+
     @override
+    @cache_by_unique_id
     def get_asset_key(self, dbt_resource_props: Mapping[str, Any]) -> dg.AssetKey:
         """Derive the Dagster asset key from dbt metadata or naming conventions.
 
@@ -60,7 +121,7 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
             step = "raw"
             return dg.AssetKey([schema, step, table])
 
-        parsed_name = re.search("(.*?)_(.*)__(.*)", dbt_resource_props[prop_key])
+        parsed_name = NAME_PATTERN.search(dbt_resource_props[prop_key])
         if parsed_name:
             schema = parsed_name.group(2)
             table = parsed_name.group(3)
@@ -70,6 +131,7 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
         return super().get_asset_key(dbt_resource_props) # pragma: no cover
 
     @override
+    @cache_by_unique_id
     def get_group_name(self, dbt_resource_props: Mapping[str, Any]) -> str | None:
         """Extract the asset group from the dbt resource naming convention.
 
@@ -84,7 +146,7 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
         prop_key = "name"
         if dbt_resource_props.get("version"):
             prop_key = "alias"
-        parsed_name = re.search("(.*?)_(.*)__(.*)", dbt_resource_props[prop_key])
+        parsed_name = NAME_PATTERN.search(dbt_resource_props[prop_key])
         if parsed_name:
             schema = parsed_name.group(2)
             return schema
@@ -92,6 +154,7 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
         return super().get_group_name(dbt_resource_props) # pragma: no cover
 
     @override
+    @cache_by_unique_id
     def get_partitions_def(
         self, dbt_resource_props: Mapping[str, Any]
     ) -> dg.PartitionsDefinition | None:
@@ -110,6 +173,7 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
             return get_partitions_def_from_meta(meta)
 
     @override
+    @cache_by_unique_id
     def get_automation_condition(
         self, dbt_resource_props: Mapping[str, Any]
     ) -> dg.AutomationCondition | None:
@@ -128,6 +192,11 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
             if automation_condition:
                 return automation_condition
 
+        # Snowflake refreshes dynamic tables, they are only rebuilt when changed
+        materialized = get_nested(dbt_resource_props, ["config", "materialized"])
+        if materialized == DYNAMIC_TABLE_MATERIALIZATION:
+            return CustomAutomationCondition.missing_or_changed()
+
         # default settings for resource types
         resource_type = dbt_resource_props.get("resource_type")
         if resource_type == "snapshot":
@@ -139,6 +208,73 @@ class CustomDagsterDbtTranslator(DagsterDbtTranslator):
         else:
             return CustomAutomationCondition.lazy()
 
+    @override
+    @cache_by_unique_id
+    def get_metadata(self, dbt_resource_props: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Add the validated physical layout hints of a node to its asset metadata.
+
+        Args:
+            dbt_resource_props: dbt node dictionary whose ``config.meta.dagster``
+                section may declare ``cluster_by``, ``automatic_clustering``,
+                ``search_optimization``, and ``max_clustering_depth``.
+
+        Returns:
+            Mapping[str, Any]: The base translator metadata, with the layout hints
+                under ``dbt_layout_hints`` when any are declared.
+
+        Raises:
+            ValueError: If a layout hint has an invalid value, so the error surfaces
+                when the definitions load rather than when the model is built.
+        """
+        metadata = super().get_metadata(dbt_resource_props)
+        meta = get_nested(dbt_resource_props, ["config", "meta", "dagster"]) or {}
+        try:
+            hints = get_layout_hints_from_meta(meta)
+        except ValueError as e:
+            raise ValueError(f"{dbt_resource_props.get('unique_id')}: {e}") from e
+        if hints:
+            return {**metadata, LAYOUT_HINTS_METADATA_KEY: hints}
+        return metadata
+
+    @override
+    def get_asset_check_spec(
+        self,
+        asset_spec: dg.AssetSpec,
+        manifest: Mapping[str, Any],
+        unique_id: str,
+        project: "DbtProject | None",
+    ) -> dg.AssetCheckSpec | None:
+        """Mark deferred tests and run them once their asset is updated.
+
+        Args:
+            asset_spec: Spec of the asset the test checks.
+            manifest: The dbt manifest.
+            unique_id: Unique id of the dbt test.
+            project: Configured dbt project.
+
+        Returns:
+            dagster.AssetCheckSpec | None: The base translator check spec. Deferred
+                tests are marked with ``dbt_deferred_check`` and get an automation
+                condition, as the runs that build their asset exclude them.
+        """
+        spec = super().get_asset_check_spec(asset_spec, manifest, unique_id, project)
+        if not (
+            spec
+            and self.defer_non_blocking_checks
+            and is_deferred_test(manifest["nodes"][unique_id])
+        ):
+            return spec
+
+        return dg.AssetCheckSpec(
+            name=spec.name,
+            asset=spec.asset_key,
+            description=spec.description,
+            additional_deps=spec.additional_deps,
+            blocking=spec.blocking,
+            metadata={**spec.metadata, DEFERRED_CHECK_METADATA_KEY: True},
+            automation_condition=dg.AutomationCondition.any_deps_updated(),
+        )
+
     @override
     def get_tags(self, dbt_resource_props: Mapping[str, Any]) -> Mapping[str, str]:
         """Augment the base translator's tags with organization-specific entries.
@@ -11,12 +11,16 @@ from typing import Any
 import requests
 
 
-def get_exchange_rate(currency: str) -> Callable[[], Any]:
+def get_exchange_rate(
+    currency: str, session: requests.Session | None = None
+) -> Callable[[], Any]:
     """Return a generator that yields paginated currency exchange rate responses.
 
     Args:
         currency: Three-letter ISO currency code identifying the conversion table to
             fetch.
+        session: Optional session used for the requests, such as the caching session
+            the factory provides in development.
 
     Returns:
         Callable[[], Generator[Any, Any, None]]: A zero-argument callable that yields
@@ -39,10 +43,11 @@ def get_exchange_rate(currency: str) -> Callable[[], Any]:
                 plus pagination metadata. The generator stops when the API no longer
                 provides a ``next_page`` URL.
         """
-        response = requests.get(uri)
+        client = session or requests
+        response = client.get(uri)
         yield response.json()
         while next_uri := response.json().get("next_page"):
-            response = requests.get(next_uri)
+            response = client.get(next_uri)
             yield response.json()
 
     return exchange_api
@@ -4,8 +4,9 @@ import importlib
 from collections.abc import Generator, Sequence
 from datetime import timedelta
 from functools import cache
+from inspect import signature
 from pathlib import Path
-from typing import Any
+from typing import Any, get_args
 
 import dagster as dg
 import dlt
@@ -18,10 +19,18 @@ from data_platform_utils.helpers import (
     get_schema_name,
     sanitize_input_signature,
 )
+from dlt.common.schema.typing import TLoaderMergeStrategy, TWriteDispositionConfig
 from dlt.extract.decorators import ResourceFactory
 from dlt.extract.reference import SourceFactory
 from dlt.extract.resource import DltResource
 
+from .http_cache import get_cached_session
+from .pipelines import (
+    evict_load_packages,
+    get_pipelines_dir,
+    pipeline_config,
+    pipeline_lock,
+)
 from .translator import CustomDagsterDltTranslator
 
 
@@ -101,6 +110,7 @@ class Factory:
         """
         resource_configs = {}
         source_configs = {}
+        fan_out_configs = {}
         config_paths = set()
         patterns = ["**/*.yaml", "**/*.yml"]
         for pattern in patterns:
@@ -116,7 +126,10 @@ class Factory:
                     attributes["entry"] = parent+"."+attributes["entry"]
                     attributes["name"] = name
                     attributes["config_path"] = config_path
-                    resource_configs[name] = attributes
+                    if "fan_out" in attributes:
+                        fan_out_configs[name] = attributes
+                    else:
+                        resource_configs[name] = attributes
             
             source_config = data.get("sources", {})
             for name, attributes in source_config.items():
@@ -124,8 +137,79 @@ class Factory:
                     attributes["name"] = name
                     source_configs[name] = attributes
 
+        for attributes in fan_out_configs.values():
+            Factory._expand_fan_out(attributes, resource_configs, source_configs)
+
         return resource_configs, source_configs
 
+    @staticmethod
+    def _expand_fan_out(config: dict, resource_configs: dict,
+                        source_configs: dict) -> None:
+        """Expand a fan out resource config into one resource per listed value, and
+        bundle them into a single parallelized source.
+
+        Each value in ``fan_out`` becomes a resource named ``<schema>.<value>`` that
+        receives the value as its first argument, so each value is still its own
+        asset while all of them are extracted concurrently in one pipeline run. A
+        source that lists the fan out resource by name receives the expanded
+        resources instead and is parallelized, unless it sets ``parallelized``
+        itself, otherwise a source named after the schema is created using the
+        ``meta`` of the fan out resource.
+
+        Args:
+            config: A resource config containing a ``fan_out`` list of values.
+            resource_configs: Resource configs to add the expanded resources to.
+            source_configs: Source configs to bundle the expanded resources into.
+
+        Raises:
+            ValueError: If an expanded resource already exists, or if a source named
+                after the schema already exists and does not list the fan out
+                resource.
+        """
+        config = config.copy()
+        fan_out_name = config["name"]
+        values = config.pop("fan_out")
+        if not isinstance(values, list):
+            values = [values]
+
+        arguments = config.get("arguments", [])
+        if not isinstance(arguments, list):
+            arguments = [arguments]
+
+        schema = fan_out_name.split(".")[0]
+        resource_names = []
+        for value in values:
+            name = f"{schema}.{value}"
+            if name in resource_configs:
+                raise ValueError(f"Resource '{name}' fanned out from "
+                    f"'{fan_out_name}' is already defined.")
+            resource_configs[name] = {
+                **config,
+                "name": name,
+                "arguments": [value, *arguments],
+            }
+            resource_names.append(name)
+
+        # swap the fan out reference in explicitly declared sources
+        for source_config in source_configs.values():
+            bundled_resources = source_config.get("resources", [])
+            if fan_out_name in bundled_resources:
+                index = bundled_resources.index(fan_out_name)
+                bundled_resources[index:index+1] = resource_names
+                source_config.setdefault("parallelized", True)
+                return
+
+        if schema in source_configs:
+            raise ValueError(f"Source '{schema}' already exists, list "
+                f"'{fan_out_name}' in its resources to bundle the fan out resource.")
+
+        source_configs[schema] = {
+            "name": schema,
+            "resources": resource_names,
+            "parallelized": True,
+            "meta": config.get("meta", {}),
+        }
+
     @staticmethod
     def _build_resource_from_config(config: dict,
                                 resources: dict[str, DltResource]) -> ResourceFactory:
@@ -147,11 +231,47 @@ class Factory:
         table_name = config.get("name", "").split(".")[-1]
         sanitized_config["table_name"] = table_name or config["table_name"]
 
+        if config.get("merge_strategy"):
+            sanitized_config["write_disposition"] = (Factory
+                                                ._get_write_disposition(config))
+
         # swap string reference with hard reference to the instantiated resource
         if config.get("data_from"):
             sanitized_config["data_from"] = resources[config["data_from"]]
         return dlt.resource(data, **sanitized_config)    
 
+    @staticmethod
+    def _get_write_disposition(config: dict) -> TWriteDispositionConfig:
+        """Combine the ``merge_strategy`` of a resource config with its write
+        disposition, so the strategy dlt uses to merge into the destination can be
+        chosen per table.
+
+        Args:
+            config: A resource config with a ``merge_strategy`` of ``delete-insert``,
+                ``upsert``, or ``scd2``, and an optional ``write_disposition`` that is
+                either ``merge`` or a mapping of merge options.
+
+        Returns:
+            A write disposition mapping containing the merge strategy.
+
+        Raises:
+            ValueError: If the merge strategy is not supported by dlt, or if the write
+                disposition of the resource is not ``merge``.
+        """
+        strategy = config["merge_strategy"]
+        if strategy not in get_args(TLoaderMergeStrategy):
+            raise ValueError(f"Merge strategy '{strategy}' of resource "
+                f"'{config['name']}' is not one of {get_args(TLoaderMergeStrategy)}.")
+
+        write_disposition = config.get("write_disposition", "merge")
+        if isinstance(write_disposition, str):
+            write_disposition = {"disposition": write_disposition}
+        if write_disposition.get("disposition") != "merge":
+            raise ValueError(f"Merge strategy '{strategy}' of resource "
+                f"'{config['name']}' requires a write disposition of 'merge'.")
+
+        return {**write_disposition, "strategy": strategy}
+
     @staticmethod
     def _build_freshness_checks(
             config: dict) -> Sequence[dg.AssetChecksDefinition] | None:
@@ -270,6 +390,9 @@ class Factory:
                         arguments to pass to the function.
                     - "keyword_arguments" (optional): A dictionary of keyword arguments
                         to pass to the function.
+                    - "http_cache" (optional): Enables a disk backed HTTP cache in
+                        development, passed to functions that accept a ``session``
+                        keyword argument.
 
         Returns:
             A generator instance returned by the specified function, optionally called
@@ -294,6 +417,13 @@ class Factory:
         # if second order function, pass arguments to get the wrapped generator
         args = resource_config.get("arguments", [])
         kwargs = resource_config.get("keyword_arguments", {})
+
+        # hand a caching session to generators that accept one
+        if "session" in signature(data_generator).parameters and (
+            session := get_cached_session(resource_config)
+        ):
+            kwargs = {**kwargs, "session": session}
+
         if args or kwargs:
             if not isinstance(args, list):
                 args = [args]
@@ -309,7 +439,9 @@ class Factory:
             Args:
                 source_factory:  A generator like factory that yeilds dlt sources.
                 config: the config for the source that holds dagster metadata for
-                    scheduling and control.
+                    scheduling and control, and optional ``staging`` options with a
+                    ``dataset_name_layout`` for the staging dataset used by merges,
+                    and ``truncate`` to empty it after each load.
 
             Retruns:
                 A dagster assets definition.
@@ -321,10 +453,23 @@ class Factory:
 
         sanitized_name = config["name"].replace(".", "__")
         schema_name = get_schema_name(config["name"].split(".")[0])
+        pipelines_dir = get_pipelines_dir()
+
+        # loader options are set for this pipeline when it runs
+        staging = config.get("staging", {})
+        loader_config = {}
+        if "truncate" in staging:
+            loader_config["load.truncate_staging_dataset"] = staging["truncate"]
+
+        destination_config = {}
+        if layout := staging.get("dataset_name_layout"):
+            destination_config["staging_dataset_name_layout"] = layout
+        destination = dlt.destinations.snowflake(**destination_config)
 
         pipeline = dlt.pipeline(
             pipeline_name=sanitized_name,
-            destination="snowflake",
+            pipelines_dir=pipelines_dir,
+            destination=destination,
             dataset_name=schema_name,
             progress="log",
         )
@@ -346,6 +491,10 @@ class Factory:
         ) -> Generator[DltEventType, Any]:
             """Invoke the dlt pipeline and stream structured event data.
 
+                The pipeline working directory is locked for the duration of the run
+                so that concurrent runs do not corrupt the persisted schema and state,
+                and completed load packages are evicted before the lock is released.
+
                 Args:
                     context: Dagster execution context supplying runtime configuration.
                     dlt: Dagster resource for executing the dlt pipeline.
@@ -355,7 +504,12 @@ class Factory:
                         emitted from the dlt pipeline run which Dagster converts into
                         asset materialize events.
             """
-            yield from dlt.run(context=context) # pragma: no cover
+            with ( # pragma: no cover
+                pipeline_lock(pipelines_dir, sanitized_name),
+                pipeline_config(sanitized_name, loader_config),
+            ):
+                yield from dlt.run(context=context)
+                evict_load_packages(Path(pipeline.working_dir))
 
         return assets
 
@@ -0,0 +1,198 @@
+"""Disk backed HTTP response cache for dlt data generators during development.
+
+Iterating on a dlt source re-requests the same API pages on every materialization,
+which is slow and can trip rate limits. :class:`CachedSession` is a drop in
+``requests.Session`` that stores successful ``GET`` responses on disk keyed by the
+request URL and parameters, and serves them until they expire.
+
+The factory hands a :class:`CachedSession` to any data generator that accepts a
+``session`` keyword argument when the cache is enabled for the resource. The cache is
+enabled by the ``http_cache`` property of a resource in ``sources.yaml`` when ``TARGET``
+is ``dev``, and the ``DLT_HTTP_CACHE`` environment variable can force it on or off
+outside of ``prod``:
+
+.. code-block:: yaml
+
+    resources:
+        exchange_rate.usd:
+            entry: data.get_exchange_rate
+            arguments: [usd]
+            http_cache:
+                ttl_seconds: 3600
+                max_bytes: 104857600
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import requests
+from data_platform_utils.helpers import sanitize_input_signature
+from requests.structures import CaseInsensitiveDict
+
+HTTP_CACHE_ENV = "DLT_HTTP_CACHE"
+HTTP_CACHE_DIR_ENV = "DLT_HTTP_CACHE_DIR"
+
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_MAX_BYTES = 100 * 1024**2
+
+
+class CachedSession(requests.Session):
+    """A ``requests.Session`` that serves repeated ``GET`` requests from disk.
+
+    Args:
+        cache_dir: Folder where cached responses are stored.
+        ttl_seconds: Age after which a cached response is fetched again.
+        max_bytes: Size budget for the cache folder, the oldest responses are evicted
+            first once it is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        super().__init__()
+        self.cache_dir = Path(cache_dir or get_cache_dir())
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    def request(
+        self, method: str | bytes, url: str | bytes, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        """Return a cached response for ``GET`` requests when a fresh one exists,
+        otherwise send the request and store a successful response.
+        """
+        method = method.decode() if isinstance(method, bytes) else method
+        if method.upper() != "GET":
+            return super().request(method, url, *args, **kwargs)
+
+        cache_path = self.cache_dir.joinpath(
+            self.get_cache_key(url, kwargs.get("params")) + ".json"
+        )
+        if response := self._read(cache_path):
+            return response
+
+        response = super().request(method, url, *args, **kwargs)
+        if response.ok:
+            self._write(cache_path, response)
+            self._evict()
+        return response
+
+    @staticmethod
+    def get_cache_key(url: str | bytes, params: Any = None) -> str:
+        """Return a stable key for a request built from its URL and parameters.
+
+        Args:
+            url: The requested URL.
+            params: Query parameters that will be encoded into the URL.
+
+        Returns:
+            str: Hex digest that identifies the request.
+        """
+        url = url.decode() if isinstance(url, bytes) else url
+        prepared_url = requests.Request("GET", url, params=params).prepare().url or url
+        return hashlib.sha256(prepared_url.encode()).hexdigest()
+
+    def _read(self, cache_path: Path) -> requests.Response | None:
+        """Load a cached response if it exists and has not expired."""
+        try:
+            with open(cache_path) as file:
+                cached = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - cached["created_at"] > self.ttl_seconds:
+            return None
+
+        response = requests.Response()
+        response.status_code = cached["status_code"]
+        response.url = cached["url"]
+        response.encoding = cached["encoding"]
+        response.headers = CaseInsensitiveDict(cached["headers"])
+        response._content = base64.b64decode(cached["content"])
+        response.from_cache = True  # type: ignore[attr-defined]
+        return response
+
+    def _write(self, cache_path: Path, response: requests.Response) -> None:
+        """Store a response on disk along with the time it was fetched."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached = {
+            "created_at": time.time(),
+            "status_code": response.status_code,
+            "url": response.url,
+            "encoding": response.encoding,
+            "headers": dict(response.headers),
+            "content": base64.b64encode(response.content).decode(),
+        }
+        with open(cache_path, "w") as file:
+            json.dump(cached, file)
+
+    def _evict(self) -> None:
+        """Remove the oldest cached responses until the cache fits its size budget."""
+        cached_files = sorted(
+            self.cache_dir.glob("*.json"), key=lambda path: path.stat().st_mtime
+        )
+        total_bytes = sum(path.stat().st_size for path in cached_files)
+        for path in cached_files:
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+
+def get_cache_dir() -> Path:
+    """Return the folder used to store cached responses.
+
+    Returns:
+        Path: The folder set by ``DLT_HTTP_CACHE_DIR``, or a folder in the user cache
+            directory when the variable is not set.
+    """
+    if cache_dir := os.getenv(HTTP_CACHE_DIR_ENV):
+        return Path(cache_dir)
+    return Path.home().joinpath(".cache", "dlt_http_cache")
+
+
+def get_cached_session(config: dict) -> CachedSession | None:
+    """Return a cached session for a resource config when caching is enabled.
+
+    Caching applies when the resource declares ``http_cache`` and the ``TARGET`` is
+    ``dev``. ``DLT_HTTP_CACHE`` overrides both, ``true`` enables the cache for every
+    resource and ``false`` disables it. The cache can serve stale responses, so it is
+    never enabled when the ``TARGET`` is ``prod``.
+
+    Args:
+        config: A resource config, optionally containing an ``http_cache`` property
+            that is either ``true`` or a mapping of :class:`CachedSession` arguments.
+
+    Returns:
+        CachedSession | None: A configured session, or ``None`` if caching is disabled.
+
+    Raises:
+        ValueError: If ``DLT_HTTP_CACHE`` enables the cache while the ``TARGET`` is
+            ``prod``.
+    """
+    cache_config = config.get("http_cache")
+    target = os.getenv("TARGET", "").lower()
+    enabled = bool(cache_config) and target == "dev"
+
+    override = os.getenv(HTTP_CACHE_ENV, "").lower()
+    if override in ("true", "1"):
+        if target == "prod":
+            raise ValueError(f"{HTTP_CACHE_ENV} can not enable the HTTP cache in prod, "
+                             "cached responses would be loaded into production.")
+        enabled = True
+    elif override in ("false", "0"):
+        enabled = False
+
+    if not enabled:
+        return None
+
+    if not isinstance(cache_config, dict):
+        cache_config = {}
+    return CachedSession(**sanitize_input_signature(CachedSession, cache_config))
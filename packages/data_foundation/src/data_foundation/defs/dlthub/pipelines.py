@@ -0,0 +1,164 @@
+"""Helpers for persisting dlt pipeline working directories between runs.
+
+dlt keeps a working directory per pipeline holding the pipeline state, the inferred
+schemas, and the load packages produced by each run. Pointing that directory at
+persistent storage lets a run reuse the schema and state from the previous run instead
+of restoring them from the destination, while the lock and eviction helpers keep
+concurrent runs safe and the completed load packages from growing without bound.
+
+The behaviour is configured with environment variables:
+
+- ``DLT_PIPELINES_DIR``: root folder for pipeline working directories, typically a
+  fast local disk or a shared volume. Defaults to the dlt default location.
+- ``DLT_PIPELINES_MAX_LOADED_BYTES``: size budget for completed load packages kept
+  per pipeline. Defaults to 1 GiB.
+- ``DLT_PIPELINES_MAX_LOADED_AGE_SECONDS``: completed load packages older than this
+  are always evicted. Defaults to 7 days.
+
+The lock relies on ``fcntl.flock``, which is only reliable on a local filesystem.
+On NFS and most other network or shared volumes the lock may not be honoured across
+hosts, so point ``DLT_PIPELINES_DIR`` at a local disk, or make sure a pipeline only
+ever runs on one host at a time.
+"""
+
+import fcntl
+import os
+import shutil
+import time
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import dlt
+from dlt.common.pipeline import get_dlt_pipelines_dir
+
+PIPELINES_DIR_ENV = "DLT_PIPELINES_DIR"
+MAX_LOADED_BYTES_ENV = "DLT_PIPELINES_MAX_LOADED_BYTES"
+MAX_LOADED_AGE_ENV = "DLT_PIPELINES_MAX_LOADED_AGE_SECONDS"
+
+DEFAULT_MAX_LOADED_BYTES = 1024**3
+DEFAULT_MAX_LOADED_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+def get_pipelines_dir() -> str:
+    """Return the root folder that holds the dlt pipeline working directories.
+
+    Returns:
+        str: The folder set by ``DLT_PIPELINES_DIR``, or the dlt default location when
+            the variable is not set.
+    """
+    return os.getenv(PIPELINES_DIR_ENV) or get_dlt_pipelines_dir()
+
+
+@contextmanager
+def pipeline_lock(pipelines_dir: str, pipeline_name: str) -> Generator[Path]:
+    """Hold an exclusive lock on a pipeline working directory.
+
+    Concurrent runs of the same pipeline would otherwise write to the same state file
+    and load package folders. The lock blocks until any other holder releases it, and
+    is released automatically if the process dies. ``fcntl.flock`` is not reliable on
+    NFS or other shared volumes, where runs on different hosts may both acquire it.
+
+    Args:
+        pipelines_dir: Root folder holding the pipeline working directories.
+        pipeline_name: Name of the pipeline to lock.
+
+    Yields:
+        Path: The path of the lock file being held.
+    """
+    lock_dir = Path(pipelines_dir, ".locks")
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    lock_path = lock_dir.joinpath(f"{pipeline_name}.lock")
+
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield lock_path
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def pipeline_config(pipeline_name: str, values: Mapping[str, Any]) -> Generator[None]:
+    """Set config values scoped to one pipeline for the duration of a run.
+
+    Some dlt options, such as ``load.truncate_staging_dataset``, are only read from the
+    config providers. The values are set under the pipeline name when the run starts
+    rather than when the definitions load, so other pipelines are not affected, and the
+    previous values are restored when the run ends. Use it while holding the pipeline
+    lock, so concurrent runs of the same pipeline do not overwrite each other.
+
+    Args:
+        pipeline_name: Name of the pipeline the values apply to.
+        values: Config values keyed by their dotted path, such as
+            ``load.truncate_staging_dataset``.
+    """
+    provider = dlt.config.writable_provider
+    previous = {}
+    for path, value in values.items():
+        *sections, key = path.split(".")
+        previous[path] = provider.get_value(key, Any, pipeline_name, *sections)[0]
+        provider.set_value(key, value, pipeline_name, *sections)
+    try:
+        yield
+    finally:
+        for path, value in previous.items():
+            *sections, key = path.split(".")
+            provider.set_value(key, value, pipeline_name, *sections)
+
+
+def evict_load_packages(
+    pipeline_dir: Path,
+    max_bytes: int | None = None,
+    max_age_seconds: float | None = None,
+) -> list[Path]:
+    """Delete completed load packages so the working directory stays within budget.
+
+    Packages older than ``max_age_seconds`` are always removed. The remaining packages
+    are then removed least recently used first until their total size is within
+    ``max_bytes``. Pending packages, schemas, and state are never touched.
+
+    Args:
+        pipeline_dir: The working directory of a single pipeline.
+        max_bytes: Size budget for completed load packages. Defaults to the value of
+            ``DLT_PIPELINES_MAX_LOADED_BYTES``.
+        max_age_seconds: Maximum age of a completed load package. Defaults to the value
+            of ``DLT_PIPELINES_MAX_LOADED_AGE_SECONDS``.
+
+    Returns:
+        list[Path]: The load package folders that were removed.
+    """
+    if max_bytes is None:
+        max_bytes = int(os.getenv(MAX_LOADED_BYTES_ENV, DEFAULT_MAX_LOADED_BYTES))
+    if max_age_seconds is None:
+        max_age_seconds = float(
+            os.getenv(MAX_LOADED_AGE_ENV, DEFAULT_MAX_LOADED_AGE_SECONDS)
+        )
+
+    loaded_dir = Path(pipeline_dir, "load", "loaded")
+    if not loaded_dir.is_dir():
+        return []
+
+    packages = sorted(
+        (package for package in loaded_dir.iterdir() if package.is_dir()),
+        key=lambda package: package.stat().st_mtime,
+    )
+    sizes = {package: _get_size(package) for package in packages}
+    total_bytes = sum(sizes.values())
+    cutoff = time.time() - max_age_seconds
+
+    evicted = []
+    for package in packages:
+        if package.stat().st_mtime >= cutoff and total_bytes <= max_bytes:
+            break
+        shutil.rmtree(package, ignore_errors=True)
+        total_bytes -= sizes[package]
+        evicted.append(package)
+
+    return evicted
+
+
+def _get_size(path: Path) -> int:
+    """Return the combined size in bytes of all files below a folder."""
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
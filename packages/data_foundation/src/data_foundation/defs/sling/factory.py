@@ -1,6 +1,7 @@
 """Factory helpers for translating Sling YAML configs into Dagster definitions."""
 
-from collections.abc import Generator
+import json
+from collections.abc import Generator, Iterable
 from datetime import timedelta
 from functools import cache
 from pathlib import Path
@@ -9,7 +10,10 @@ from typing import Any
 import dagster as dg
 import yaml
 from dagster_sling import SlingConnectionResource, SlingResource, sling_assets
-from dagster_sling.sling_event_iterator import SlingEventType
+from dagster_sling.sling_event_iterator import (
+    SlingEventType,
+    _get_target_table_name,
+)
 from data_platform_utils.helpers import (
     get_nested,
     get_schema_name,
@@ -19,6 +23,9 @@ from data_platform_utils.secrets import get_secret
 
 from .translator import CustomDagsterSlingTranslator
 
+# read by the dbt snapshot precheck to tell whether a raw table changed
+MAX_UPDATE_KEY_METADATA_KEY = "max_update_key"
+
 
 class Factory:
     """Factory to generate Dagster definitions from Sling YAML config files."""
@@ -204,16 +211,78 @@ class Factory:
                 
                 config["defaults"]["source_options"]["range"] = f"{start},{end}"
 
-            yield from sling.replicate(
+            events = sling.replicate(
                 context=context,
                 replication_config=config,
                 dagster_sling_translator=CustomDagsterSlingTranslator()
             )
+            yield from Factory._add_change_metadata(context, sling, config, events)
             for row in sling.stream_raw_logs():
                 context.log.info(row)
 
         return assets
 
+    @staticmethod
+    def _add_change_metadata(
+        context: dg.AssetExecutionContext,
+        sling: SlingResource,
+        replication_config: dict,
+        events: Iterable[SlingEventType],
+    ) -> Generator[SlingEventType, Any]:
+        """Record the row count and the latest ``update_key`` of each replicated table.
+
+        Both are read with a single aggregate query on the target, which Snowflake
+        answers from table metadata. Downstream snapshots compare them with the
+        values seen on their last run to decide whether anything changed.
+
+        Args:
+            context: Dagster execution context used for logging.
+            sling: Sling resource that ran the replication.
+            replication_config: Sling replication configuration dictionary.
+            events: Materialization events streamed from the replication.
+
+        Yields:
+            dagster_sling.sling_event_iterator.SlingEventType: The events, with
+                ``dagster/row_count`` and ``max_update_key`` metadata added for
+                streams with an ``update_key``.
+        """
+        defaults = replication_config.get("defaults") or {}
+        for event in events:
+            stream_name = event.metadata.get("stream_name")
+            stream_name = getattr(stream_name, "value", stream_name)
+            stream_config = (
+                replication_config.get("streams", {}).get(stream_name) or {}
+            )
+            update_key = stream_config.get("update_key") or defaults.get("update_key")
+            table_name = stream_name and _get_target_table_name(stream_name, sling)
+            if not update_key or not table_name:
+                yield event
+                continue
+
+            try:
+                output = sling.run_sling_cli(
+                    ["conns", "exec", replication_config["target"],
+                     f"select count(*), max({update_key}) from {table_name}"],
+                    force_json=True,
+                )
+                row_count, max_update_key = sling._parse_json_table_output(
+                    json.loads(output.strip())
+                )[0].values()
+            except Exception as e:
+                context.log.warning(
+                    f"Failed to fetch change metadata for '{stream_name}': {e}"
+                )
+                yield event
+                continue
+
+            yield event._replace(metadata={
+                **event.metadata,
+                "dagster/row_count": int(row_count),
+                MAX_UPDATE_KEY_METADATA_KEY: (
+                    None if max_update_key is None else str(max_update_key)
+                ),
+            })
+
     @staticmethod
     def _set_schema(replication_config: dict) -> dict:
         """Override destination schemas with user-specific suffixes when configured.
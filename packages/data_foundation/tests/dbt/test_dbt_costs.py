@@ -0,0 +1,73 @@
+import unittest
+
+import dagster as dg
+from dagster_dbt.asset_utils import DAGSTER_DBT_UNIQUE_ID_METADATA_KEY
+from data_foundation.defs.dbt.costs import (
+    build_cost_attribution_asset,
+    get_cost_metadata,
+    get_unique_id_asset_keys,
+)
+
+
+def row(unique_id, credits, elapsed_ms, bytes_scanned):
+    return {
+        "QUERY_TEXT": "select 1 -- snowflake_dagster_dbt_v1_opaque_id"
+            f"[[[{unique_id}:inv]]]",
+        "TOTAL_ELAPSED_TIME": elapsed_ms,
+        "BYTES_SCANNED": bytes_scanned,
+        "CREDITS_USED_CLOUD_SERVICES": 0,
+        "CREDITS_ATTRIBUTED_COMPUTE": credits,
+    }
+
+
+class TestCosts(unittest.TestCase):
+
+    def setUp(self):
+        self.assets_def = dg.multi_asset(name="dbt_assets", specs=[
+            dg.AssetSpec(["common", "fct_orders"], metadata={
+                DAGSTER_DBT_UNIQUE_ID_METADATA_KEY: "model.p.fct_orders"}),
+            dg.AssetSpec(["common", "dim_users"], metadata={
+                DAGSTER_DBT_UNIQUE_ID_METADATA_KEY: "model.p.dim_users"}),
+            dg.AssetSpec(["other"]),
+        ])(lambda: None)
+        self.rows = [
+            row("model.p.fct_orders", 1.0, 60000, 100),
+            row("model.p.fct_orders", 0.5, 30000, 50),
+            row("model.p.dim_users", 2.0, 1000, 10),
+            {"QUERY_TEXT": "select 1", "CREDITS_ATTRIBUTED_COMPUTE": 10},
+        ]
+
+    def test_get_unique_id_asset_keys(self):
+        self.assertEqual(get_unique_id_asset_keys([self.assets_def]), {
+            "model.p.fct_orders": "common/fct_orders",
+            "model.p.dim_users": "common/dim_users",
+        })
+
+    def test_get_cost_metadata(self):
+        asset_keys = get_unique_id_asset_keys([self.assets_def])
+
+        metadata = get_cost_metadata(self.rows, asset_keys)
+
+        self.assertEqual(metadata["total_credits"], 3.5)
+        self.assertEqual(metadata["total_elapsed_seconds"], 91)
+        self.assertEqual(metadata["attributed_queries"], 3)
+        records = metadata["cost_by_asset"].records
+        self.assertEqual([record.data["key"] for record in records],
+                         ["common/dim_users", "common/fct_orders"])
+        self.assertEqual(records[1].data["query_count"], 2)
+
+    def test_get_cost_metadata_ranked_by_elapsed_time(self):
+        metadata = get_cost_metadata(self.rows, {}, rank_by="elapsed_seconds", top_n=1)
+
+        records = metadata["cost_by_node"].records
+        self.assertEqual([record.data["key"] for record in records],
+                         ["model.p.fct_orders"])
+
+    def test_build_cost_attribution_asset(self):
+        asset = build_cost_attribution_asset([self.assets_def])
+        self.assertEqual(asset.key, dg.AssetKey(["dbt", "cost_attribution"]))
+        self.assertIn("snowflake", asset.required_resource_keys)
+
+
+if __name__ == "__main__": # pragma: no coverage
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import dagster as dg
+from dagster_dbt import DagsterDbtTranslator
+from data_foundation.defs.dbt.deferred_checks import (
+    DEFERRED_CHECKS_SENSOR_NAME,
+    build_deferred_checks_sensor,
+    get_deferred_check_keys,
+    get_excluded_tests,
+    is_deferred_test,
+)
+from data_foundation.defs.dbt.factory import DbtConfig
+from data_foundation.defs.dbt.translator import CustomDagsterDbtTranslator
+
+
+class TestDeferredChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.hits = dg.AssetKey(["adobe_experience", "stg", "hits"])
+        self.assets_def = dg.multi_asset(
+            name="dbt_assets",
+            specs=[dg.AssetSpec(self.hits, skippable=True)],
+            check_specs=[
+                dg.AssetCheckSpec("not_null_hit_id", asset=self.hits, metadata={
+                    "dagster_dbt/unique_id": "test.p.not_null_hit_id"}),
+                dg.AssetCheckSpec("row_count_delta", asset=self.hits, metadata={
+                    "dagster_dbt/unique_id": "test.p.row_count_delta",
+                    "dbt_deferred_check": True}),
+            ],
+            can_subset=True,
+        )(lambda: None)
+        self.deferred_key = dg.AssetCheckKey(self.hits, "row_count_delta")
+
+        self.context = MagicMock()
+        self.context.assets_def = self.assets_def
+        self.context.selected_asset_keys = {self.hits}
+        self.context.selected_asset_check_keys = set(self.assets_def.check_keys)
+
+    def test_is_deferred_test(self):
+        self.assertFalse(is_deferred_test({"config": {"severity": "ERROR"}}))
+        self.assertTrue(is_deferred_test({"config": {"severity": "warn"}}))
+        self.assertTrue(is_deferred_test({"config": {
+            "severity": "error", "meta": {"dagster": {"deferred": True}}}}))
+
+    def test_get_deferred_check_keys(self):
+        self.assertEqual(get_deferred_check_keys([self.assets_def]),
+                         {self.deferred_key: "test.p.row_count_delta"})
+
+    def test_excludes_deferred_tests_of_materialized_assets(self):
+        self.assertEqual(get_excluded_tests(self.context), ["test.p.row_count_delta"])
+
+    def test_disabled_by_default(self):
+        self.assertFalse(DbtConfig().defer_checks)
+
+    def test_check_only_runs_exclude_nothing(self):
+        self.context.selected_asset_keys = set()
+        self.assertEqual(get_excluded_tests(self.context), [])
+
+    def test_build_deferred_checks_sensor(self):
+        sensor, = build_deferred_checks_sensor([self.assets_def])
+        self.assertEqual(sensor.name, DEFERRED_CHECKS_SENSOR_NAME)
+        self.assertEqual(sensor.run_tags, {"dagster/priority": "-1"})
+
+    def test_no_sensor_without_deferred_checks(self):
+        assets_def = dg.multi_asset(name="a", specs=[dg.AssetSpec("a")])(lambda: None)
+        self.assertEqual(build_deferred_checks_sensor([assets_def]), [])
+
+
+class TestTranslatorDeferredChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.base_spec = dg.AssetCheckSpec(
+            "accepted_values", asset="hits", blocking=False,
+            metadata={"dagster_dbt/unique_id": "test.p.accepted_values"})
+        self.manifest = {"nodes": {
+            "test.p.accepted_values": {"config": {"severity": "warn"}}}}
+
+    def get_spec(self, translator):
+        with patch.object(DagsterDbtTranslator, "get_asset_check_spec",
+                          return_value=self.base_spec):
+            return translator.get_asset_check_spec(
+                dg.AssetSpec("hits"), self.manifest, "test.p.accepted_values", None)
+
+    def test_marks_deferred_tests(self):
+        spec = self.get_spec(CustomDagsterDbtTranslator(
+            defer_non_blocking_checks=True))
+
+        self.assertTrue(spec.metadata["dbt_deferred_check"])
+        self.assertIsNotNone(spec.automation_condition)
+        self.assertFalse(spec.blocking)
+
+    def test_keeps_tests_inline_by_default(self):
+        self.assertIs(self.get_spec(CustomDagsterDbtTranslator()), self.base_spec)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,14 +8,16 @@ FACTORY = "data_foundation.defs.dbt.factory.Factory"
 
 class TestDefinitions(unittest.TestCase):
 
+    @patch("data_foundation.defs.dbt.definitions.prepare_parse_artifacts")
     @patch(f"{FACTORY}.build_definitions")
-    def test_defs(self, mock_build_definitions: Mock):
+    def test_defs(self, mock_build_definitions: Mock, mock_prepare: Mock):
         mock_build_definitions.return_value = dg.Definitions()
         defs()
         mock_build_definitions.assert_called_once()
         args, kwargs = mock_build_definitions.call_args
         dbt_project = args[0]()
         self.assertIsNotNone(dbt_project)
+        mock_prepare.assert_called_once_with(dbt_project)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+import json
+import unittest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import dagster as dg
+from dagster_dbt.asset_utils import DAGSTER_DBT_UNIQUE_ID_METADATA_KEY
+from data_foundation.defs.dbt.dynamic_tables import (
+    RefreshHistoryStub,
+    build_dynamic_table_sensor,
+    get_dynamic_tables,
+    get_refresh_history_sql,
+    get_refresh_observations,
+    parse_target_lag,
+)
+
+
+class TestDynamicTables(unittest.TestCase):
+
+    def setUp(self):
+        self.manifest = {
+            "nodes": {
+                "model.p.fct_transactions": {
+                    "relation_name": "analytics.common.fct_transactions",
+                    "config": {
+                        "materialized": "dynamic_table", "target_lag": "24 hour"},
+                },
+                "model.p.stg_transactions": {
+                    "relation_name": "analytics.transaction_db.transactions",
+                    "config": {"materialized": "incremental"},
+                },
+            }
+        }
+        self.asset_key = dg.AssetKey(["common", "fct", "transactions"])
+        self.asset_keys = {"analytics.common.fct_transactions": self.asset_key}
+        self.started = datetime(2025, 1, 1, 6, tzinfo=UTC)
+
+    def row(self, data_timestamp, refresh_action="INCREMENTAL"):
+        return {
+            "QUALIFIED_NAME": '"ANALYTICS"."COMMON"."FCT_TRANSACTIONS"',
+            "STATE": "SUCCEEDED",
+            "REFRESH_ACTION": refresh_action,
+            "DATA_TIMESTAMP": data_timestamp,
+            "REFRESH_START_TIME": self.started,
+            "REFRESH_END_TIME": self.started + timedelta(seconds=30),
+            "QUERY_ID": "01",
+            "STATISTICS": json.dumps({"numInsertedRows": 10, "numDeletedRows": 2}),
+        }
+
+    def test_get_dynamic_tables(self):
+        self.assertEqual(get_dynamic_tables(self.manifest), {
+            "model.p.fct_transactions": {
+                "relation": "analytics.common.fct_transactions",
+                "target_lag": "24 hour",
+            }
+        })
+
+    def test_get_refresh_history_sql(self):
+        sql = get_refresh_history_sql(
+            ["analytics.common.a", "analytics.common.b"], self.started)
+        self.assertEqual(sql.count("analytics.information_schema"), 2)
+        self.assertIn("'2025-01-01 06:00:00'", sql)
+
+    def test_get_refresh_observations(self):
+        rows = [
+            self.row(self.started),
+            self.row(self.started - timedelta(hours=1)),
+            self.row(self.started - timedelta(hours=2), refresh_action="NO_DATA"),
+        ]
+        cursor = {"analytics.common.fct_transactions": (
+            self.started - timedelta(hours=3)).isoformat()}
+
+        observations, cursor = get_refresh_observations(
+            rows, self.asset_keys, cursor)
+
+        self.assertEqual(len(observations), 2)
+        latest = observations[-1]
+        self.assertEqual(latest.asset_key, self.asset_key)
+        self.assertEqual(latest.tags["dagster/data_version"], self.started.isoformat())
+        self.assertEqual(latest.metadata["rows_inserted"].value, 10)
+        self.assertEqual(latest.metadata["refresh_seconds"].value, 30)
+        self.assertEqual(
+            cursor, {"analytics.common.fct_transactions": self.started.isoformat()})
+
+    def test_get_refresh_observations_skips_processed_refreshes(self):
+        cursor = {"analytics.common.fct_transactions": self.started.isoformat()}
+        observations, new_cursor = get_refresh_observations(
+            [self.row(self.started)], self.asset_keys, cursor)
+        self.assertEqual(observations, [])
+        self.assertEqual(new_cursor, cursor)
+
+    def test_parse_target_lag(self):
+        self.assertEqual(parse_target_lag("24 hour"), timedelta(hours=24))
+        self.assertEqual(parse_target_lag("90 seconds"), timedelta(seconds=90))
+        self.assertEqual(parse_target_lag("downstream"), timedelta(hours=1))
+
+    def test_stub_refreshes_on_target_lag(self):
+        stub = RefreshHistoryStub(get_dynamic_tables(self.manifest))
+        rows = stub.get_refresh_history(self.started - timedelta(days=1), self.started)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["data_timestamp"], datetime(2025, 1, 1, tzinfo=UTC))
+        self.assertEqual(stub.get_refresh_history(self.started, self.started), [])
+
+    def test_sensor_observes_stub_refreshes(self):
+        assets_def = dg.multi_asset(name="dbt_assets", specs=[
+            dg.AssetSpec(self.asset_key, metadata={
+                DAGSTER_DBT_UNIQUE_ID_METADATA_KEY: "model.p.fct_transactions"}),
+        ])(lambda: None)
+        sensor = build_dynamic_table_sensor(
+            self.manifest, [assets_def], use_stub=True)
+        context = dg.build_sensor_context(resources={"snowflake": MagicMock()})
+
+        result = sensor(context)
+
+        self.assertEqual(len(result.asset_events), 1)
+        self.assertEqual(result.asset_events[0].asset_key, self.asset_key)
+        cursor = json.loads(result.cursor)
+        self.assertIn("analytics.common.fct_transactions", cursor)
+
+        context = dg.build_sensor_context(
+            cursor=result.cursor, resources={"snowflake": MagicMock()})
+        self.assertEqual(sensor(context).asset_events, [])
+
+    def test_sensor_skips_without_dynamic_tables(self):
+        sensor = build_dynamic_table_sensor({"nodes": {}}, [], use_stub=True)
+        context = dg.build_sensor_context(resources={"snowflake": MagicMock()})
+        self.assertIsInstance(sensor(context), dg.SkipReason)
+
+
+if __name__ == "__main__":
+    unittest.main()
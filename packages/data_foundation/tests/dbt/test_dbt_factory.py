@@ -1,10 +1,19 @@
 # test_factory.py
 
+import json
+import os
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import dagster as dg
-from data_foundation.defs.dbt.factory import Factory
+from data_foundation.defs.dbt.constants import RUN_VARS_ENV
+from data_foundation.defs.dbt.factory import DbtConfig, Factory
+from data_foundation.defs.dbt.instrumentation import RUN_SUMMARY_ASSET_KEY
 
 
 class TestFactory(unittest.TestCase):
@@ -21,6 +30,7 @@ class TestFactory(unittest.TestCase):
 class TestBuildDefinitions(TestFactory):
 
     @patch("data_foundation.defs.dbt.factory.Factory._get_assets")
+    @patch("data_foundation.defs.dbt.factory.load_manifest")
     @patch("data_foundation.defs.dbt.factory.build_freshness_checks_from_dbt_assets")
     @patch("data_foundation.defs.dbt.factory.dg.build_sensor_for_freshness_checks")
     @patch("data_foundation.defs.dbt.factory.DbtCliResource")
@@ -29,10 +39,12 @@ class TestBuildDefinitions(TestFactory):
                 mock_dbt_cli_resource,
                 mock_build_sensor,
                 mock_build_freshness,
+                mock_load_manifest,
                 mock_get_assets,
             ):
         # Arrange
         Factory.build_definitions.cache_clear()
+        mock_load_manifest.return_value = {"nodes": {}}
         mock_get_assets.side_effect = [self.mock_assets_definition]*2
         mock_build_freshness.return_value = self.mock_freshness_checks
         mock_build_sensor.return_value = self.mock_sensor
@@ -44,9 +56,67 @@ class TestBuildDefinitions(TestFactory):
         # Assert
         self.assertIsInstance(definitions, dg.Definitions)
         self.assertIn("dbt", definitions.resources)
-        self.assertEqual(definitions.assets, [self.mock_assets_definition]*2)
+        self.assertIn("snowflake", definitions.resources)
+        self.assertEqual(definitions.assets[:2], [self.mock_assets_definition]*2)
+        self.assertEqual(definitions.assets[2].key,
+                         dg.AssetKey(["dbt", "cost_attribution"]))
+        self.assertEqual(definitions.assets[3].key,
+                         dg.AssetKey(["dbt", "privacy_retention"]))
         self.assertEqual(definitions.asset_checks, self.mock_freshness_checks)
-        self.assertEqual(definitions.sensors, [self.mock_sensor])
+        self.assertEqual(definitions.sensors[0], self.mock_sensor)
+        self.assertEqual(definitions.sensors[1].name, "dbt_dynamic_table_sensor")
+
+
+    @patch("data_foundation.defs.dbt.factory.Factory._get_assets")
+    @patch("data_foundation.defs.dbt.factory.load_manifest")
+    @patch("data_foundation.defs.dbt.factory.build_freshness_checks_from_dbt_assets")
+    @patch("data_foundation.defs.dbt.factory.dg.build_sensor_for_freshness_checks")
+    @patch("data_foundation.defs.dbt.factory.DbtCliResource")
+    def test_builds_sharded_definitions(
+                self,
+                mock_dbt_cli_resource,
+                mock_build_sensor,
+                mock_build_freshness,
+                mock_load_manifest,
+                mock_get_assets,
+            ):
+        # Arrange
+        Factory.build_definitions.cache_clear()
+        mock_load_manifest.return_value = {
+            "nodes": {
+                "model.project.stg_a": {
+                    "resource_type": "model",
+                    "package_name": "project",
+                    "fqn": ["project", "staging", "stg_a"],
+                    "group": "foundation",
+                },
+                "model.project.mrt_a": {
+                    "resource_type": "model",
+                    "package_name": "project",
+                    "fqn": ["project", "marts", "mrt_a"],
+                    "group": "marketing",
+                },
+            }
+        }
+        mock_get_assets.return_value = self.mock_assets_definition
+        mock_build_freshness.return_value = self.mock_freshness_checks
+        mock_build_sensor.return_value = self.mock_sensor
+
+        # Act
+        definitions = Factory.build_definitions(
+            self.mock_dbt_callable, shard_by="group")
+
+        # Assert
+        self.assertEqual(len(definitions.assets), 6)
+        shard_calls = mock_get_assets.call_args_list[1:]
+        self.assertEqual(
+            [call.args[0] for call in shard_calls],
+            ["dbt_non_partitioned_models__foundation",
+             "dbt_non_partitioned_models__marketing"],
+        )
+        self.assertEqual(shard_calls[0].kwargs["pool"], "dbt_foundation")
+        self.assertEqual(shard_calls[1].kwargs["select"],
+                         "fqn:project.marts.mrt_a")
 
 
 class TestGetAssets(TestFactory):
@@ -105,3 +175,934 @@ class TestGetAssets(TestFactory):
         def mock_assets_fn(context, dbt, config):
             return list(Factory._get_assets
                         .latest_args["inner_fn"](context, dbt, config))
+
+
+class TestGetUnmodifiedSelection(TestFactory):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.manifest = {
+            "nodes": {
+                "model.project.stg_a": {
+                    "checksum": {"checksum": "1"}, "config": {}, "depends_on": {}},
+                "model.project.mrt_a": {
+                    "checksum": {"checksum": "2"}, "config": {},
+                    "depends_on": {"nodes": ["model.project.stg_a"]}},
+                "model.project.stg_b": {
+                    "checksum": {"checksum": "3"}, "config": {}, "depends_on": {}},
+            }
+        }
+        state_manifest = json.loads(json.dumps(self.manifest))
+        state_manifest["nodes"]["model.project.stg_a"]["checksum"]["checksum"] = "0"
+
+        self.manifest_path = Path(self.test_dir, "manifest.json")
+        self.manifest_path.write_text(json.dumps(self.manifest))
+        self.state_path = Path(self.test_dir, "state")
+        self.state_path.mkdir()
+        self.state_path.joinpath("manifest.json").write_text(
+            json.dumps(state_manifest))
+
+        self.keys = {
+            unique_id: dg.AssetKey(unique_id.split(".")[-1])
+            for unique_id in self.manifest["nodes"]
+        }
+        self.context = MagicMock()
+        self.context.selected_asset_keys = set(self.keys.values())
+        self.context.assets_def.specs_by_key = {
+            key: dg.AssetSpec(key, metadata={"dagster_dbt/unique_id": unique_id})
+            for unique_id, key in self.keys.items()
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_skips_nodes_without_upstream_changes(self):
+        dbt_project = MagicMock()
+        dbt_project.manifest_path = self.manifest_path
+        dbt_project.state_path = self.state_path
+
+        unmodified = Factory._get_unmodified_selection(self.context, dbt_project)
+
+        self.assertEqual(
+            unmodified, {"model.project.stg_b": self.keys["model.project.stg_b"]})
+
+    def test_builds_everything_without_state(self):
+        dbt_project = MagicMock()
+        dbt_project.manifest_path = self.manifest_path
+        dbt_project.state_path = Path(self.test_dir, "missing")
+
+        unmodified = Factory._get_unmodified_selection(self.context, dbt_project)
+
+        self.assertEqual(unmodified, {})
+        self.context.log.warning.assert_called_once()
+
+    @patch("data_foundation.defs.dbt.factory.is_modified_only", True)
+    def test_env_default_only_applies_to_manual_runs(self):
+        self.context.run.tags = {}
+        self.assertTrue(Factory._is_modified_only(self.context, DbtConfig()))
+
+        for tag in ("dagster/from_automation_condition", "dagster/sensor_name",
+                    "dagster/schedule_name", "dagster/backfill"):
+            self.context.run.tags = {tag: "true"}
+            self.assertFalse(Factory._is_modified_only(self.context, DbtConfig()))
+            self.assertTrue(Factory._is_modified_only(
+                self.context, DbtConfig(modified_only=True)))
+
+    def test_disabled_by_default(self):
+        self.context.run.tags = {}
+        self.assertFalse(Factory._is_modified_only(self.context, DbtConfig()))
+
+
+class TestSkipUnchanged(TestFactory):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        manifest = {
+            "nodes": {
+                "model.project.stg_a": {
+                    "checksum": {"checksum": "1"}, "depends_on": {}},
+                "model.project.mrt_a": {
+                    "checksum": {"checksum": "2"},
+                    "depends_on": {"nodes": ["model.project.stg_a"]}},
+                "model.project.stg_b": {
+                    "checksum": {"checksum": "3"}, "depends_on": {}},
+            }
+        }
+        self.dbt_project = MagicMock()
+        self.dbt_project.manifest_path = Path(self.test_dir, "manifest.json")
+        self.dbt_project.manifest_path.write_text(json.dumps(manifest))
+
+        self.source_a = dg.AssetKey(["source", "raw", "a"])
+        self.source_b = dg.AssetKey(["source", "raw", "b"])
+        self.keys = {
+            unique_id: dg.AssetKey(unique_id.split(".")[-1])
+            for unique_id in manifest["nodes"]
+        }
+        stg_a, mrt_a, stg_b = self.keys.values()
+
+        self.instance = dg.DagsterInstance.ephemeral()
+        self.context = MagicMock()
+        self.context.instance = self.instance
+        self.context.selected_asset_keys = set(self.keys.values())
+        self.context.assets_def.asset_deps = {
+            stg_a: {self.source_a}, mrt_a: {stg_a}, stg_b: {self.source_b}
+        }
+        self.context.assets_def.specs_by_key = {
+            key: dg.AssetSpec(key, metadata={"dagster_dbt/unique_id": unique_id})
+            for unique_id, key in self.keys.items()
+        }
+        self.context.asset_key_for_output = lambda output_name: dg.AssetKey(
+            output_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def materialize(self, asset_key, fingerprints=None):
+        event = dg.AssetMaterialization(asset_key)
+        if fingerprints:
+            event = Factory._add_input_fingerprint(self.context, event, fingerprints)
+        self.instance.report_runless_asset_event(event)
+
+    def test_fingerprint_changes_with_upstream_materialization(self):
+        before = Factory._get_input_fingerprints(self.context, self.dbt_project)
+        self.materialize(self.source_a)
+        after = Factory._get_input_fingerprints(self.context, self.dbt_project)
+
+        stg_a, _, stg_b = self.keys.values()
+        self.assertNotEqual(before[stg_a], after[stg_a])
+        self.assertEqual(before[stg_b], after[stg_b])
+
+    def test_never_materialized_nodes_are_changed(self):
+        fingerprints = Factory._get_input_fingerprints(self.context, self.dbt_project)
+        unchanged = Factory._get_unchanged_selection(
+            self.context, self.dbt_project, fingerprints)
+        self.assertEqual(unchanged, {})
+
+    def test_skips_nodes_with_unchanged_inputs(self):
+        self.materialize(self.source_a)
+        self.materialize(self.source_b)
+        fingerprints = Factory._get_input_fingerprints(self.context, self.dbt_project)
+        for asset_key in self.keys.values():
+            self.materialize(asset_key, fingerprints)
+
+        # only source a receives new data, so its downstream models are rebuilt
+        self.materialize(self.source_a)
+        fingerprints = Factory._get_input_fingerprints(self.context, self.dbt_project)
+        unchanged = Factory._get_unchanged_selection(
+            self.context, self.dbt_project, fingerprints)
+
+        self.assertEqual(
+            unchanged, {"model.project.stg_b": self.keys["model.project.stg_b"]})
+
+    def test_chain_is_skipped_on_a_second_run(self):
+        self.materialize(self.source_a)
+        self.materialize(self.source_b)
+        stg_a, mrt_a, _ = self.keys.values()
+
+        # the first run builds stg_a before mrt_a, as dbt would
+        fingerprints = Factory._get_input_fingerprints(self.context, self.dbt_project)
+        for asset_key in self.keys.values():
+            self.materialize(asset_key, fingerprints)
+        # observations recorded by the factory do not change the inputs
+        for asset_key in self.keys.values():
+            self.instance.report_runless_asset_event(dg.AssetObservation(
+                asset_key, metadata={"dbt_skipped_reason": "inputs_unchanged"}))
+
+        fingerprints = Factory._get_input_fingerprints(self.context, self.dbt_project)
+        unchanged = Factory._get_unchanged_selection(
+            self.context, self.dbt_project, fingerprints)
+        self.assertEqual(set(unchanged.values()), set(self.keys.values()))
+
+        # a run selecting only mrt_a reads the fingerprint recorded on stg_a
+        self.context.selected_asset_keys = {mrt_a}
+        self.assertEqual(
+            Factory._get_input_fingerprints(self.context, self.dbt_project)[mrt_a],
+            fingerprints[mrt_a])
+
+    def test_fingerprint_uses_observed_data_versions(self):
+        before = Factory._get_input_fingerprints(self.context, self.dbt_project)
+        self.instance.report_runless_asset_event(dg.AssetObservation(
+            self.source_a, tags={"dagster/data_version": "1"}))
+        after = Factory._get_input_fingerprints(self.context, self.dbt_project)
+
+        stg_a, mrt_a, _ = self.keys.values()
+        self.assertNotEqual(before[stg_a], after[stg_a])
+        self.assertNotEqual(before[mrt_a], after[mrt_a])
+
+        self.instance.report_runless_asset_event(dg.AssetObservation(self.source_a))
+        self.assertEqual(
+            Factory._get_input_fingerprints(self.context, self.dbt_project), after)
+
+    def test_add_input_fingerprint_to_output(self):
+        event = dg.Output(None, output_name="stg_a", metadata={"rows": 1})
+        event = Factory._add_input_fingerprint(
+            self.context, event, {dg.AssetKey("stg_a"): "abc"})
+        self.assertEqual(event.metadata["dbt_input_fingerprint"].value, "abc")
+        self.assertEqual(event.metadata["rows"].value, 1)
+
+    def test_add_input_fingerprint_ignores_other_events(self):
+        event = dg.AssetObservation(dg.AssetKey("stg_a"))
+        self.assertIs(
+            Factory._add_input_fingerprint(
+                self.context, event, {dg.AssetKey("stg_a"): "abc"}),
+            event,
+        )
+
+
+class TestSkipDynamicTables(TestFactory):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        manifest = {
+            "nodes": {
+                "model.project.fct_a": {
+                    "relation_name": "analytics.common.fct_a",
+                    "config": {"materialized": "dynamic_table", "target_lag": "1 hour"},
+                },
+                "model.project.fct_b": {
+                    "relation_name": "analytics.common.fct_b",
+                    "config": {"materialized": "table"},
+                },
+            }
+        }
+        self.dbt_project = MagicMock()
+        self.dbt_project.manifest_path = Path(self.test_dir, "manifest.json")
+        self.dbt_project.manifest_path.write_text(json.dumps(manifest))
+
+        self.fct_a = dg.AssetKey("fct_a")
+        self.fct_b = dg.AssetKey("fct_b")
+        self.instance = dg.DagsterInstance.ephemeral()
+        self.context = MagicMock()
+        self.context.instance = self.instance
+        self.context.selected_asset_keys = {self.fct_a, self.fct_b}
+        self.context.assets_def.specs_by_key = {
+            key: dg.AssetSpec(key, code_version="v1", metadata={
+                "dagster_dbt/unique_id": f"model.project.{key.path[-1]}"})
+            for key in (self.fct_a, self.fct_b)
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def materialize(self, asset_key, code_version):
+        self.instance.report_runless_asset_event(dg.AssetMaterialization(
+            asset_key, tags={"dagster/code_version": code_version}))
+
+    def test_disabled_by_default(self):
+        self.assertFalse(DbtConfig().skip_dynamic_tables)
+
+    def test_never_materialized_dynamic_tables_are_built(self):
+        self.assertEqual(
+            Factory._get_unchanged_dynamic_tables(self.context, self.dbt_project), {})
+
+    def test_skips_unchanged_dynamic_tables(self):
+        self.materialize(self.fct_a, "v1")
+        self.materialize(self.fct_b, "v1")
+        self.assertEqual(
+            Factory._get_unchanged_dynamic_tables(self.context, self.dbt_project),
+            {"model.project.fct_a": self.fct_a},
+        )
+
+    def test_builds_changed_dynamic_tables(self):
+        self.materialize(self.fct_a, "v0")
+        self.assertEqual(
+            Factory._get_unchanged_dynamic_tables(self.context, self.dbt_project), {})
+
+
+class TestSkipUnchangedSeeds(TestFactory):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        manifest = {
+            "nodes": {
+                "seed.project.campaigns": {
+                    "resource_type": "seed",
+                    "original_file_path": "seeds/campaigns.csv",
+                    "config": {"column_types": {}},
+                },
+                "model.project.stg_a": {"resource_type": "model"},
+            }
+        }
+        self.dbt_project = MagicMock()
+        self.dbt_project.project_dir = self.test_dir
+        self.dbt_project.manifest_path = Path(self.test_dir, "manifest.json")
+        self.dbt_project.manifest_path.write_text(json.dumps(manifest))
+        self.csv = Path(self.test_dir, "seeds", "campaigns.csv")
+        self.csv.parent.mkdir()
+        self.csv.write_text("campaign_id,name\n1,spring\n")
+
+        self.campaigns = dg.AssetKey("campaigns")
+        self.stg_a = dg.AssetKey("stg_a")
+        self.instance = dg.DagsterInstance.ephemeral()
+        self.context = MagicMock()
+        self.context.instance = self.instance
+        self.context.selected_asset_keys = {self.campaigns, self.stg_a}
+        self.context.assets_def.specs_by_key = {
+            self.campaigns: dg.AssetSpec(self.campaigns, metadata={
+                "dagster_dbt/unique_id": "seed.project.campaigns"}),
+            self.stg_a: dg.AssetSpec(self.stg_a, metadata={
+                "dagster_dbt/unique_id": "model.project.stg_a"}),
+        }
+        self.context.asset_key_for_output = lambda output_name: dg.AssetKey(
+            output_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def materialize(self, seed_hashes):
+        event = Factory._add_seed_hash(
+            self.context, dg.AssetMaterialization(self.campaigns), seed_hashes)
+        self.instance.report_runless_asset_event(event)
+
+    def test_disabled_by_default(self):
+        self.assertFalse(DbtConfig().skip_unchanged_seeds)
+
+    def test_hashes_only_seeds(self):
+        seed_hashes = Factory._get_seed_hashes(self.context, self.dbt_project)
+        self.assertEqual(list(seed_hashes), [self.campaigns])
+
+    def test_hash_changes_with_file(self):
+        before = Factory._get_seed_hashes(self.context, self.dbt_project)
+        self.csv.write_text("campaign_id,name\n1,summer\n")
+        after = Factory._get_seed_hashes(self.context, self.dbt_project)
+        self.assertNotEqual(before, after)
+
+    def test_never_materialized_seeds_are_loaded(self):
+        seed_hashes = Factory._get_seed_hashes(self.context, self.dbt_project)
+        self.assertEqual(Factory._get_unchanged_seeds(self.context, seed_hashes), {})
+
+    def test_skips_unchanged_seeds(self):
+        self.materialize(Factory._get_seed_hashes(self.context, self.dbt_project))
+
+        seed_hashes = Factory._get_seed_hashes(self.context, self.dbt_project)
+        self.assertEqual(Factory._get_unchanged_seeds(self.context, seed_hashes),
+                         {"seed.project.campaigns": self.campaigns})
+
+        self.csv.write_text("campaign_id,name\n1,summer\n")
+        seed_hashes = Factory._get_seed_hashes(self.context, self.dbt_project)
+        self.assertEqual(Factory._get_unchanged_seeds(self.context, seed_hashes), {})
+
+    def test_add_seed_hash_to_output(self):
+        event = dg.Output(None, output_name="campaigns")
+        event = Factory._add_seed_hash(self.context, event, {self.campaigns: "abc"})
+        self.assertEqual(event.metadata["dbt_seed_hash"].value, "abc")
+
+
+class TestSnapshotPrecheck(TestFactory):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        manifest = {
+            "nodes": {
+                "snapshot.project.snp_a": {
+                    "name": "snp_a",
+                    "resource_type": "snapshot",
+                    "config": {"meta": {"dagster": {"snapshot_precheck": True}}},
+                },
+                "snapshot.project.snp_b": {
+                    "name": "snp_b", "resource_type": "snapshot", "config": {}},
+            }
+        }
+        self.dbt_project = MagicMock()
+        self.dbt_project.manifest_path = Path(self.test_dir, "manifest.json")
+        self.dbt_project.manifest_path.write_text(json.dumps(manifest))
+
+        self.source = dg.AssetKey(["source", "raw", "a"])
+        self.snp_a = dg.AssetKey("snp_a")
+        self.snp_b = dg.AssetKey("snp_b")
+        self.instance = dg.DagsterInstance.ephemeral()
+        self.context = MagicMock()
+        self.context.instance = self.instance
+        self.context.selected_asset_keys = {self.snp_a, self.snp_b}
+        self.context.assets_def.asset_deps = {
+            self.snp_a: {self.source}, self.snp_b: {self.source}}
+        self.context.assets_def.specs_by_key = {
+            key: dg.AssetSpec(key, metadata={
+                "dagster_dbt/unique_id": f"snapshot.project.{key.path[-1]}"})
+            for key in (self.snp_a, self.snp_b)
+        }
+        self.context.asset_key_for_output = lambda output_name: dg.AssetKey(
+            output_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def load(self, row_count, max_update_key):
+        self.instance.report_runless_asset_event(dg.AssetMaterialization(
+            self.source, metadata={
+                "dagster/row_count": row_count, "max_update_key": max_update_key}))
+
+    def snapshot(self, signals):
+        event = Factory._add_snapshot_change_signal(
+            self.context, dg.AssetMaterialization(self.snp_a), signals)
+        self.instance.report_runless_asset_event(event)
+
+    def test_disabled_by_default(self):
+        self.assertFalse(DbtConfig().snapshot_precheck)
+
+    def test_without_signal_compares_every_row(self):
+        self.assertEqual(
+            Factory._get_snapshot_prechecks(self.context, self.dbt_project),
+            ({}, {}, {}))
+
+    def test_first_run_records_signal(self):
+        self.load(10, "2025-01-01")
+        unchanged, watermarks, signals = Factory._get_snapshot_prechecks(
+            self.context, self.dbt_project)
+
+        self.assertEqual(unchanged, {})
+        self.assertEqual(watermarks, {})
+        self.assertEqual(signals, {self.snp_a: {"source/raw/a": {
+            "row_count": 10, "max_update_key": "2025-01-01"}}})
+
+    def test_skips_unchanged_source(self):
+        self.load(10, "2025-01-01")
+        _, _, signals = Factory._get_snapshot_prechecks(
+            self.context, self.dbt_project)
+        self.snapshot(signals)
+
+        unchanged, watermarks, _ = Factory._get_snapshot_prechecks(
+            self.context, self.dbt_project)
+
+        self.assertEqual(unchanged, {"snapshot.project.snp_a": self.snp_a})
+        self.assertEqual(watermarks, {})
+
+    def test_changed_source_uses_watermark(self):
+        self.load(10, "2025-01-01")
+        _, _, signals = Factory._get_snapshot_prechecks(
+            self.context, self.dbt_project)
+        self.snapshot(signals)
+        self.load(12, "2025-01-02")
+
+        unchanged, watermarks, _ = Factory._get_snapshot_prechecks(
+            self.context, self.dbt_project)
+
+        self.assertEqual(unchanged, {})
+        self.assertEqual(watermarks, {"snp_a": "2025-01-01"})
+
+
+class TestLoadedAtWatermark(TestFactory):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        manifest = {
+            "nodes": {
+                "model.project.stg_a": {
+                    "name": "stg_a",
+                    "relation_name": "analytics.raw.a",
+                    "config": {"materialized": "incremental"},
+                    "depends_on": {"macros": ["macro.project.loaded_at_watermark"]},
+                },
+                "model.project.stg_b": {
+                    "name": "stg_b",
+                    "relation_name": "analytics.raw.b",
+                    "config": {"materialized": "table"},
+                    "depends_on": {"macros": ["macro.project.loaded_at_watermark"]},
+                },
+            },
+            "macros": {
+                "macro.project.loaded_at_watermark": {"name": "loaded_at_watermark"},
+            },
+        }
+        self.dbt_project = MagicMock()
+        self.dbt_project.manifest_path = Path(self.test_dir, "manifest.json")
+        self.dbt_project.manifest_path.write_text(json.dumps(manifest))
+
+        self.stg_a = dg.AssetKey("stg_a")
+        self.stg_b = dg.AssetKey("stg_b")
+        self.instance = dg.DagsterInstance.ephemeral()
+        self.context = MagicMock()
+        self.context.instance = self.instance
+        self.context.selected_asset_keys = {self.stg_a, self.stg_b}
+        self.context.assets_def.specs_by_key = {
+            key: dg.AssetSpec(key, metadata={
+                "dagster_dbt/unique_id": f"model.project.{key.path[-1]}"})
+            for key in (self.stg_a, self.stg_b)
+        }
+        self.context.asset_key_for_output = lambda output_name: dg.AssetKey(
+            output_name)
+
+        self.snowflake = MagicMock()
+        self.cursor = (self.snowflake.get_connection.return_value.__enter__
+                       .return_value.cursor.return_value)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_first_run_has_no_watermark(self):
+        watermarks, targets = Factory._get_loaded_at_watermarks(
+            self.context, self.dbt_project)
+
+        self.assertEqual(watermarks, {})
+        self.assertEqual(targets, {self.stg_a: ("analytics.raw.a", None)})
+
+    def test_disabled_by_default(self):
+        self.assertFalse(DbtConfig().loaded_at_watermarks)
+
+    def test_records_and_passes_watermark(self):
+        self.cursor.fetchall.return_value = [(0, datetime(2025, 1, 1, 12, 30))]
+        _, targets = Factory._get_loaded_at_watermarks(self.context, self.dbt_project)
+        observations = Factory._get_loaded_at_observations(
+            self.context, self.snowflake, targets)
+        for observation in observations:
+            self.instance.report_runless_asset_event(observation)
+
+        self.cursor.execute.assert_called_with(
+            "select 0, max(_loaded_at) from analytics.raw.a", [])
+        self.assertEqual(observations[0].asset_key, self.stg_a)
+        self.assertEqual(
+            observations[0].metadata["dbt_loaded_at_watermark"].value,
+            "2025-01-01 12:30:00")
+
+        # later observations without a watermark do not hide it
+        self.instance.report_runless_asset_event(dg.AssetObservation(self.stg_a))
+        watermarks, targets = Factory._get_loaded_at_watermarks(
+            self.context, self.dbt_project)
+        self.assertEqual(watermarks, {"stg_a": "2025-01-01 12:30:00"})
+
+        Factory._get_loaded_at_observations(self.context, self.snowflake, targets)
+        self.cursor.execute.assert_called_with(
+            "select 0, max(_loaded_at) from analytics.raw.a "
+            "where _loaded_at >= %s::timestamp", ["2025-01-01 12:30:00"])
+
+    def test_batches_models_in_one_query(self):
+        self.cursor.fetchall.return_value = [(0, None), (1, "2025-01-02 00:00:00")]
+        observations = Factory._get_loaded_at_observations(
+            self.context, self.snowflake, {
+                self.stg_a: ("analytics.raw.a", "2025-01-01 00:00:00"),
+                self.stg_b: ("analytics.raw.b", None),
+            })
+
+        self.cursor.execute.assert_called_once_with(
+            "select 0, max(_loaded_at) from analytics.raw.a "
+            "where _loaded_at >= %s::timestamp\nunion all\n"
+            "select 1, max(_loaded_at) from analytics.raw.b",
+            ["2025-01-01 00:00:00"])
+        self.assertEqual([o.asset_key for o in observations], [self.stg_b])
+
+    def test_failed_query_records_nothing(self):
+        self.cursor.execute.side_effect = Exception("warehouse suspended")
+
+        observations = Factory._get_loaded_at_observations(
+            self.context, self.snowflake, {self.stg_a: ("a", None)})
+
+        self.assertEqual(observations, [])
+        self.context.log.warning.assert_called_once()
+
+    def test_no_targets_skip_the_query(self):
+        observations = Factory._get_loaded_at_observations(
+            self.context, self.snowflake, {})
+
+        self.assertEqual(observations, [])
+        self.snowflake.get_connection.assert_not_called()
+
+
+class TestPartitionChunks(TestFactory):
+
+    def setUp(self):
+        self.asset_key = dg.AssetKey("stg_hits")
+        self.partition_keys = [f"2024-01-0{day}" for day in range(1, 6)]
+        self.context = MagicMock()
+        self.context.partition_keys = self.partition_keys
+        self.context.assets_def.partitions_def = dg.DailyPartitionsDefinition(
+            start_date="2024-01-01")
+        self.context.selected_asset_keys = {self.asset_key}
+        self.context.asset_key_for_output = lambda output_name: self.asset_key
+        self.context.run.parent_run_id = None
+
+        self.run_vars = []
+
+        def cli(args, context, raise_on_error):
+            self.run_vars.append(json.loads(os.environ[RUN_VARS_ENV]))
+            return MagicMock(
+                stream=lambda: iter([dg.Output(None, output_name="stg_hits")]),
+                get_artifact=MagicMock(side_effect=FileNotFoundError),
+                get_error=lambda: None)
+
+        self.dbt = MagicMock()
+        self.dbt.cli.side_effect = cli
+
+    def get_config(self, **kwargs):
+        return DbtConfig(partition_chunk_size=2, **kwargs)
+
+    def test_get_partition_chunks(self):
+        self.assertEqual(Factory._get_partition_chunks(self.context, 2), [
+            ["2024-01-01", "2024-01-02"],
+            ["2024-01-03", "2024-01-04"],
+            ["2024-01-05"],
+        ])
+        self.assertEqual(Factory._get_partition_chunks(self.context, 0),
+                         [self.partition_keys])
+
+    def test_get_partition_vars(self):
+        dbt_vars = Factory._get_partition_vars(
+            self.context, ["2024-01-02", "2024-01-03"])
+        self.assertEqual(dbt_vars, {
+            "min_date": "2024-01-02 00:00:00",
+            "max_date": "2024-01-04 00:00:00",
+        })
+
+    def test_build_partition_chunks_runs_each_chunk(self):
+        events = list(Factory._build_partition_chunks(
+            self.context, self.dbt, ["build"], self.get_config()))
+
+        calls = self.dbt.cli.call_args_list
+        self.assertEqual([call.args[0][0] for call in calls], ["run", "run", "build"])
+        self.assertEqual(self.run_vars[-1]["min_date"], "2024-01-05 00:00:00")
+        self.assertFalse(any("--vars" in call.args[0] for call in calls))
+        self.assertNotIn(RUN_VARS_ENV, os.environ)
+
+        # the last chunk only materializes its own partitions
+        self.assertFalse(any(isinstance(event, dg.Output) for event in events))
+        self.assertEqual(sorted(event.partition for event in events),
+                         self.partition_keys)
+
+    def test_build_partition_chunks_single_chunk_yields_outputs(self):
+        events = list(Factory._build_partition_chunks(
+            self.context, self.dbt, ["build"], DbtConfig(partition_chunk_size=0)))
+
+        self.assertEqual(self.dbt.cli.call_count, 1)
+        self.assertIsInstance(events[-1], dg.Output)
+
+    def test_build_partition_chunks_rejects_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            list(Factory._build_partition_chunks(
+                self.context, self.dbt, ["build"],
+                self.get_config(partition_chunk_concurrency=0)))
+
+    @patch.dict(os.environ, {RUN_VARS_ENV: "{}"})
+    def test_cli_restores_run_vars(self):
+        Factory._cli(self.context, self.dbt, ["build"], {"min_date": "2024-01-01"})
+
+        self.assertEqual(self.run_vars, [{"min_date": "2024-01-01"}])
+        self.assertEqual(os.environ[RUN_VARS_ENV], "{}")
+
+    def test_cli_isolates_run_vars_of_concurrent_invocations(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(
+                lambda day: Factory._cli(
+                    self.context, self.dbt, ["build"], {"min_date": day}),
+                self.partition_keys))
+
+        self.assertCountEqual(
+            [run_vars["min_date"] for run_vars in self.run_vars], self.partition_keys)
+        self.assertNotIn(RUN_VARS_ENV, os.environ)
+
+    def test_build_partition_chunks_in_parallel(self):
+        list(Factory._build_partition_chunks(
+            self.context, self.dbt, ["build"],
+            self.get_config(partition_chunk_concurrency=2)))
+        self.assertEqual(self.dbt.cli.call_count, 3)
+
+    def test_parallel_chunk_failure_keeps_completed_partitions(self):
+        def cli(args, context, raise_on_error):
+            run_vars = json.loads(os.environ[RUN_VARS_ENV])
+            failed = run_vars["min_date"].startswith("2024-01-03")
+
+            def stream():
+                yield dg.Output(None, output_name="stg_hits")
+                if failed:
+                    raise RuntimeError("dbt process crashed")
+
+            return MagicMock(
+                stream=stream,
+                get_artifact=MagicMock(side_effect=FileNotFoundError),
+                get_error=lambda: None)
+
+        self.dbt.cli.side_effect = cli
+        events = []
+        with self.assertRaises(RuntimeError):
+            for event in Factory._build_partition_chunks(
+                    self.context, self.dbt, ["build"],
+                    self.get_config(partition_chunk_concurrency=2)):
+                events.append(event)
+
+        # both chunks report their partitions, the final chunk does not run
+        self.assertEqual(self.dbt.cli.call_count, 2)
+        self.assertEqual(sorted(event.partition for event in events),
+                         self.partition_keys[:4])
+
+    def test_full_refresh_only_rebuilds_first_chunk(self):
+        list(Factory._build_partition_chunks(
+            self.context, self.dbt, ["build", "--full-refresh"],
+            self.get_config(full_refresh=True)))
+
+        calls = self.dbt.cli.call_args_list
+        self.assertEqual(
+            ["--full-refresh" in call.args[0] for call in calls], [True, False, False])
+
+    @patch(f"{Factory.__module__}.Factory._get_completed_partitions")
+    def test_resume_skips_completed_chunks(self, mock_get_completed_partitions):
+        mock_get_completed_partitions.return_value = set(self.partition_keys[:2])
+
+        list(Factory._build_partition_chunks(
+            self.context, self.dbt, ["build"], self.get_config()))
+
+        calls = self.dbt.cli.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.run_vars[0]["min_date"], "2024-01-03 00:00:00")
+
+    @patch(f"{Factory.__module__}.Factory._get_completed_partitions")
+    def test_full_refresh_retry_resumes_on_rebuilt_tables(
+        self, mock_get_completed_partitions
+    ):
+        mock_get_completed_partitions.return_value = set(self.partition_keys[:2])
+
+        list(Factory._build_partition_chunks(
+            self.context, self.dbt, ["build", "--full-refresh"],
+            self.get_config(full_refresh=True)))
+
+        calls = self.dbt.cli.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(any("--full-refresh" in call.args[0] for call in calls))
+        self.assertEqual(self.run_vars[0]["min_date"], "2024-01-03 00:00:00")
+
+    def test_get_completed_partitions_follows_parent_runs(self):
+        def entry(partition):
+            return MagicMock(asset_materialization=dg.AssetMaterialization(
+                self.asset_key, partition=partition))
+
+        logs = {
+            "retry": [entry("2024-01-03")],
+            "original": [entry("2024-01-01"), entry("2024-01-02")],
+        }
+        parents = {"retry": "original", "original": None}
+        self.context.run.parent_run_id = "retry"
+        self.context.instance.all_logs.side_effect = (
+            lambda run_id, of_type: logs[run_id])
+        self.context.instance.get_run_by_id.side_effect = (
+            lambda run_id: MagicMock(parent_run_id=parents[run_id]))
+
+        self.assertEqual(Factory._get_completed_partitions(self.context),
+                         {"2024-01-01", "2024-01-02", "2024-01-03"})
+
+
+class TestAdaptive(TestFactory):
+
+    def setUp(self):
+        self.instance = dg.DagsterInstance.ephemeral()
+        self.keys = [dg.AssetKey("stg_a"), dg.AssetKey("stg_b"), dg.AssetKey("mrt_a")]
+        unique_ids = ["model.p.stg_a", "model.p.stg_b", "model.p.mrt_a"]
+
+        self.context = MagicMock()
+        self.context.instance = self.instance
+        self.context.selected_asset_keys = set(self.keys)
+        self.context.partition_keys = ["2024-01-01", "2024-01-02"]
+        self.context.assets_def.specs_by_key = {
+            key: dg.AssetSpec(key, metadata={
+                "dagster_dbt/unique_id": unique_id})
+            for key, unique_id in zip(self.keys, unique_ids, strict=True)
+        }
+        self.manifest = {"nodes": {
+            "model.p.stg_a": {"depends_on": {"nodes": []}},
+            "model.p.stg_b": {"depends_on": {"nodes": []}},
+            "model.p.mrt_a": {"depends_on": {"nodes": ["model.p.stg_a"]}},
+        }}
+        self.config = DbtConfig(
+            adaptive=True,
+            warehouses=["small", "medium", "large"],
+            warehouse_runtime_seconds=[60, 600],
+        )
+
+    def tearDown(self):
+        self.instance.dispose()
+
+    def materialize(self, asset_key, seconds):
+        self.instance.report_runless_asset_event(dg.AssetMaterialization(
+            asset_key, metadata={"Execution Duration": seconds * 10}))
+        self.instance.report_runless_asset_event(dg.AssetObservation(
+            asset_key, metadata={"dbt_execution_seconds": seconds}))
+        self.instance.report_runless_asset_event(dg.AssetObservation(
+            asset_key, metadata={"dbt_skipped_reason": "unmodified"}))
+
+    def test_get_warehouse_for_runtime(self):
+        warehouses = ["small", "medium", "large"]
+        self.assertEqual(
+            Factory._get_warehouse_for_runtime(10, warehouses, [60, 600]), "small")
+        self.assertEqual(
+            Factory._get_warehouse_for_runtime(60, warehouses, [60, 600]), "medium")
+        self.assertEqual(
+            Factory._get_warehouse_for_runtime(9000, warehouses, [60, 600]), "large")
+
+    @patch(f"{Factory.__module__}.load_manifest")
+    def test_adaptive_args(self, mock_load_manifest):
+        mock_load_manifest.return_value = self.manifest
+        self.materialize(self.keys[0], 20)
+        self.materialize(self.keys[2], 30)
+
+        args, dbt_vars = Factory._get_adaptive_args(
+            self.context, self.mock_project, self.config, {}, partitioned=False)
+
+        self.assertEqual(args, ["--threads", "2"])
+        self.assertEqual(dbt_vars, {"snowflake_warehouse": "small"})
+
+    @patch(f"{Factory.__module__}.load_manifest")
+    def test_adaptive_args_scale_with_partitions(self, mock_load_manifest):
+        mock_load_manifest.return_value = self.manifest
+        self.materialize(self.keys[0], 50)
+
+        _, dbt_vars = Factory._get_adaptive_args(
+            self.context, self.mock_project, self.config, {}, partitioned=True)
+
+        self.assertEqual(dbt_vars, {"snowflake_warehouse": "medium"})
+
+    def test_historical_runtime_falls_back_to_execution_duration(self):
+        self.instance.report_runless_asset_event(dg.AssetMaterialization(
+            self.keys[1], metadata={"Execution Duration": 12.5}))
+
+        self.assertEqual(
+            Factory._get_historical_runtime(self.context, [self.keys[1]]), 12.5)
+
+    @patch(f"{Factory.__module__}.load_manifest")
+    def test_adaptive_args_without_history(self, mock_load_manifest):
+        mock_load_manifest.return_value = self.manifest
+
+        args, dbt_vars = Factory._get_adaptive_args(
+            self.context, self.mock_project, self.config,
+            {"model.p.stg_b": None}, partitioned=False)
+
+        self.assertEqual(args, ["--threads", "1"])
+        self.assertEqual(dbt_vars, {})
+
+    def test_partition_vars_include_other_vars(self):
+        self.context.assets_def.partitions_def = dg.DailyPartitionsDefinition(
+            start_date="2024-01-01")
+
+        dbt_vars = Factory._get_partition_vars(
+            self.context, ["2024-01-01"], {"snowflake_warehouse": "large"})
+
+        self.assertEqual(dbt_vars["snowflake_warehouse"], "large")
+
+
+class TestStreamWithRunResults(TestFactory):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.context = MagicMock()
+        self.context.run.run_id = "run"
+        self.context.asset_key_for_output.return_value = dg.AssetKey("stg_hits")
+        self.output = dg.Output(
+            None, output_name="stg_hits", metadata={"unique_id": "model.p.stg_hits"})
+        self.invocation = MagicMock()
+        self.invocation.stream.return_value = iter([self.output])
+        self.invocation.target_path = Path(self.test_dir, "target", "abc")
+        self.invocation.get_artifact.return_value = {
+            "metadata": {"invocation_id": "inv"},
+            "elapsed_time": 2.0,
+            "results": [{
+                "unique_id": "model.p.stg_hits",
+                "status": "success",
+                "execution_time": 1.5,
+                "adapter_response": {"rows_affected": 10, "query_id": "q1"},
+            }],
+        }
+        self.invocation.get_error.return_value = None
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_streams_events_then_observes_run_results(self):
+        stream = Factory._stream_with_run_results(self.context, self.invocation)
+
+        # the output is yielded before the run results are read
+        self.assertIs(next(stream), self.output)
+        self.invocation.get_artifact.assert_not_called()
+
+        observation, summary = list(stream)
+        self.context.asset_key_for_output.assert_called_with("stg_hits")
+        self.assertEqual(observation.asset_key,
+                         self.context.asset_key_for_output.return_value)
+        self.assertEqual(observation.metadata["dbt_execution_seconds"].value, 1.5)
+        self.assertEqual(observation.metadata["dbt_query_id"].value, "q1")
+        self.assertEqual(summary.asset_key, RUN_SUMMARY_ASSET_KEY)
+        self.assertEqual(
+            summary.metadata["dbt_run_summary"].value["invocation_id"], "inv")
+        self.assertFalse(Path(self.test_dir, "target", "run_summaries").exists())
+
+    def test_observes_test_runtime_on_checked_asset(self):
+        check_result = dg.AssetCheckResult(
+            asset_key=dg.AssetKey("stg_hits"), check_name="not_null_stg_hits_id",
+            passed=True, metadata={"unique_id": "test.p.not_null_stg_hits_id"})
+        self.invocation.stream.return_value = iter([self.output, check_result])
+        self.invocation.get_artifact.return_value["results"].append({
+            "unique_id": "test.p.not_null_stg_hits_id",
+            "status": "pass",
+            "execution_time": 0.25,
+        })
+
+        events = list(Factory._stream_with_run_results(self.context, self.invocation))
+
+        self.assertIs(events[1], check_result)
+        check_observation = events[3]
+        self.assertEqual(check_observation.asset_key, dg.AssetKey("stg_hits"))
+        self.assertEqual(
+            check_observation.metadata[
+                "dbt_execution_seconds/not_null_stg_hits_id"].value, 0.25)
+        self.assertNotIn("dbt_execution_seconds", check_observation.metadata)
+
+    def test_writes_summary_to_run_summary_dir(self):
+        summary_dir = Path(self.test_dir, "summaries")
+
+        with patch.dict(os.environ, {"DBT_RUN_SUMMARY_DIR": str(summary_dir)}):
+            list(Factory._stream_with_run_results(self.context, self.invocation))
+
+        self.assertTrue(summary_dir.joinpath("run_inv.json").exists())
+
+    def test_raises_error_after_emitting_events(self):
+        self.invocation.get_error.return_value = RuntimeError("dbt failed")
+
+        events = []
+        with self.assertRaises(RuntimeError):
+            for event in Factory._stream_with_run_results(
+                self.context, self.invocation
+            ):
+                events.append(event)
+        self.assertEqual(len(events), 3)
+
+    def test_handles_missing_run_results(self):
+        self.invocation.get_artifact.side_effect = FileNotFoundError
+
+        events = list(Factory._stream_with_run_results(self.context, self.invocation))
+
+        self.assertEqual(events, [self.output])
+        self.assertFalse(Path(self.test_dir, "target", "run_summaries").exists())
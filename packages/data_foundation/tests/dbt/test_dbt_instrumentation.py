@@ -0,0 +1,164 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import dagster as dg
+from data_foundation.defs.dbt.instrumentation import (
+    RUN_SUMMARY_ASSET_KEY,
+    build_run_summary,
+    format_run_summary,
+    get_check_observations,
+    get_node_metadata,
+    get_node_observations,
+    get_run_summary_observation,
+    write_run_summary,
+)
+
+
+def result(unique_id, execution_time, **adapter_response):
+    return {
+        "unique_id": unique_id,
+        "status": "success",
+        "execution_time": execution_time,
+        "thread_id": "Thread-1",
+        "timing": [
+            {
+                "name": "compile",
+                "started_at": "2024-01-01T00:00:00.000000Z",
+                "completed_at": "2024-01-01T00:00:00.250000Z",
+            },
+            {
+                "name": "execute",
+                "started_at": "2024-01-01T00:00:00.250000Z",
+                "completed_at": "2024-01-01T00:00:02.250000Z",
+            },
+        ],
+        "adapter_response": adapter_response,
+    }
+
+
+class TestCases(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.run_results = {
+            "metadata": {"invocation_id": "inv"},
+            "elapsed_time": 12.3456,
+            "results": [
+                result("model.p.fast", 1.0, rows_affected=1000, query_id="q1"),
+                result("model.p.slow", 9.87654, rows_affected=10, query_id="q2"),
+                result("model.p.view", 0.5, code="SUCCESS"),
+            ],
+        }
+
+
+class TestGetNodeMetadata(TestCases):
+
+    def test_get_node_metadata(self) -> None:
+        metadata = get_node_metadata(self.run_results)
+
+        self.assertEqual(metadata["model.p.slow"], {
+            "dbt_status": "success",
+            "dbt_execution_seconds": 9.877,
+            "dbt_thread_id": "Thread-1",
+            "dbt_compile_seconds": 0.25,
+            "dbt_execute_seconds": 2.0,
+            "dbt_rows_affected": 10,
+            "dbt_query_id": "q2",
+        })
+        self.assertNotIn("dbt_rows_affected", metadata["model.p.view"])
+
+    def test_get_node_metadata_bytes_scanned(self) -> None:
+        run_results = {"results": [result("model.p.bq", 1.0, bytes_processed=2048)]}
+
+        metadata = get_node_metadata(run_results)
+
+        self.assertEqual(metadata["model.p.bq"]["dbt_bytes_scanned"], 2048)
+
+    def test_get_node_metadata_empty(self) -> None:
+        self.assertEqual(get_node_metadata({}), {})
+
+
+class TestGetNodeObservations(TestCases):
+
+    def test_observes_materialized_nodes(self) -> None:
+        observations = get_node_observations(
+            get_node_metadata(self.run_results),
+            {"model.p.slow": dg.AssetKey("slow")},
+        )
+
+        self.assertEqual(len(observations), 1)
+        self.assertEqual(observations[0].asset_key, dg.AssetKey("slow"))
+        self.assertEqual(observations[0].metadata["dbt_query_id"].value, "q2")
+
+
+class TestGetCheckObservations(TestCases):
+
+    def test_observes_test_runtime_by_check_name(self) -> None:
+        observations = get_check_observations(
+            get_node_metadata(self.run_results),
+            {
+                "model.p.fast": dg.AssetCheckKey(dg.AssetKey("slow"), "not_null"),
+                "model.p.view": dg.AssetCheckKey(dg.AssetKey("slow"), "unique"),
+                "test.p.skipped": dg.AssetCheckKey(dg.AssetKey("slow"), "skipped"),
+            },
+        )
+
+        self.assertEqual(len(observations), 1)
+        self.assertEqual(observations[0].asset_key, dg.AssetKey("slow"))
+        self.assertEqual(
+            {key: value.value for key, value in observations[0].metadata.items()},
+            {"dbt_execution_seconds/not_null": 1.0,
+             "dbt_execution_seconds/unique": 0.5},
+        )
+
+
+class TestRunSummary(TestCases):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir)
+
+    def test_build_run_summary(self) -> None:
+        summary = build_run_summary(self.run_results, top_n=2)
+
+        self.assertEqual(summary["invocation_id"], "inv")
+        self.assertEqual(summary["elapsed_seconds"], 12.346)
+        self.assertEqual(summary["statuses"], {"success": 3})
+        self.assertEqual([node["unique_id"] for node in summary["slowest"]],
+                         ["model.p.slow", "model.p.fast"])
+        self.assertEqual(summary["most_expensive"][0]["unique_id"], "model.p.fast")
+
+    def test_write_run_summary(self) -> None:
+        summary = build_run_summary(self.run_results)
+
+        path = write_run_summary(summary, "run", self.test_dir)
+
+        self.assertEqual(path, Path(self.test_dir, "run_inv.json"))
+        with open(path) as file:
+            self.assertEqual(json.load(file), summary)
+
+    def test_get_run_summary_observation(self) -> None:
+        summary = build_run_summary(self.run_results)
+
+        observation = get_run_summary_observation(summary, "run")
+
+        self.assertEqual(observation.asset_key, RUN_SUMMARY_ASSET_KEY)
+        self.assertEqual(observation.metadata["dagster_run_id"].value, "run")
+        self.assertEqual(observation.metadata["dbt_run_summary"].value, summary)
+        self.assertIn("model.p.slow",
+                      observation.metadata["dbt_slowest_nodes"].value)
+
+    def test_format_run_summary(self) -> None:
+        table = format_run_summary(build_run_summary(self.run_results, top_n=1))
+
+        self.assertIn("| model.p.slow | success | 9.877 | 10 |", table)
+        self.assertEqual(len(table.splitlines()), 3)
+
+
+if __name__ == "__main__": # pragma: no coverage
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import dagster as dg
+from data_foundation.defs.dbt.layout import (
+    build_layout_checks,
+    get_clustered_assets,
+    get_clustering_information_sql,
+    get_layout_metadata,
+    get_partitions_scanned_sql,
+)
+
+
+class TestLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.hits = dg.AssetKey(["adobe_experience", "stg", "hits"])
+        self.assets_def = dg.multi_asset(name="dbt_assets", specs=[
+            dg.AssetSpec(self.hits, metadata={
+                "dagster/table_name": "analytics.adobe_experience.hits",
+                "dbt_layout_hints": {
+                    "cluster_by": ["to_date(hit_at)"], "max_clustering_depth": 8},
+            }),
+            dg.AssetSpec(["other"], metadata={
+                "dbt_layout_hints": {"search_optimization": {"equality": ["a"]}},
+            }),
+        ])(lambda: None)
+
+    def test_get_clustered_assets(self):
+        self.assertEqual(get_clustered_assets([self.assets_def]), {
+            self.hits: {
+                "relation": "analytics.adobe_experience.hits",
+                "cluster_by": ["to_date(hit_at)"],
+                "max_clustering_depth": 8,
+            }
+        })
+
+    def test_get_clustering_information_sql(self):
+        sql = get_clustering_information_sql(
+            "analytics.adobe_experience.hits", ["to_date(hit_at)", "hit_source"])
+        self.assertEqual(sql, "select system$clustering_information("
+            "'analytics.adobe_experience.hits', '(to_date(hit_at), hit_source)')")
+
+    def test_get_partitions_scanned_sql(self):
+        sql = get_partitions_scanned_sql("analytics.adobe_experience.hits", "01")
+        self.assertIn("analytics.information_schema.query_history", sql)
+        self.assertIn("query_id = '01'", sql)
+
+    def test_get_layout_metadata(self):
+        clustering_information = {
+            "cluster_by_keys": "LINEAR(to_date(hit_at))",
+            "total_partition_count": 120,
+            "average_overlaps": 1.5,
+            "average_depth": 2.25,
+        }
+        metadata = get_layout_metadata(clustering_information, 6, 120)
+        self.assertEqual(metadata["average_depth"], 2.25)
+        self.assertEqual(metadata["partitions_scanned_ratio"], 0.05)
+
+        metadata = get_layout_metadata(clustering_information)
+        self.assertNotIn("partitions_scanned", metadata)
+
+    def test_build_layout_checks(self):
+        checks = build_layout_checks([self.assets_def])
+        self.assertEqual(len(checks), 1)
+        self.assertEqual(
+            set(checks[0].check_keys),
+            {dg.AssetCheckKey(self.hits, "clustering_layout")},
+        )
+
+    def test_build_layout_checks_without_clustered_models(self):
+        self.assertEqual(build_layout_checks([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
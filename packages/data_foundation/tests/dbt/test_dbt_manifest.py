@@ -0,0 +1,287 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from data_foundation.defs.dbt.manifest import (
+    get_connected_components,
+    get_dag_width,
+    get_descendants,
+    get_macro_dependents,
+    get_modified_nodes,
+    get_selectable_nodes,
+    get_selection,
+    get_shard_key,
+    get_shards,
+    load_manifest,
+)
+
+
+def make_node(resource_type: str, fqn: list[str], depends_on: list[str] | None = None,
+              group: str | None = None, tags: list[str] | None = None,
+              package_name: str = "project") -> dict:
+    return {
+        "resource_type": resource_type,
+        "package_name": package_name,
+        "fqn": fqn,
+        "group": group,
+        "config": {"tags": tags or []},
+        "depends_on": {"nodes": depends_on or []},
+    }
+
+
+class TestCases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.manifest = {
+            "metadata": {"project_name": "project"},
+            "nodes": {
+                "model.project.stg_a": make_node(
+                    "model", ["project", "staging", "stg_a"], group="foundation"),
+                "model.project.stg_b": make_node(
+                    "model", ["project", "staging", "stg_b"], group="foundation"),
+                "model.project.mrt_a": make_node(
+                    "model", ["project", "marts", "mrt_a"],
+                    depends_on=["model.project.stg_a"], group="marketing"),
+                "model.project.int_partitioned": make_node(
+                    "model", ["project", "intermediate", "int_partitioned"],
+                    depends_on=["model.project.stg_b"], tags=["partitioned"]),
+                "seed.project.seed_a": make_node("seed", ["project", "seed_a"]),
+                "snapshot.project.snp_a": make_node(
+                    "snapshot", ["project", "snapshots", "snp_a"]),
+                "model.package.pkg_a": make_node(
+                    "model", ["package", "staging", "pkg_a"], package_name="package"),
+                "test.project.relationships": make_node(
+                    "test", ["project", "relationships"],
+                    depends_on=["seed.project.seed_a", "snapshot.project.snp_a"]),
+            },
+        }
+
+
+class TestLoadManifest(TestCases):
+
+    def test_load_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as test_dir:
+            manifest_path = Path(test_dir, "manifest.json")
+            manifest_path.write_text(json.dumps(self.manifest))
+            self.assertEqual(load_manifest(manifest_path), self.manifest)
+
+
+class TestGetSelectableNodes(TestCases):
+
+    def test_excludes_tests(self) -> None:
+        nodes = get_selectable_nodes(self.manifest)
+        self.assertNotIn("test.project.relationships", nodes)
+        self.assertEqual(len(nodes), 7)
+
+    def test_excludes_tags(self) -> None:
+        nodes = get_selectable_nodes(self.manifest, exclude_tags=("partitioned",))
+        self.assertNotIn("model.project.int_partitioned", nodes)
+
+
+class TestGetShardKey(TestCases):
+
+    def test_group(self) -> None:
+        nodes = self.manifest["nodes"]
+        self.assertEqual(
+            get_shard_key(nodes["model.project.mrt_a"], "group", "project"),
+            "marketing")
+        self.assertEqual(
+            get_shard_key(nodes["seed.project.seed_a"], "group", "project"),
+            "project")
+
+    def test_folder(self) -> None:
+        nodes = self.manifest["nodes"]
+        self.assertEqual(
+            get_shard_key(nodes["model.project.mrt_a"], "folder", "project"), "marts")
+        self.assertEqual(
+            get_shard_key(nodes["seed.project.seed_a"], "folder", "project"), "seeds")
+        self.assertEqual(
+            get_shard_key(nodes["model.package.pkg_a"], "folder", "project"),
+            "package")
+
+
+class TestGetConnectedComponents(TestCases):
+
+    def test_components_follow_dependencies_and_tests(self) -> None:
+        components = get_connected_components(self.manifest)
+        self.assertEqual(list(components.values()), [
+            ["model.package.pkg_a"],
+            ["model.project.int_partitioned", "model.project.stg_b"],
+            ["model.project.mrt_a", "model.project.stg_a"],
+            ["seed.project.seed_a", "snapshot.project.snp_a"],
+        ])
+        self.assertEqual(list(components), [
+            "component_1", "component_2", "component_3", "component_4"])
+
+    def test_max_shards_packs_components(self) -> None:
+        components = get_connected_components(self.manifest, max_shards=2)
+        self.assertEqual(len(components), 2)
+        self.assertEqual(sum(len(ids) for ids in components.values()), 7)
+
+
+class TestGetShards(TestCases):
+
+    def test_shards_are_disjoint_and_complete(self) -> None:
+        for shard_by in ("group", "folder", "component"):
+            shards = get_shards(self.manifest, shard_by,
+                                exclude_tags=("partitioned",))
+            unique_ids = [uid for ids in shards.values() for uid in ids]
+            self.assertEqual(len(unique_ids), len(set(unique_ids)))
+            self.assertEqual(len(unique_ids), 6)
+
+    def test_shard_by_group(self) -> None:
+        shards = get_shards(self.manifest, "group")
+        self.assertEqual(shards["marketing"], ["model.project.mrt_a"])
+        self.assertEqual(set(shards), {"foundation", "marketing", "package",
+                                       "project"})
+
+    def test_invalid_option(self) -> None:
+        with self.assertRaises(ValueError):
+            get_shards(self.manifest, "schema")
+
+
+class TestGetSelection(TestCases):
+
+    def test_selection_uses_fqn(self) -> None:
+        selection = get_selection(
+            self.manifest, ["model.project.stg_a", "seed.project.seed_a"])
+        self.assertEqual(
+            selection, "fqn:project.staging.stg_a fqn:project.seed_a")
+
+
+class TestGetModifiedNodes(TestCases):
+
+    def setUp(self) -> None:
+        self.state_manifest = {
+            "nodes": {
+                "model.project.a": {"checksum": {"checksum": "1"}, "config": {},
+                                    "depends_on": {"macros": ["macro.project.m"]}},
+                "model.project.b": {"checksum": {"checksum": "2"}, "config": {}},
+            },
+            "macros": {"macro.project.m": {"macro_sql": "select 1"}},
+        }
+
+    def test_unchanged_manifest_has_no_modified_nodes(self) -> None:
+        self.assertEqual(
+            get_modified_nodes(self.state_manifest, self.state_manifest), set())
+
+    def test_detects_new_changed_and_macro_dependent_nodes(self) -> None:
+        manifest = {
+            "nodes": {
+                "model.project.a": {"checksum": {"checksum": "1"}, "config": {},
+                                    "depends_on": {"macros": ["macro.project.m"]}},
+                "model.project.b": {"checksum": {"checksum": "3"}, "config": {}},
+                "model.project.c": {"checksum": {"checksum": "4"}, "config": {}},
+            },
+            "macros": {"macro.project.m": {"macro_sql": "select 2"}},
+        }
+        self.assertEqual(
+            get_modified_nodes(manifest, self.state_manifest),
+            {"model.project.a", "model.project.b", "model.project.c"},
+        )
+
+    def test_detects_config_changes(self) -> None:
+        manifest = {
+            "nodes": {
+                **self.state_manifest["nodes"],
+                "model.project.b": {"checksum": {"checksum": "2"}, "config": {},
+                                    "unrendered_config": {"materialized": "table"}},
+            },
+            "macros": self.state_manifest["macros"],
+        }
+        self.assertEqual(
+            get_modified_nodes(manifest, self.state_manifest), {"model.project.b"})
+
+    def test_ignores_config_rendered_from_the_environment(self) -> None:
+        manifest = {
+            "nodes": {
+                **self.state_manifest["nodes"],
+                "model.project.b": {"checksum": {"checksum": "2"},
+                                    "config": {"schema": "dbt_dev_user"}},
+            },
+            "macros": self.state_manifest["macros"],
+        }
+        self.assertEqual(get_modified_nodes(manifest, self.state_manifest), set())
+
+    def test_detects_nested_macro_changes(self) -> None:
+        state_manifest = {
+            **self.state_manifest,
+            "macros": {
+                "macro.project.m": {"macro_sql": "{{ n() }}",
+                                    "depends_on": {"macros": ["macro.project.n"]}},
+                "macro.project.n": {"macro_sql": "select 1"},
+            },
+        }
+        manifest = {
+            **state_manifest,
+            "macros": {
+                **state_manifest["macros"],
+                "macro.project.n": {"macro_sql": "select 2"},
+            },
+        }
+        self.assertEqual(
+            get_modified_nodes(manifest, state_manifest), {"model.project.a"})
+
+
+class TestGetDescendants(TestCases):
+
+    def test_descendants_include_downstream_nodes(self) -> None:
+        self.assertEqual(
+            get_descendants(self.manifest, {"model.project.stg_a"}),
+            {"model.project.stg_a", "model.project.mrt_a"},
+        )
+
+    def test_descendants_of_leaf(self) -> None:
+        self.assertEqual(
+            get_descendants(self.manifest, {"model.project.mrt_a"}),
+            {"model.project.mrt_a"},
+        )
+
+
+class TestGetMacroDependents(unittest.TestCase):
+
+    def test_dependents_include_callers_of_calling_macros(self) -> None:
+        manifest = {
+            "nodes": {
+                "model.project.a": {"depends_on": {"macros": ["macro.project.m"]}},
+                "model.project.b": {"depends_on": {"macros": ["macro.project.t"]}},
+                "model.project.c": {"depends_on": {"macros": ["macro.dbt.other"]}},
+                "model.project.d": {"depends_on": {"nodes": ["model.project.a"]}},
+            },
+            "macros": {
+                "macro.project.m": {"name": "m", "depends_on": {"macros": []}},
+                "macro.project.t": {
+                    "name": "t", "depends_on": {"macros": ["macro.project.m"]}},
+                "macro.dbt.other": {"name": "other"},
+            },
+        }
+        self.assertEqual(
+            get_macro_dependents(manifest, "m"),
+            {"model.project.a", "model.project.b"},
+        )
+        self.assertEqual(get_macro_dependents(manifest, "missing"), set())
+
+
+class TestGetDagWidth(TestCases):
+
+    def test_width_of_full_selection(self) -> None:
+        unique_ids = get_selectable_nodes(self.manifest)
+        # stg_a, stg_b, seed_a, snp_a and pkg_a have no selected parents
+        self.assertEqual(get_dag_width(self.manifest, unique_ids), 5)
+
+    def test_width_ignores_unselected_parents(self) -> None:
+        unique_ids = ["model.project.mrt_a", "model.project.int_partitioned"]
+        self.assertEqual(get_dag_width(self.manifest, unique_ids), 2)
+
+    def test_width_of_chain(self) -> None:
+        unique_ids = ["model.project.stg_a", "model.project.mrt_a"]
+        self.assertEqual(get_dag_width(self.manifest, unique_ids), 1)
+
+    def test_width_of_empty_selection(self) -> None:
+        self.assertEqual(get_dag_width(self.manifest, []), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
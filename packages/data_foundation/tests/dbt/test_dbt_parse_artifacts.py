@@ -0,0 +1,91 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from data_foundation.defs.dbt.constants import RUN_VARS_ENV
+from data_foundation.defs.dbt.parse_artifacts import (
+    PARSE_ARTIFACT_NAMES,
+    are_parse_artifacts_current,
+    get_project_hash,
+    prepare_parse_artifacts,
+    write_parse_artifacts_hash,
+)
+
+
+class TestParseArtifacts(unittest.TestCase):
+
+    def setUp(self):
+        self.project_dir = Path(tempfile.mkdtemp())
+        self.project_dir.joinpath("models").mkdir()
+        self.model = self.project_dir.joinpath("models", "stg_hits.sql")
+        self.model.write_text("select 1")
+        self.project_dir.joinpath("dbt_project.yml").write_text("name: dbt")
+
+        self.target_dir = self.project_dir.joinpath("target")
+        self.target_dir.mkdir()
+        for name in PARSE_ARTIFACT_NAMES:
+            self.target_dir.joinpath(name).write_text("{}")
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir)
+
+    def test_hash_changes_with_files_and_target(self):
+        project_hash = get_project_hash(self.project_dir, "dev")
+
+        self.assertEqual(get_project_hash(self.project_dir, "dev"), project_hash)
+        self.assertNotEqual(get_project_hash(self.project_dir, "prod"), project_hash)
+
+        self.model.write_text("select 2")
+        self.assertNotEqual(get_project_hash(self.project_dir, "dev"), project_hash)
+
+    def test_hash_ignores_dbt_output(self):
+        project_hash = get_project_hash(self.project_dir, "dev")
+
+        self.target_dir.joinpath("run_results.json").write_text("{}")
+        self.project_dir.joinpath("logs").mkdir()
+        self.project_dir.joinpath("logs", "dbt.log").write_text("")
+        self.project_dir.joinpath(".user.yml").write_text("id: 1")
+
+        self.assertEqual(get_project_hash(self.project_dir, "dev"), project_hash)
+
+    def test_artifacts_are_current(self):
+        self.assertFalse(are_parse_artifacts_current(self.project_dir, "target", "dev"))
+
+        write_parse_artifacts_hash(self.project_dir, "target", "dev")
+        self.assertTrue(are_parse_artifacts_current(self.project_dir, "target", "dev"))
+        self.assertFalse(
+            are_parse_artifacts_current(self.project_dir, "target", "prod"))
+
+        self.model.write_text("select 2")
+        self.assertFalse(are_parse_artifacts_current(self.project_dir, "target", "dev"))
+
+    def test_missing_artifact_is_stale(self):
+        write_parse_artifacts_hash(self.project_dir, "target", "dev")
+        self.target_dir.joinpath("partial_parse.msgpack").unlink()
+
+        self.assertFalse(are_parse_artifacts_current(self.project_dir, "target", "dev"))
+
+    def test_prepare_parse_artifacts(self):
+        project = MagicMock(
+            project_dir=self.project_dir, target_path=Path("target"), target="dev")
+
+        self.assertTrue(prepare_parse_artifacts(project))
+        project.preparer.prepare.assert_called_once_with(project)
+
+        project.preparer.prepare.reset_mock()
+        self.assertFalse(prepare_parse_artifacts(project))
+        project.preparer.prepare.assert_not_called()
+
+    def test_profile_does_not_read_run_vars(self):
+        # dbt hashes the rendered profile, reading the vars of a run there would make
+        # every run with new vars reparse the whole project
+        profile = Path(__file__).parents[2].joinpath("dbt", "profiles.yml").read_text()
+
+        self.assertNotIn(RUN_VARS_ENV, profile)
+        self.assertNotIn("var(", profile.replace("env_var(", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+import dagster as dg
+from dagster_dbt.asset_utils import DAGSTER_DBT_UNIQUE_ID_METADATA_KEY
+from data_foundation.defs.dbt.privacy import (
+    build_privacy_retention_asset,
+    get_privacy_rules,
+)
+
+
+def make_node(relation_name: str, privacy: dict | None = None) -> dict:
+    return {
+        "relation_name": relation_name,
+        "config": {"meta": {"privacy": privacy} if privacy else {}},
+    }
+
+
+class TestPrivacy(unittest.TestCase):
+
+    def setUp(self):
+        self.manifest = {
+            "nodes": {
+                "snapshot.p.snp_accounts": make_node("snapshots.accounts_db.accounts", {
+                    "delete_interval": "10 years",
+                    "anonymize_interval": "5 years",
+                    "reference_date_column": "updated_at",
+                    "pii_columns": ["email"],
+                }),
+                "model.p.stg_masked": make_node("analytics.accounts_db.masked", {
+                    "pii_columns": ["email"],
+                }),
+                "model.p.stg_orders": make_node("analytics.orders_db.orders"),
+            }
+        }
+
+    def test_get_privacy_rules(self):
+        self.assertEqual(get_privacy_rules(self.manifest), {
+            "snapshot.p.snp_accounts": {
+                "relation": "snapshots.accounts_db.accounts",
+                "delete_interval": "10 years",
+                "anonymize_interval": "5 years",
+                "reference_date_column": "updated_at",
+                "pii_columns": ["email"],
+            }
+        })
+
+    def test_get_privacy_rules_requires_reference_date_column(self):
+        self.manifest["nodes"]["model.p.stg_orders"] = make_node(
+            "analytics.orders_db.orders", {"delete_interval": "1 year"}
+        )
+        with self.assertRaises(ValueError):
+            get_privacy_rules(self.manifest)
+
+    def test_build_privacy_retention_asset(self):
+        assets_def = dg.multi_asset(name="dbt_assets", specs=[
+            dg.AssetSpec(["snapshots", "accounts"], metadata={
+                DAGSTER_DBT_UNIQUE_ID_METADATA_KEY: "snapshot.p.snp_accounts"}),
+            dg.AssetSpec(["orders"], metadata={
+                DAGSTER_DBT_UNIQUE_ID_METADATA_KEY: "model.p.stg_orders"}),
+        ])(lambda: None)
+
+        asset = build_privacy_retention_asset(self.manifest, [assets_def])
+
+        self.assertEqual(asset.key, dg.AssetKey(["dbt", "privacy_retention"]))
+        self.assertEqual(
+            set(asset.asset_deps[asset.key]),
+            {dg.AssetKey(["snapshots", "accounts"])},
+        )
+        self.assertIsNotNone(asset.automation_conditions_by_key[asset.key])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import MagicMock
+
+import dagster as dg
+from data_foundation.defs.dbt.sampled_checks import (
+    FULL_CHECKS_JOB_NAME,
+    add_sample_scope,
+    build_full_checks_schedule,
+    get_sample_scopes,
+    get_test_sample,
+    get_test_sample_scope,
+)
+
+
+class TestSampledChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.manifest = {"nodes": {
+            "model.p.hits": {"config": {"meta": {"dagster": {
+                "test_sample": {"column": "hit_at"}}}}},
+            "model.p.campaigns": {"config": {"meta": {}}},
+            "test.p.unique_hit_id": {"attached_node": "model.p.hits"},
+            "test.p.not_null_hit_id": {
+                "attached_node": "model.p.hits",
+                "config": {"meta": {"dagster": {"sample": {"percent": 5}}}}},
+            "test.p.unique_campaign_id": {"attached_node": "model.p.campaigns"},
+        }}
+        self.hits = dg.AssetKey("hits")
+        self.campaigns = dg.AssetKey("campaigns")
+        self.assets_def = dg.multi_asset(
+            name="dbt_assets",
+            specs=[dg.AssetSpec(self.hits, skippable=True),
+                   dg.AssetSpec(self.campaigns, skippable=True)],
+            check_specs=[
+                dg.AssetCheckSpec("unique_hit_id", asset=self.hits, metadata={
+                    "dagster_dbt/unique_id": "test.p.unique_hit_id"}),
+                dg.AssetCheckSpec("unique_campaign_id", asset=self.campaigns,
+                                  metadata={"dagster_dbt/unique_id":
+                                            "test.p.unique_campaign_id"}),
+            ],
+            can_subset=True,
+        )(lambda: None)
+        self.check_key = dg.AssetCheckKey(self.hits, "unique_hit_id")
+
+    def test_get_test_sample(self):
+        self.assertEqual(get_test_sample(self.manifest, "test.p.unique_hit_id"),
+                         {"column": "hit_at"})
+        self.assertEqual(get_test_sample(self.manifest, "test.p.not_null_hit_id"),
+                         {"percent": 5})
+        self.assertIsNone(get_test_sample(self.manifest, "test.p.unique_campaign_id"))
+
+    def test_get_test_sample_scope(self):
+        sample = {"column": "hit_at", "percent": 5}
+        window = {"sample_min_date": "2025-07-01", "sample_max_date": "2025-08-01"}
+
+        self.assertEqual(get_test_sample_scope(sample, window, False),
+                         "hit_at from 2025-07-01 to 2025-08-01")
+        self.assertEqual(get_test_sample_scope(sample, {}, False), "5% block sample")
+        self.assertEqual(get_test_sample_scope(sample, window, True), "full")
+        self.assertEqual(
+            get_test_sample_scope(sample, {**window, "full_tests": True}, False),
+            "full")
+        self.assertEqual(get_test_sample_scope({"column": "hit_at"}, {}, False),
+                         "full")
+
+    def test_get_sample_scopes(self):
+        context = MagicMock()
+        context.assets_def = self.assets_def
+        context.selected_asset_check_keys = set(self.assets_def.check_keys)
+
+        self.assertEqual(get_sample_scopes(context, self.manifest, {}, True),
+                         {self.check_key: "full"})
+
+    def test_add_sample_scope(self):
+        event = dg.AssetCheckResult(
+            asset_key=self.hits, check_name="unique_hit_id", passed=True)
+        event = add_sample_scope(event, {self.check_key: "full"})
+        self.assertEqual(event.metadata["dbt_sample_scope"].value, "full")
+
+        output = dg.Output(None, output_name="hits")
+        self.assertIs(add_sample_scope(output, {self.check_key: "full"}), output)
+
+    def test_build_full_checks_schedule(self):
+        schedule, = build_full_checks_schedule([self.assets_def], self.manifest)
+        defs = dg.Definitions(assets=[self.assets_def], schedules=[schedule])
+
+        job = defs.get_repository_def().get_job(FULL_CHECKS_JOB_NAME)
+        self.assertEqual(job.asset_layer.asset_graph.asset_check_keys,
+                         {self.check_key})
+
+    def test_no_schedule_without_sampled_checks(self):
+        self.manifest["nodes"]["model.p.hits"]["config"]["meta"] = {}
+        self.assertEqual(
+            build_full_checks_schedule([self.assets_def], self.manifest), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
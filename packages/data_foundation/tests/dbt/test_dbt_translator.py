@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 from data_foundation.defs.dbt.translator import CustomDagsterDbtTranslator
 
@@ -135,8 +136,37 @@ class TestGetAutomationCondition(TestTranslator):
             self.translator.get_automation_condition(self.seed_props)
         )
         self.assertIsNotNone(automation_condition)
+
+    def test_get_default_dynamic_table_automation_condition(self):
+        automation_condition = self.translator.get_automation_condition({
+            "resource_type": "model",
+            "config": {"materialized": "dynamic_table"},
+        })
+        self.assertEqual(automation_condition.get_label(), "missing_or_changed")
         
 
+class TestGetMetadata(TestTranslator):
+    def test_get_metadata_with_layout_hints(self):
+        metadata = self.translator.get_metadata({
+            "resource_type": "model",
+            "config": {"meta": {"dagster": {"cluster_by": "to_date(hit_at)"}}},
+        })
+        self.assertEqual(
+            metadata["dbt_layout_hints"], {"cluster_by": ["to_date(hit_at)"]})
+
+    def test_get_metadata_without_layout_hints(self):
+        metadata = self.translator.get_metadata(self.model_props)
+        self.assertNotIn("dbt_layout_hints", metadata)
+
+    def test_get_metadata_invalid_layout_hints(self):
+        with self.assertRaisesRegex(ValueError, "model.p.stg_a"):
+            self.translator.get_metadata({
+                "unique_id": "model.p.stg_a",
+                "resource_type": "model",
+                "config": {"meta": {"dagster": {"automatic_clustering": True}}},
+            })
+
+
 class TestGetTags(TestTranslator):
     def test_get_tags(self):
         tags = self.translator.get_tags(self.model_props)
@@ -147,5 +177,33 @@ class TestGetTags(TestTranslator):
         self.assertEqual(tags, {})
 
 
+class TestNodeCache(TestTranslator):
+    def setUp(self):
+        self.translator = CustomDagsterDbtTranslator()
+        self.props = {
+            **self.model_props, "unique_id": "model.project.stg_source__table"}
+
+    def test_caches_results_by_unique_id(self):
+        with patch(
+            "data_foundation.defs.dbt.translator.get_partitions_def_from_meta"
+        ) as mock_get_partitions_def:
+            first = self.translator.get_partitions_def(self.props)
+            second = self.translator.get_partitions_def(self.props)
+
+        mock_get_partitions_def.assert_called_once()
+        self.assertIs(first, second)
+
+    def test_caches_each_method_separately(self):
+        asset_key = self.translator.get_asset_key(self.props)
+        group_name = self.translator.get_group_name(self.props)
+
+        self.assertEqual(asset_key.path, ["source", "stg", "table"])
+        self.assertEqual(group_name, "source")
+
+    def test_does_not_cache_without_unique_id(self):
+        self.translator.get_asset_key(self.model_props)
+        self.assertEqual(self.translator._node_cache, {})
+
+
 if __name__ == "__main__":
     unittest.main()
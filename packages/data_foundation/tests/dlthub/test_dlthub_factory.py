@@ -228,6 +228,63 @@ class TestGetConfigs(TestCases):
         self.assertEqual(source_configs["source1"]["name"], "source1")
         self.assertEqual(source_configs["source1"]["param"], "value2")
 
+
+class TestExpandFanOut(TestCases):
+
+    def setUp(self):
+        self.fan_out_config = {
+            "name": "source_3.rates",
+            "config_path": inspect.getfile(Factory),
+            "entry": "data.func",
+            "fan_out": ["usd", "cad"],
+            "arguments": ["latest"],
+            "primary_key": "date",
+            "meta": {"dagster": {"automation_condition": "on_schedule"}},
+        }
+
+    def test_expand_fan_out_creates_resource_per_value(self):
+        resource_configs, source_configs = {}, {}
+        Factory._expand_fan_out(self.fan_out_config, resource_configs, source_configs)
+
+        self.assertEqual(list(resource_configs), ["source_3.usd", "source_3.cad"])
+        self.assertEqual(resource_configs["source_3.usd"]["arguments"],
+                         ["usd", "latest"])
+        self.assertNotIn("fan_out", resource_configs["source_3.cad"])
+
+    def test_expand_fan_out_creates_parallelized_source(self):
+        resource_configs, source_configs = {}, {}
+        Factory._expand_fan_out(self.fan_out_config, resource_configs, source_configs)
+
+        source_config = source_configs["source_3"]
+        self.assertEqual(source_config["resources"], ["source_3.usd", "source_3.cad"])
+        self.assertTrue(source_config["parallelized"])
+        self.assertEqual(source_config["meta"], self.fan_out_config["meta"])
+
+    def test_expand_fan_out_replaces_reference_in_declared_source(self):
+        resource_configs = {}
+        source_configs = {
+            "source_3": {
+                "name": "source_3",
+                "resources": ["source_3.other", "source_3.rates"],
+            }
+        }
+        Factory._expand_fan_out(self.fan_out_config, resource_configs, source_configs)
+
+        self.assertEqual(source_configs["source_3"]["resources"],
+                         ["source_3.other", "source_3.usd", "source_3.cad"])
+        self.assertTrue(source_configs["source_3"]["parallelized"])
+
+    def test_expand_fan_out_source_collision(self):
+        source_configs = {"source_3": {"name": "source_3", "resources": []}}
+        with self.assertRaises(ValueError):
+            Factory._expand_fan_out(self.fan_out_config, {}, source_configs)
+
+    def test_expand_fan_out_resource_collision(self):
+        resource_configs = {"source_3.usd": {}}
+        with self.assertRaises(ValueError):
+            Factory._expand_fan_out(self.fan_out_config, resource_configs, {})
+
+
 class TestBuildResourceFromConfig(TestCases):
 
     @patch(f"{FACTORY}._build_data_generator")
@@ -260,6 +317,51 @@ class TestBuildResourceFromConfig(TestCases):
                 self.resources["source_2.resource_3"], resources)
         self.assertIsInstance(resource, DltResource)
 
+    @patch(f"{FACTORY}._build_data_generator")
+    def test_build_resource_with_merge_strategy(self, mock_build_data_generator):
+
+        def generator():
+            yield from [1]
+
+        mock_build_data_generator.return_value = generator
+
+        config = {**self.resources["source_1.resource_1"], "merge_strategy": "upsert"}
+        resource = Factory._build_resource_from_config(config, {})
+        self.assertEqual(resource.write_disposition,
+                         {"disposition": "merge", "strategy": "upsert"})
+
+class TestGetWriteDisposition(TestCases):
+
+    def test_get_write_disposition_from_string(self):
+        config = {"name": "source.table", "write_disposition": "merge",
+                  "merge_strategy": "delete-insert"}
+        self.assertEqual(Factory._get_write_disposition(config),
+                         {"disposition": "merge", "strategy": "delete-insert"})
+
+    def test_get_write_disposition_keeps_merge_options(self):
+        config = {
+            "name": "source.table",
+            "write_disposition": {"disposition": "merge",
+                                  "validity_column_names": ["from", "to"]},
+            "merge_strategy": "scd2",
+        }
+        self.assertEqual(Factory._get_write_disposition(config), {
+            "disposition": "merge",
+            "validity_column_names": ["from", "to"],
+            "strategy": "scd2",
+        })
+
+    def test_get_write_disposition_invalid_strategy(self):
+        config = {"name": "source.table", "merge_strategy": "overwrite"}
+        with self.assertRaises(ValueError):
+            Factory._get_write_disposition(config)
+
+    def test_get_write_disposition_requires_merge(self):
+        config = {"name": "source.table", "write_disposition": "append",
+                  "merge_strategy": "upsert"}
+        with self.assertRaises(ValueError):
+            Factory._get_write_disposition(config)
+
 class TestBuildFreshnessChecks(TestCases):
 
     def test_build_freshness_checks_parses_correctly(self) -> None:
@@ -381,6 +483,29 @@ class TestBuildAssetsDefinition(TestCases):
         assets_definition = Factory._build_assets_definition(source_factory, config)
         self.assertIsInstance(assets_definition, dg.AssetsDefinition)
 
+    @patch.object(dlt, "pipeline", wraps=dlt.pipeline)
+    def test_build_assets_definition_with_staging_options(self, mock_pipeline):
+
+        config = {
+            **self.resources["source_2.resource_2"],
+            "staging": {"dataset_name_layout": "stg_%s", "truncate": True},
+        }
+        @dlt.resource()
+        def resource():
+            yield 1
+
+        @dlt.source()
+        def source_factory(resource=resource):
+            yield resource
+
+        Factory._build_assets_definition(source_factory, config)
+        destination = mock_pipeline.call_args.kwargs["destination"]
+        self.assertEqual(
+            destination.config_params["staging_dataset_name_layout"], "stg_%s")
+        # the option is set when the pipeline runs, not when definitions load
+        self.assertNotIn(
+            "source_2__resource_2.load.truncate_staging_dataset", dlt.config)
+
 class TestBuildExternalAsset(TestCases):
 
     def test_build_external_asset_parses(self):
@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+from data_foundation.defs.dlthub.http_cache import CachedSession, get_cached_session
+
+
+def make_response(content: bytes, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://example.com/rates"
+    response.headers["Content-Type"] = "application/json"
+    response._content = content
+    return response
+
+
+class TestCases(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+
+class TestCachedSession(TestCases):
+
+    @patch.object(requests.Session, "request")
+    def test_repeated_get_is_served_from_cache(self, mock_request) -> None:
+        mock_request.return_value = make_response(b'{"usd": 1}')
+        session = CachedSession(cache_dir=self.cache_dir)
+
+        first = session.get("https://example.com/rates")
+        second = session.get("https://example.com/rates")
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(first.json(), second.json())
+        self.assertTrue(second.from_cache)
+
+    @patch.object(requests.Session, "request")
+    def test_params_are_part_of_the_cache_key(self, mock_request) -> None:
+        mock_request.return_value = make_response(b"{}")
+        session = CachedSession(cache_dir=self.cache_dir)
+
+        session.get("https://example.com/rates", params={"page": 1})
+        session.get("https://example.com/rates", params={"page": 2})
+
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch.object(requests.Session, "request")
+    def test_expired_responses_are_fetched_again(self, mock_request) -> None:
+        mock_request.return_value = make_response(b"{}")
+        session = CachedSession(cache_dir=self.cache_dir, ttl_seconds=-1)
+
+        session.get("https://example.com/rates")
+        session.get("https://example.com/rates")
+
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch.object(requests.Session, "request")
+    def test_failed_responses_are_not_cached(self, mock_request) -> None:
+        mock_request.return_value = make_response(b"{}", status_code=500)
+        session = CachedSession(cache_dir=self.cache_dir)
+
+        session.get("https://example.com/rates")
+        session.get("https://example.com/rates")
+
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch.object(requests.Session, "request")
+    def test_cache_is_evicted_over_budget(self, mock_request) -> None:
+        mock_request.return_value = make_response(b"x" * 100)
+        session = CachedSession(cache_dir=self.cache_dir, max_bytes=0)
+
+        session.get("https://example.com/rates")
+
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+class TestGetCachedSession(TestCases):
+
+    @patch.dict(os.environ, {"TARGET": "dev", "DLT_HTTP_CACHE": ""})
+    def test_enabled_in_dev(self) -> None:
+        session = get_cached_session(
+            {"http_cache": {"ttl_seconds": 10, "cache_dir": self.cache_dir}}
+        )
+        self.assertIsInstance(session, CachedSession)
+        self.assertEqual(session.ttl_seconds, 10)
+
+    @patch.dict(os.environ, {"TARGET": "prod", "DLT_HTTP_CACHE": ""})
+    def test_disabled_outside_dev(self) -> None:
+        self.assertIsNone(get_cached_session({"http_cache": True}))
+
+    @patch.dict(os.environ, {"TARGET": "dev", "DLT_HTTP_CACHE": ""})
+    def test_disabled_when_not_configured(self) -> None:
+        self.assertIsNone(get_cached_session({}))
+
+    @patch.dict(os.environ, {"TARGET": "dev", "DLT_HTTP_CACHE": "false"})
+    def test_env_override_disables(self) -> None:
+        self.assertIsNone(get_cached_session({"http_cache": True}))
+
+    @patch.dict(os.environ, {"TARGET": "test", "DLT_HTTP_CACHE": "true"})
+    def test_env_override_enables(self) -> None:
+        self.assertIsInstance(get_cached_session({}), CachedSession)
+
+    @patch.dict(os.environ, {"TARGET": "prod", "DLT_HTTP_CACHE": "true"})
+    def test_env_override_fails_in_prod(self) -> None:
+        with self.assertRaises(ValueError):
+            get_cached_session({"http_cache": True})
+
+
+if __name__ == "__main__": # pragma: no coverage
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import dlt
+from data_foundation.defs.dlthub.pipelines import (
+    evict_load_packages,
+    get_pipelines_dir,
+    pipeline_config,
+    pipeline_lock,
+)
+
+
+class TestCases(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.test_dir = tempfile.mkdtemp()
+        self.pipeline_dir = Path(self.test_dir, "source__resource")
+        self.loaded_dir = self.pipeline_dir.joinpath("load", "loaded")
+        self.loaded_dir.mkdir(parents=True)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir)
+
+    def make_package(self, load_id: str, size: int, age_seconds: float) -> Path:
+        package = self.loaded_dir.joinpath(load_id)
+        package.mkdir()
+        package.joinpath("data.jsonl").write_bytes(b"x" * size)
+        mtime = time.time() - age_seconds
+        os.utime(package, (mtime, mtime))
+        return package
+
+
+class TestGetPipelinesDir(TestCases):
+
+    @patch.dict(os.environ, {"DLT_PIPELINES_DIR": "/mnt/dlt/pipelines"})
+    def test_get_pipelines_dir_from_env(self) -> None:
+        self.assertEqual(get_pipelines_dir(), "/mnt/dlt/pipelines")
+
+    @patch.dict(os.environ, {"DLT_PIPELINES_DIR": ""})
+    def test_get_pipelines_dir_default(self) -> None:
+        self.assertTrue(get_pipelines_dir())
+
+
+class TestPipelineLock(TestCases):
+
+    def test_pipeline_lock_creates_lock_file(self) -> None:
+        with pipeline_lock(self.test_dir, "source__resource") as lock_path:
+            self.assertTrue(lock_path.exists())
+            self.assertEqual(lock_path.name, "source__resource.lock")
+
+
+class TestPipelineConfig(TestCases):
+
+    def test_pipeline_config_is_scoped_to_the_run(self) -> None:
+        key = "source__resource.load.truncate_staging_dataset"
+        values = {"load.truncate_staging_dataset": True}
+        with pipeline_config("source__resource", values):
+            self.assertTrue(dlt.config[key])
+            self.assertNotIn("other__resource.load.truncate_staging_dataset",
+                             dlt.config)
+        self.assertNotIn(key, dlt.config)
+
+    def test_pipeline_config_restores_previous_values(self) -> None:
+        dlt.config["restored__resource.load.workers"] = 4
+        with pipeline_config("restored__resource", {"load.workers": 1}):
+            self.assertEqual(dlt.config["restored__resource.load.workers"], 1)
+        self.assertEqual(dlt.config["restored__resource.load.workers"], 4)
+
+
+class TestEvictLoadPackages(TestCases):
+
+    def test_evicts_packages_older_than_max_age(self) -> None:
+        old = self.make_package("1", size=10, age_seconds=1000)
+        new = self.make_package("2", size=10, age_seconds=0)
+
+        evicted = evict_load_packages(
+            self.pipeline_dir, max_bytes=1000, max_age_seconds=100
+        )
+
+        self.assertEqual(evicted, [old])
+        self.assertFalse(old.exists())
+        self.assertTrue(new.exists())
+
+    def test_evicts_least_recently_used_packages_over_budget(self) -> None:
+        oldest = self.make_package("1", size=100, age_seconds=30)
+        middle = self.make_package("2", size=100, age_seconds=20)
+        newest = self.make_package("3", size=100, age_seconds=10)
+
+        evicted = evict_load_packages(
+            self.pipeline_dir, max_bytes=150, max_age_seconds=1000
+        )
+
+        self.assertEqual(evicted, [oldest, middle])
+        self.assertTrue(newest.exists())
+
+    def test_keeps_packages_within_budget(self) -> None:
+        self.make_package("1", size=10, age_seconds=10)
+
+        evicted = evict_load_packages(
+            self.pipeline_dir, max_bytes=1000, max_age_seconds=1000
+        )
+
+        self.assertEqual(evicted, [])
+
+    def test_handles_missing_loaded_folder(self) -> None:
+        evicted = evict_load_packages(Path(self.test_dir, "missing"))
+        self.assertEqual(evicted, [])
+
+
+if __name__ == "__main__": # pragma: no coverage
+    unittest.main()
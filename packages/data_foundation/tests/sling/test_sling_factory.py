@@ -1,7 +1,7 @@
 import os
 import unittest
 from pathlib import Path
-from unittest.mock import mock_open, patch
+from unittest.mock import MagicMock, mock_open, patch
 
 import dagster as dg
 from data_foundation.defs.sling.factory import Factory
@@ -145,6 +145,41 @@ class TestCreateAssets(TestFactory):
         self.assertIsNotNone(assets)
 
 
+class TestAddChangeMetadata(TestFactory):
+    @patch("data_foundation.defs.sling.factory._get_target_table_name")
+    def test_add_change_metadata(self, mock_get_target_table_name):
+        mock_get_target_table_name.return_value = "SOURCE.TABLE"
+        sling = MagicMock()
+        sling.run_sling_cli.return_value = "[]"
+        sling._parse_json_table_output.return_value = [
+            {"count": "10", "max": "2025-01-01 00:00:00"}]
+        event = dg.MaterializeResult(
+            asset_key=["source", "raw", "table"],
+            metadata={"stream_name": "source.table"})
+
+        events = list(self.factory._add_change_metadata(
+            MagicMock(), sling, self.replication_config, [event]))
+
+        self.assertEqual(events[0].metadata["dagster/row_count"], 10)
+        self.assertEqual(
+            events[0].metadata["max_update_key"], "2025-01-01 00:00:00")
+        self.assertIn("max(updated_at)", sling.run_sling_cli.call_args.args[0][-1])
+
+    @patch("data_foundation.defs.sling.factory._get_target_table_name")
+    def test_add_change_metadata_on_failure(self, mock_get_target_table_name):
+        mock_get_target_table_name.return_value = "SOURCE.TABLE"
+        sling = MagicMock()
+        sling.run_sling_cli.side_effect = Exception("connection failed")
+        event = dg.MaterializeResult(
+            asset_key=["source", "raw", "table"],
+            metadata={"stream_name": "source.table"})
+
+        events = list(self.factory._add_change_metadata(
+            MagicMock(), sling, self.replication_config, [event]))
+
+        self.assertIs(events[0], event)
+
+
 class TestSetSchema(TestFactory):
     def test_set_schema_prod(self):
         os.environ["TARGET"] = "prod"